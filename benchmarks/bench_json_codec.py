@@ -0,0 +1,129 @@
+"""
+Benchmarks decoding (and encoding) of typical exchange payloads with each JSON
+backend bitex.codec supports, as far as they are installed.
+
+The payloads mirror the shape and size of the replies of each exchange's
+REST endpoints and websocket feeds: large order book snapshots, tickers, and
+the small but frequent websocket updates which dominate a live deployment.
+Pass a directory of recorded replies (one file per payload, i.e. captured
+via `curl` or from a websocket session) to benchmark those instead.
+
+Usage:
+    python benchmarks/bench_json_codec.py [rounds] [recordings_dir]
+"""
+# Import Built-Ins
+import json
+import os
+import random
+import sys
+import time
+
+# Import Homebrew
+from bitex import codec
+
+random.seed(42)
+
+
+def levels(n, mid, side, fmt=str):
+    step = -0.1 if side == 'bid' else 0.1
+    return [[fmt(round(mid + step * i, 1)), fmt(round(random.random() * 5, 8)),
+             int(time.time()) - i] for i in range(n)]
+
+
+def payloads():
+    """
+    Returns a dict of name: raw JSON reply (bytes).
+    """
+    p = {}
+    p['Kraken REST Depth (500)'] = {'error': [], 'result': {'XXBTZEUR': {
+        'asks': levels(500, 1000.0, 'ask'), 'bids': levels(500, 999.9, 'bid')}}}
+    p['Kraken REST Ticker'] = {'error': [], 'result': {'XXBTZEUR': {
+        'a': ['1001.0', '1', '1.0'], 'b': ['1000.0', '1', '1.0'],
+        'c': ['1000.5', '0.1'], 'v': ['10', '20'], 'p': ['1000', '1001'],
+        't': [100, 200], 'h': ['1010', '1020'], 'l': ['990', '980'],
+        'o': '995.0'}}}
+    p['Bitfinex REST book (50)'] = {
+        'bids': [{'price': str(1000 - i), 'amount': '1.5', 'timestamp': '1500000000.0'}
+                 for i in range(50)],
+        'asks': [{'price': str(1001 + i), 'amount': '0.5', 'timestamp': '1500000000.0'}
+                 for i in range(50)]}
+    p['Bitfinex WSS book snapshot (25)'] = [
+        17082, [[1000.0 - i, random.randint(1, 5), random.random()] for i in range(25)] +
+               [[1001.0 + i, random.randint(1, 5), -random.random()] for i in range(25)]]
+    p['Bitfinex WSS book update'] = [17082, 1000.5, 3, 1.25]
+    p['Bitfinex WSS trade'] = [17470, 'te', '1234-BTCUSD', 1500000000, 1000.5, 0.25]
+    p['Bitfinex WSS heartbeat'] = [17082, 'hb']
+    p['GDAX REST book level 2 (50)'] = {'sequence': 3, 'bids': levels(50, 999.9, 'bid'),
+                                        'asks': levels(50, 1000.0, 'ask')}
+    p['GDAX WSS full channel message'] = {
+        'type': 'received', 'time': '2017-01-01T00:00:00.000000Z',
+        'product_id': 'BTC-USD', 'sequence': 10, 'order_id':
+        'd50ec984-77a8-460a-b958-66f114b0de9b', 'size': '1.34',
+        'price': '502.1', 'side': 'buy', 'order_type': 'limit'}
+    p['HitBTC WSS incremental refresh'] = {'MarketDataIncrementalRefresh': {
+        'seqNo': 123, 'timestamp': 1500000000000, 'symbol': 'BTCUSD',
+        'exchangeStatus': 'on', 'ask': [{'price': '1001.0', 'size': 5}],
+        'bid': [{'price': '1000.0', 'size': 0}], 'trade': []}}
+    p['OKCoin WSS depth'] = [{'channel': 'ok_sub_spotusd_btc_depth_20', 'data': {
+        'bids': levels(20, 999.9, 'bid', float), 'asks': levels(20, 1000.0, 'ask', float),
+        'timestamp': 1500000000000}}]
+    p['Poloniex REST returnOrderBook (100)'] = {
+        'asks': [[str(0.0401 + i / 1e5), random.random() * 10] for i in range(100)],
+        'bids': [[str(0.0400 - i / 1e5), random.random() * 10] for i in range(100)],
+        'isFrozen': '0', 'seq': 18849}
+    p['Bitstamp REST order_book'] = {'timestamp': '1500000000',
+                                     'bids': [l[:2] for l in levels(1000, 999.9, 'bid')],
+                                     'asks': [l[:2] for l in levels(1000, 1000.0, 'ask')]}
+    return {name: json.dumps(payload).encode('utf-8')
+            for name, payload in p.items()}
+
+
+def recordings(path):
+    p = {}
+    for name in sorted(os.listdir(path)):
+        with open(os.path.join(path, name), 'rb') as f:
+            p[name] = f.read()
+    return p
+
+
+def bench(func, arg, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(arg)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    data = recordings(sys.argv[2]) if len(sys.argv) > 2 else payloads()
+    backends = [n for n in ('json', 'ujson', 'orjson') if n in codec.BACKENDS]
+
+    print("Decoding, us per payload (%s rounds)" % rounds)
+    print('%-38s %8s' % ('payload', 'bytes') +
+          ''.join('%10s' % n for n in backends) + '   speedup')
+    totals = dict.fromkeys(backends, 0)
+    for name, raw in data.items():
+        row = []
+        for backend in backends:
+            codec.set_backend(backend)
+            # fewer rounds for the large payloads, so the run stays short
+            n = max(rounds * 1000 // max(len(raw), 1000), 50)
+            t = bench(codec.loads, raw, n)
+            totals[backend] += t
+            row.append(t)
+        print('%-38s %8d' % (name[:38], len(raw)) +
+              ''.join('%10.2f' % t for t in row) +
+              '%9.1fx' % (row[0] / min(row)))
+    print('%-47s' % 'total' + ''.join('%10.2f' % totals[n] for n in backends))
+
+    print("\nEncoding, us per payload")
+    for backend in backends:
+        codec.set_backend(backend)
+        objs = [json.loads(raw) for raw in data.values()]
+        t = sum(bench(codec.dumps, obj, max(rounds // 10, 50)) for obj in objs)
+        print('%-47s%10.2f' % (backend, t))
+    codec.set_backend()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmarks per-call latency and CPU time of polling 19 REST clients against a
+local HTTPS stand-in, once with a fresh connection per call (module-level
+requests.request(), as APIClient did before) and once through the clients'
+pooled keep-alive sessions.
+
+Usage:
+    python benchmarks/bench_session_pool.py [rounds]
+
+Requires the `openssl` binary to create a throw-away self-signed certificate.
+"""
+# Import Built-Ins
+import json
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Import Third-Party
+import requests
+import urllib3
+
+# Import Homebrew
+from bitex.api.REST import KrakenREST
+
+EXCHANGES = 19
+PAYLOAD = json.dumps({'error': [], 'result': {'XXBTZEUR': {
+    'a': ['1000.0', '1', '1.000'], 'b': ['999.0', '1', '1.000'],
+    'c': ['999.5', '0.1'], 'v': ['100', '200'], 'h': ['1010', '1020'],
+    'l': ['990', '980'], 'o': '995.0'}}}).encode('utf-8')
+
+
+class TickerHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_certificate(directory):
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048',
+                    '-nodes', '-days', '1', '-subj', '/CN=127.0.0.1',
+                    '-keyout', key, '-out', cert],
+                   check=True, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+    return cert, key
+
+
+def serve(cert, key):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TickerHandler)
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ctx.load_cert_chain(cert, key)
+    server.socket = ctx.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def poll(call, urls, rounds):
+    latencies = []
+    cpu_start = time.process_time()
+    for _ in range(rounds):
+        for url in urls:
+            start = time.perf_counter()
+            call(url)
+            latencies.append(time.perf_counter() - start)
+    cpu = time.process_time() - cpu_start
+    latencies.sort()
+    return latencies, cpu
+
+
+def report(label, latencies, cpu):
+    calls = len(latencies)
+    print("%-22s mean %7.3f ms  p50 %7.3f ms  p99 %7.3f ms  cpu/call %7.3f ms"
+          % (label, 1000 * sum(latencies) / calls,
+             1000 * latencies[calls // 2],
+             1000 * latencies[int(calls * 0.99) - 1],
+             1000 * cpu / calls))
+
+
+def main(rounds=50):
+    warnings.simplefilter('ignore', urllib3.exceptions.InsecureRequestWarning)
+    with tempfile.TemporaryDirectory() as directory:
+        server = serve(*make_certificate(directory))
+        uri = 'https://127.0.0.1:%s' % server.server_address[1]
+        urls = ['%s/0/public/Ticker?exchange=%s' % (uri, i)
+                for i in range(EXCHANGES)]
+        clients = {url: KrakenREST(url=uri) for url in urls}
+
+        def unpooled(url):
+            requests.request('GET', url, verify=False, timeout=5).json()
+
+        def pooled(url):
+            clients[url].api_request('GET', url, verify=False,
+                                     timeout=5).json()
+
+        print("Polling %s clients for %s rounds against %s"
+              % (EXCHANGES, rounds, uri))
+        report('requests.request()', *poll(unpooled, urls, rounds))
+        report('APIClient.session', *poll(pooled, urls, rounds))
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
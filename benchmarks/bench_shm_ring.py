@@ -0,0 +1,87 @@
+"""
+Benchmarks distributing trade records from a producer process to several
+reader processes via a ShmRing, against a multiprocessing.Queue per reader
+(which pickles each message, and which readers can't share without consuming
+each other's messages).
+
+Reports the time until every reader received all records, and the readers'
+total throughput; for the ring also the number of records readers lost by
+being lapped (the ring is sized to avoid that).
+
+Usage:
+    python benchmarks/bench_shm_ring.py [records] [readers]
+"""
+# Import Built-Ins
+import multiprocessing as mp
+import sys
+import time
+
+# Import Homebrew
+from bitex.api.WSS.shm import ShmRing, ShmRingReader, TRADE
+
+
+def ring_reader(name, records, ready, results):
+    reader = ShmRingReader(name)
+    ready.put(None)
+    received = 0
+    while received < records:
+        received += len(reader.wait(4096))
+    results.put((time.perf_counter(), reader.lost))
+    reader.close()
+
+
+def queue_reader(q, records, ready, results):
+    ready.put(None)
+    received = 0
+    while received < records:
+        q.get()
+        received += 1
+    results.put((time.perf_counter(), 0))
+
+
+def run(mode, records, readers):
+    ready, results = mp.Queue(), mp.Queue()
+    if mode == 'ShmRing':
+        ring = ShmRing(capacity=records, max_pairs=1)
+        procs = [mp.Process(target=ring_reader,
+                            args=(ring.name, records, ready, results))
+                 for _ in range(readers)]
+        write = lambda i: ring.write(TRADE, 'BTCUSD', 1000.0 + i, 0.1, i)
+    else:
+        queues = [mp.Queue() for _ in range(readers)]
+        procs = [mp.Process(target=queue_reader,
+                            args=(q, records, ready, results))
+                 for q in queues]
+
+        def write(i):
+            msg = (TRADE, 'BTCUSD', 1000.0 + i, 0.1, i)
+            for q in queues:
+                q.put(msg)
+    for proc in procs:
+        proc.start()
+    for _ in procs:
+        ready.get()
+
+    start = time.perf_counter()
+    for i in range(records):
+        write(i)
+    done = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    if mode == 'ShmRing':
+        ring.close()
+        ring.unlink()
+    elapsed = max(end for end, _ in done) - start
+    return elapsed, sum(lost for _, lost in done)
+
+
+def main(records=200000, readers=4):
+    print("%s records to %s readers" % (records, readers))
+    for mode in ('mp.Queue', 'ShmRing'):
+        elapsed, lost = run(mode, records, readers)
+        print("%-8s %8.3f s  %10.0f records/s per reader  lost %d"
+              % (mode, elapsed, records / elapsed, lost))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,69 @@
+"""
+Benchmarks draining a websocket client's data_q one message at a time
+(WSSAPI.get()) against draining it in batches (WSSAPI.get_batch()), with
+messages shaped like BitfinexWSS' trades - once put on the queue by a
+concurrent producer thread, and once drained from a filled queue, which
+measures the consumer's cost alone.
+
+Usage:
+    python benchmarks/bench_wss_batch.py [messages] [batch size]
+"""
+# Import Built-Ins
+import sys
+import threading
+import time
+
+# Import Homebrew
+from bitex.api.WSS.bitfinex import BitfinexWSS
+
+
+def produce(wss, messages):
+    for i in range(messages):
+        wss.publish('trades', 'BTCUSD',
+                    (['te', [i, 1500000000000, '0.01', '1000.0']],
+                     time.time()))
+
+
+def consume_single(wss, messages, batch_size):
+    for _ in range(messages):
+        wss.get()
+
+
+def consume_batches(wss, messages, batch_size):
+    received = 0
+    while received < messages:
+        received += len(wss.get_batch(batch_size))
+
+
+def run(consume, messages, batch_size):
+    wss = BitfinexWSS(pairs=['BTCUSD'])
+    producer = threading.Thread(target=produce, args=(wss, messages))
+    start = time.perf_counter()
+    producer.start()
+    consume(wss, messages, batch_size)
+    elapsed = time.perf_counter() - start
+    producer.join()
+    return elapsed
+
+
+def run_filled(consume, messages, batch_size):
+    wss = BitfinexWSS(pairs=['BTCUSD'])
+    produce(wss, messages)
+    start = time.perf_counter()
+    consume(wss, messages, batch_size)
+    return time.perf_counter() - start
+
+
+def main(messages=200000, batch_size=500):
+    print("Draining %s messages, batches of up to %s" % (messages, batch_size))
+    for mode, runner in (('concurrent', run), ('filled', run_filled)):
+        for label, consume in (('get()', consume_single),
+                               ('get_batch()', consume_batches)):
+            elapsed = min(runner(consume, messages, batch_size)
+                          for _ in range(3))
+            print("%-10s %-12s %8.3f s  %10.0f msg/s"
+                  % (mode, label, elapsed, messages / elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,91 @@
+"""
+Benchmarks the message-to-handler latency of BitfinexWSS' receive and process
+threads against a local websocket stand-in, as well as the CPU time the
+client uses while the connection is idle.
+
+The server stamps each trade message with the time it was sent; the trades
+handler records the time elapsed until it is called.
+
+Usage:
+    python benchmarks/bench_wss_latency.py [messages] [rate]
+
+Requires the `websockets` package for the stand-in server.
+"""
+# Import Built-Ins
+import json
+import sys
+import threading
+import time
+from unittest import mock
+
+# Import Third-Party
+from websocket import create_connection
+from websockets.sync.server import serve
+
+# Import Homebrew
+from bitex.api.WSS import bitfinex
+
+IDLE = 3
+
+
+def stand_in(messages, rate, connected):
+    def handler(ws):
+        ws.send(json.dumps({'event': 'info', 'version': 2}))
+        ws.send(json.dumps({'event': 'subscribed', 'channel': 'trades',
+                            'chanId': 1, 'symbol': 'tBTCUSD',
+                            'pair': 'BTCUSD'}))
+        connected.wait()
+        for i in range(messages):
+            ws.send(json.dumps([1, 'te', [i, 0, '0.1', '1000.0',
+                                          time.perf_counter()]]))
+            time.sleep(1 / rate)
+        # Stay idle until the client disconnects
+        for _ in ws:
+            pass
+    return handler
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main(messages=2000, rate=500):
+    connected = threading.Event()
+    server = serve(stand_in(messages, rate, connected), '127.0.0.1', 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'ws://127.0.0.1:%s' % server.socket.getsockname()[1]
+
+    latencies = []
+    done = threading.Event()
+
+    def on_trade(ts, chan_id, data):
+        latencies.append(time.perf_counter() - data[1][-1])
+        if len(latencies) == messages:
+            done.set()
+
+    wss = bitfinex.BitfinexWSS(pairs=[])
+    wss.addr = url
+    wss._data_handlers['trades'] = on_trade
+    # Connect directly, rather than via the client's default proxy settings
+    connect = lambda addr, **kwargs: create_connection(addr, timeout=1)
+    with mock.patch.object(bitfinex, 'create_connection', connect):
+        wss.start()
+
+    print("Sending %s messages at %s/s to %s" % (messages, rate, url))
+    connected.set()
+    done.wait(messages / rate + 30)
+    latencies.sort()
+    print("handled %5d  p50 %7.3f ms  p99 %7.3f ms  max %7.3f ms"
+          % (len(latencies), 1000 * percentile(latencies, 0.5),
+             1000 * percentile(latencies, 0.99), 1000 * latencies[-1]))
+
+    cpu_start = time.process_time()
+    time.sleep(IDLE)
+    print("idle cpu     %7.3f ms/s" % (1000 * (time.process_time() - cpu_start)
+                                       / IDLE))
+    wss.stop()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,163 @@
+"""
+Benchmarks hosting GeminiWSS - one connection per symbol - and BitfinexWSS on
+their own threads against hosting them on a single AsyncWSSRuntime event
+loop, reporting the number of threads, the resident memory, and the latency
+from the stand-in server sending a message until the consumer receives it.
+
+Each mode runs in a separate process, against a local websocket stand-in
+which sends every connection `messages` timestamped messages at `rate`/s.
+
+Usage:
+    python benchmarks/bench_wss_runtime.py [symbols] [messages] [rate]
+
+Requires the `websockets` package for the stand-in server and the runtime.
+"""
+# Import Built-Ins
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from unittest import mock
+
+# Import Third-Party
+from websocket import create_connection
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import serve
+
+# Import Homebrew
+from bitex.api.WSS import bitfinex, gemini
+from bitex.api.WSS.aio import AsyncWSSRuntime
+from bitex.api.WSS.queues import BoundedQueue
+
+
+def stand_in(messages, rate):
+    def handler(ws):
+        if ws.request.path == '/':
+            ws.send(json.dumps({'event': 'info', 'version': 2}))
+            ws.send(json.dumps({'event': 'subscribed', 'channel': 'trades',
+                                'chanId': 1, 'symbol': 'tBTCUSD',
+                                'pair': 'BTCUSD'}))
+        # Give all connections time to be established
+        time.sleep(1)
+        try:
+            for i in range(messages):
+                if ws.request.path == '/':
+                    msg = [1, 'te', [i, 0, '0.1', '1000.0', time.time()]]
+                else:
+                    msg = {'type': 'update', 'eventId': i, 'sent': time.time()}
+                ws.send(json.dumps(msg))
+                time.sleep(1 / rate)
+            for _ in ws:
+                pass
+        except ConnectionClosed:
+            pass
+    return handler
+
+
+def sent_at(msg):
+    if msg[0] == 'trades':
+        return msg[2][0][1][-1]
+    return json.loads(msg[2])['sent']
+
+
+def rss():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def clients(url, symbols):
+    gemini_wss = gemini.GeminiWSS(['SYM%03d' % i for i in range(symbols)])
+    gemini_wss.addr = url + '/'
+    bitfinex_wss = bitfinex.BitfinexWSS(pairs=[])
+    bitfinex_wss.addr = url
+    return gemini_wss, bitfinex_wss
+
+
+def run_threaded(url, symbols, expected):
+    q = BoundedQueue()
+    wss = clients(url, symbols)
+    for client in wss:
+        client.add_subscriber(target=q)
+    # Connect directly, rather than via the clients' default proxy settings
+    connect = lambda addr, **kwargs: create_connection(addr, timeout=30)
+    with mock.patch.object(gemini, 'create_connection', connect), \
+            mock.patch.object(bitfinex, 'create_connection', connect):
+        for client in wss:
+            client.start()
+        latencies, threads = [], 0
+        while len(latencies) < expected:
+            batch = q.get_batch(1000, timeout=30)
+            if not batch:
+                break
+            now = time.time()
+            latencies.extend(now - sent_at(msg) for msg in batch)
+            threads = max(threads, threading.active_count())
+    return latencies, threads
+
+
+def run_async(url, symbols, expected):
+    runtime = AsyncWSSRuntime(*clients(url, symbols))
+    latencies, threads = [], [0]
+
+    async def consume():
+        async for name, *msg in runtime:
+            latencies.append(time.time() - sent_at(msg))
+            threads[0] = max(threads[0], threading.active_count())
+            if len(latencies) == expected:
+                break
+        runtime.stop()
+
+    async def main():
+        await asyncio.gather(runtime.run(), asyncio.wait_for(consume(), 60))
+
+    asyncio.run(main())
+    return latencies, threads[0]
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def child(mode, url, symbols, messages):
+    symbols, messages = int(symbols), int(messages)
+    expected = (symbols + 1) * messages
+    runner = run_threaded if mode == 'threads' else run_async
+    latencies, threads = runner(url, symbols, expected)
+    latencies.sort()
+    print(json.dumps({'received': len(latencies), 'threads': threads,
+                      'rss': rss(), 'p50': percentile(latencies, 0.5),
+                      'p99': percentile(latencies, 0.99)}))
+    sys.stdout.flush()
+    # Don't wait for the threaded clients' shutdown
+    os._exit(0)
+
+
+def main(symbols=50, messages=200, rate=50):
+    server = serve(stand_in(messages, rate), '127.0.0.1', 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'ws://127.0.0.1:%s' % server.socket.getsockname()[1]
+    print("%s Gemini connections + 1 Bitfinex connection, %s messages each "
+          "at %s/s" % (symbols, messages, rate))
+    for mode in ('threads', 'asyncio'):
+        out = subprocess.run([sys.executable, __file__, '--child', mode, url,
+                              str(symbols), str(messages)],
+                             stdout=subprocess.PIPE, check=True).stdout
+        result = json.loads(out.decode().strip().splitlines()[-1])
+        print("%-8s received %6d  threads %4d  rss %6.1f MiB  "
+              "p50 %7.3f ms  p99 %7.3f ms"
+              % (mode, result['received'], result['threads'], result['rss'],
+                 1000 * result['p50'], 1000 * result['p99']))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        child(*sys.argv[2:])
+    else:
+        main(*[int(arg) for arg in sys.argv[1:]])
@@ -2,9 +2,14 @@ import logging
 logging.getLogger(__name__).warning("The API clients available in this package are deprecated "
                                     "and will be no longer available in their current form "
                                     "starting with version 2.0!")
-from .interfaces import Kraken, Bitfinex, Bitstamp, CCEX, Coincheck
-from .interfaces import Cryptopia, Gemini, ItBit, OKCoin, RockTradingLtd
-from .interfaces import Yunbi, Bittrex, Poloniex, Quoine, QuadrigaCX
-from .interfaces import Vaultoro, HitBtc, Bter, GDAX
+from ._lazy import lazy_exports
 from ._version import __version__
 version=__version__
+
+# Interfaces and sub modules are imported on first access
+from .interfaces import __all__ as _interfaces
+__all__ = _interfaces + ['multi', 'api', 'formatters']
+_exports = {name: ('.interfaces', name) for name in _interfaces}
+_exports.update({'multi': ('.multi', None), 'api': ('.api', None),
+                 'formatters': ('.formatters', None)})
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
@@ -0,0 +1,38 @@
+"""
+Lazy exports for bitex' packages (PEP 562).
+
+Importing every exchange client up-front pulls in websocket-client, autobahn,
+pusherclient and jwt, even for scripts which only need a single REST client.
+Packages therefore only declare their public names, and import the module
+providing a name on first access.
+"""
+# Import Built-Ins
+import importlib
+import sys
+
+
+def lazy_exports(package, exports):
+    """
+    Returns __getattr__() and __dir__() functions for the given package.
+    :param package: __name__ of the package
+    :param exports: dict of public name: (relative module, attribute); with
+                    attribute None, the module itself is exported
+    :return: tuple of functions
+    """
+    def __getattr__(name):
+        try:
+            module, attr = exports[name]
+        except KeyError:
+            raise AttributeError("module %r has no attribute %r" %
+                                 (package, name))
+        value = importlib.import_module(module, package)
+        if attr is not None:
+            value = getattr(value, attr)
+        # Cache it, so __getattr__ isn't called again for this name
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
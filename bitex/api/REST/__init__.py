@@ -1,20 +1,36 @@
-from .bitfinex import BitfinexREST
-from .bitstamp import BitstampREST
-from .bittrex import BittrexREST
-from .bter import BterREST
-from .ccex import CCEXRest
-from .coincheck import CoincheckREST
-from .cryptopia import CryptopiaREST
-from .gdax import GDAXRest
-from .gemini import GeminiREST
-from .hitbtc import HitBTCREST
-from .itbit import ItbitREST
-from .kraken import KrakenREST
-from .okcoin import OKCoinREST
-from .poloniex import PoloniexREST
-from .quadriga import QuadrigaCXREST
-from .quoine import QuoineREST
-from .rocktrading import RockTradingREST
-from .vaultoro import VaultoroREST
-from .yunbi import YunbiREST
+"""
+REST clients; each is imported on first access.
+"""
+# Import Homebrew
+from ..._lazy import lazy_exports
 
+__all__ = ['BitfinexREST', 'BitstampREST', 'BittrexREST', 'BterREST',
+           'CCEXRest', 'CoincheckREST', 'CryptopiaREST', 'GDAXRest',
+           'GeminiREST', 'HitBTCREST', 'ItbitREST', 'KrakenREST', 'OKCoinREST',
+           'PoloniexREST', 'QuadrigaCXREST', 'QuoineREST', 'RockTradingREST',
+           'VaultoroREST', 'YunbiREST', 'AsyncAPIClient']
+
+_exports = {
+    'BitfinexREST': ('.bitfinex', 'BitfinexREST'),
+    'BitstampREST': ('.bitstamp', 'BitstampREST'),
+    'BittrexREST': ('.bittrex', 'BittrexREST'),
+    'BterREST': ('.bter', 'BterREST'),
+    'CCEXRest': ('.ccex', 'CCEXRest'),
+    'CoincheckREST': ('.coincheck', 'CoincheckREST'),
+    'CryptopiaREST': ('.cryptopia', 'CryptopiaREST'),
+    'GDAXRest': ('.gdax', 'GDAXRest'),
+    'GeminiREST': ('.gemini', 'GeminiREST'),
+    'HitBTCREST': ('.hitbtc', 'HitBTCREST'),
+    'ItbitREST': ('.itbit', 'ItbitREST'),
+    'KrakenREST': ('.kraken', 'KrakenREST'),
+    'OKCoinREST': ('.okcoin', 'OKCoinREST'),
+    'PoloniexREST': ('.poloniex', 'PoloniexREST'),
+    'QuadrigaCXREST': ('.quadriga', 'QuadrigaCXREST'),
+    'QuoineREST': ('.quoine', 'QuoineREST'),
+    'RockTradingREST': ('.rocktrading', 'RockTradingREST'),
+    'VaultoroREST': ('.vaultoro', 'VaultoroREST'),
+    'YunbiREST': ('.yunbi', 'YunbiREST'),
+    'AsyncAPIClient': ('.async_api', 'AsyncAPIClient'),
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
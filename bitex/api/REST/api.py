@@ -13,6 +13,11 @@ import requests
 
 # Import Homebrew
 from .response import APIResponse
+from .session import PooledSession
+from .ratelimit import get_limiter
+from .resilience import RetryPolicy, get_breaker
+from .cache import TTLCache
+from .singleflight import freeze, get_group
 
 log = logging.getLogger(__name__)
 
@@ -22,21 +27,56 @@ class APIClient(metaclass=ABCMeta):
     Base Class for API ojects. Provides basic methods to interact
     with exchange APIs, such as sending queries and signing messages to pass
     authentication.
+
+    Children declare their exchange's rate limits as a
+    bitex.api.REST.ratelimit.RateLimit profile in `rate_limit`; query() waits
+    until a call fits into these limits before signing and sending it.
+
+    Failed public GET queries are retried according to `retry_policy`. After
+    `failure_threshold` consecutive failures, queries to the exchange fail
+    fast with CircuitOpenError for `reset_timeout` seconds (see
+    bitex.api.REST.resilience).
+
+    Slow-changing public endpoints may be cached by calling enable_cache()
+    (see bitex.api.REST.cache).
+
+    If `lean_responses` is set, query() returns lean APIResponse objects,
+    which keep only status, headers, elapsed time and the parsed payload.
+
+    Identical public GET queries sent concurrently by several threads share a
+    single request and APIResponse, unless `single_flight` is disabled (see
+    bitex.api.REST.singleflight).
     """
+    rate_limit = None
+    retry_policy = RetryPolicy()
+    failure_threshold = 5
+    reset_timeout = 30
+    lean_responses = False
+    single_flight = True
 
-    def __init__(self, uri, api_version=None, key=None, secret=None, timeout=5):
+    def __init__(self, uri, api_version=None, key=None, secret=None, timeout=5,
+                 pool_maxsize=10, pool_block=False, idle_timeout=30):
         """
         Create API Client object.
         :param uri: string address for api (i.e. https://api.kraken.com/
         :param api_version: version, as required to query an endpoint
         :param key: API access key
         :param secret: API secret
+        :param timeout: request timeout in seconds
+        :param pool_maxsize: maximum number of keep-alive connections per host
+        :param pool_block: bool, wait for a free pooled connection instead of
+                           opening an additional one
+        :param idle_timeout: seconds after which idle connections are closed
         """
         self.key = key
         self.secret = secret
         self.uri = uri
         self.version = api_version if api_version else ''
         self.timeout = timeout
+        self.session = PooledSession(pool_maxsize=pool_maxsize,
+                                     pool_block=pool_block,
+                                     idle_timeout=idle_timeout)
+        self.cache = None
         log.debug("Initialized API Client for URI: %s; "
                   "Will request on API version: %s" %
                   (self.uri, self.version))
@@ -50,6 +90,112 @@ class APIClient(metaclass=ABCMeta):
             self.key = f.readline().strip()
             self.secret = f.readline().strip()
 
+    def enable_cache(self, max_entries=256, max_bytes=2 ** 20, ttls=None):
+        """
+        Enables caching of the client's methods which declare a ttl in
+        bitex.utils.return_api_response().
+        :param max_entries: maximum number of cached responses
+        :param max_bytes: maximum total size of the cached responses in bytes
+        :param ttls: dict of method name: ttl in seconds, overriding the
+                     declared ttls; 0 disables caching for a method
+        :return: bitex.api.REST.cache.TTLCache obj
+        """
+        self.cache = TTLCache(max_entries=max_entries, max_bytes=max_bytes,
+                              ttls=ttls)
+        return self.cache
+
+    def invalidate_cache(self, method_name=None):
+        """
+        Removes the cached responses of the given method, or all cached
+        responses if no method name is given.
+        :param method_name: name of the method, i.e. 'pairs'
+        :return: int, number of responses removed
+        """
+        if self.cache is None:
+            return 0
+        return self.cache.invalidate(method_name)
+
+    @property
+    def limiter(self):
+        """
+        The RateLimiter shared by all clients using this client's rate_limit
+        profile, or None if the client isn't rate limited.
+        """
+        if self.rate_limit is None:
+            return None
+        return get_limiter(self.rate_limit)
+
+    @property
+    def breaker(self):
+        """
+        The CircuitBreaker shared by all clients of this client's exchange, or
+        None if failure_threshold is None.
+        """
+        if self.failure_threshold is None:
+            return None
+        return get_breaker(self.uri, self.failure_threshold,
+                           self.reset_timeout)
+
+    @property
+    def flights(self):
+        """
+        The SingleFlight group shared by all clients of this client's
+        exchange, or None if single_flight is disabled.
+        """
+        if not self.single_flight:
+            return None
+        return get_group(self.uri)
+
+    def _before_send(self, endpoint, authenticate):
+        """
+        Checks the circuit breaker, and returns the time to wait before the
+        query fits into the rate limits.
+        :return: float, seconds
+        """
+        if self.breaker is not None:
+            self.breaker.before_call()
+        if self.limiter is not None:
+            return self.limiter.reserve(endpoint, authenticate)
+        return 0
+
+    def _abort_send(self):
+        """
+        Called if a query passed _before_send(), but wasn't sent or its outcome
+        is unknown (i.e. signing it failed, or it was interrupted); releases
+        the circuit breaker's probe, so it isn't left half-open.
+        :return:
+        """
+        if self.breaker is not None:
+            self.breaker.release()
+
+    def _after_send(self, method_verb, authenticate, attempt, response=None,
+                    error=None):
+        """
+        Records the outcome of a query with the circuit breaker, and decides
+        whether it should be retried.
+        :param attempt: number of retries made so far
+        :param response: requests.Response obj, if one was received
+        :param error: exception raised while sending the query, if any
+        :return: float, seconds to wait before retrying; None if the query
+                 should not be retried
+        """
+        if self.breaker is not None:
+            if error is not None or response.status_code >= 500 or \
+                    response.status_code == 429:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+        policy = self.retry_policy
+        if policy is None or not policy.should_retry(method_verb, authenticate,
+                                                     attempt, response, error):
+            return None
+        delay = policy.delay(attempt, response)
+        log.info("Retrying %s %s in %.2fs (retry %s of %s)", method_verb,
+                 getattr(response, 'url', ''), delay, attempt + 1,
+                 policy.retries)
+        return delay
+
     def nonce(self):
         """
         Creates a Nonce value for signature generation
@@ -57,18 +203,24 @@ class APIClient(metaclass=ABCMeta):
         """
         return str(round(100000 * time.time()) * 2) 
 
-    @staticmethod
-    def api_request(*args, **kwargs):
+    def api_request(self, *args, **kwargs):
         """
-        Wrapper which converts a requests.Response into our custom APIResponse
-        object
+        Wrapper which sends the request via the client's pooled session and
+        converts the requests.Response into our custom APIResponse object
         :param args:
         :param kwargs:
         :return:
         """
-        r = requests.request(*args, **kwargs)
+        r = self.session.request(*args, **kwargs)
         return APIResponse(r)
 
+    def close(self):
+        """
+        Closes all pooled connections of this client.
+        :return:
+        """
+        self.session.close()
+
     @abstractmethod
     def sign(self, url, endpoint, endpoint_path, method_verb, *args, **kwargs):
         """
@@ -85,18 +237,19 @@ class APIClient(metaclass=ABCMeta):
 
         return url, {'params': {'test_param': "authenticated_chimichanga"}}
 
-    def query(self, method_verb, endpoint, authenticate=False,
-              *args, **kwargs):
+    def prepare_query(self, method_verb, endpoint, authenticate=False,
+                      *args, **kwargs):
         """
-        Queries exchange using given data. Defaults to unauthenticated query.
+        Builds the url and request kwargs for a query, signing them if
+        required. Shared by query() and bitex.api.REST.AsyncAPIClient.
         :param method_verb: valid request type (PUT, GET, POST etc)
         :param endpoint: endpoint path for the resource to query, sans the url &
                          API version (i.e. '/btcusd/ticker/').
         :param authenticate: Bool to determine whether or not a signature is
                              required.
-        :param args: Optional args for requests.request()
+        :param args: Optional args for self.sign()
         :param kwargs: Optional Kwargs for self.sign() and requests.request()
-        :return: request.response() obj
+        :return: tuple of url, dict of request kwargs
         """
         if self.version:
             endpoint_path = join(self.version, endpoint)
@@ -110,13 +263,74 @@ class APIClient(metaclass=ABCMeta):
         else:
             request_kwargs = kwargs
         log.debug("Making request to: %s, kwargs: %s", url, request_kwargs)
-        proxies = None
-        proxies = {"http": "http://127.0.0.1:1087", "https": "http://127.0.0.1:1087"}
+        return url, request_kwargs
+
+    def query(self, method_verb, endpoint, authenticate=False,
+              *args, **kwargs):
+        """
+        Queries exchange using given data. Defaults to unauthenticated query.
+        :param method_verb: valid request type (PUT, GET, POST etc)
+        :param endpoint: endpoint path for the resource to query, sans the url &
+                         API version (i.e. '/btcusd/ticker/').
+        :param authenticate: Bool to determine whether or not a signature is
+                             required.
+        :param args: Optional args for requests.request()
+        :param kwargs: Optional Kwargs for self.sign() and requests.request()
+        :return: request.response() obj
+        """
+        flights = self.flights
+        if flights is not None and not authenticate and \
+                method_verb.upper() == 'GET':
+            key = (self.version, endpoint, self.lean_responses, freeze(args),
+                   freeze(kwargs))
+            return flights.do(key, self._query, method_verb, endpoint,
+                              authenticate, *args, **kwargs)
+        return self._query(method_verb, endpoint, authenticate, *args,
+                           **kwargs)
+
+    def _query(self, method_verb, endpoint, authenticate=False, *args,
+               **kwargs):
+        """
+        Sends the query, waiting for rate limits and retrying it as required.
+        See query() for parameters.
+        :return: request.response() obj
+        """
+        attempt = 0
+        while True:
+            # Wait for our turn before signing, so nonces are sent in order
+            delay = self._before_send(endpoint, authenticate)
+            try:
+                if delay:
+                    time.sleep(delay)
+
+                url, request_kwargs = self.prepare_query(method_verb, endpoint,
+                                                         authenticate, *args,
+                                                         **kwargs)
+                proxies = None
+                proxies = {"http": "http://127.0.0.1:1087", "https": "http://127.0.0.1:1087"}
+
+                r = self.api_request(method_verb, url, proxies=proxies,
+                                     timeout=self.timeout, **request_kwargs)
+            except requests.RequestException as e:
+                delay = self._after_send(method_verb, authenticate, attempt,
+                                         error=e)
+                if delay is None:
+                    raise
+            except BaseException:
+                self._abort_send()
+                raise
+            else:
+                delay = self._after_send(method_verb, authenticate, attempt,
+                                         response=r)
+                if delay is None:
+                    break
+            time.sleep(delay)
+            attempt += 1
 
-        r = self.api_request(method_verb, url, proxies=proxies, timeout=self.timeout,
-                             **request_kwargs)
         log.debug("Made %s request made to %s, with headers %s and body %s. "
                   "Status code %s", r.request.method,
                   r.request.url, r.request.headers,
                   r.request.body, r.status_code)
+        if self.lean_responses:
+            r.lean()
         return r
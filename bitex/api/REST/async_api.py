@@ -0,0 +1,240 @@
+"""
+asyncio counterpart of APIClient. Wraps any APIClient (or interface) object
+and sends its queries through an aiohttp session, while reusing the
+exchange's url building and sign() method as-is.
+"""
+# Import Built-Ins
+import asyncio
+import copy
+import logging
+import time
+from datetime import timedelta
+
+# Import Third-Party
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import aiohttp
+    aiohttp_available = True
+except ImportError:
+    aiohttp_available = False
+
+# Import Homebrew
+from .response import APIResponse
+from ...utils import format_api_response, make_key
+
+log = logging.getLogger(__name__)
+
+
+# Keyword arguments accepted by requests.Request(), as returned by sign()
+REQUEST_KWARGS = ('headers', 'files', 'data', 'params', 'auth', 'cookies',
+                  'json')
+
+
+class _QueryRecorder:
+    """
+    Callable which replaces query() on a copy of an interface, recording the
+    query's arguments instead of sending it.
+    """
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, method_verb, endpoint, authenticate=False, *args,
+                 **kwargs):
+        self.calls.append((method_verb, endpoint, authenticate, args, kwargs))
+        return self
+
+
+class AsyncAPIClient:
+    """
+    Sends the queries of the wrapped client via asyncio. Authentication is
+    done by the wrapped client's sign() method, so every exchange supported by
+    bitex.api.REST is supported here as well.
+
+    If the wrapped client is an interface (i.e. bitex.Kraken), the
+    standardized methods are available as coroutines, returning the same
+    APIResponse objects (including `formatted`) as their blocking versions.
+
+    Example:
+        async with AsyncAPIClient(Kraken()) as kraken:
+            resp = await kraken.ticker('XXBTZEUR')
+    """
+    def __init__(self, client, session=None, pool_maxsize=10):
+        """
+        Initialize Object.
+        :param client: bitex.api.REST.APIClient() obj, or any of its children
+        :param session: aiohttp.ClientSession() obj; created on first use if
+                        not given
+        :param pool_maxsize: maximum number of connections per host
+        """
+        if not aiohttp_available:
+            raise SystemError("No aiohttp Installed! AsyncAPIClient Unavailable!")
+        self.client = client
+        self.pool_maxsize = pool_maxsize
+        self._session = session
+
+    @property
+    def session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_maxsize)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def api_request(self, method_verb, url, timeout=None, **kwargs):
+        """
+        Sends the request via aiohttp and converts the reply into an
+        APIResponse object.
+        The request is prepared by requests, so that sign() results (including
+        requests.auth.AuthBase objects) are applied exactly as in
+        APIClient.api_request().
+        :param method_verb: valid request type (PUT, GET, POST etc)
+        :param url: url to query
+        :param timeout: request timeout in seconds
+        :param kwargs: Kwargs for requests.Request()
+        :return: APIResponse
+        """
+        request_kwargs = {k: v for k, v in kwargs.items()
+                          if k in REQUEST_KWARGS}
+        prepared = requests.Request(method_verb, url,
+                                    **request_kwargs).prepare()
+        timeout = aiohttp.ClientTimeout(total=timeout or self.client.timeout)
+
+        start = time.monotonic()
+        async with self.session.request(prepared.method, prepared.url,
+                                        headers=dict(prepared.headers),
+                                        data=prepared.body,
+                                        timeout=timeout) as resp:
+            content = await resp.read()
+
+        r = requests.Response()
+        r.status_code = resp.status
+        r.reason = resp.reason
+        r.headers = CaseInsensitiveDict(resp.headers)
+        r.encoding = get_encoding_from_headers(r.headers)
+        r.url = str(resp.url)
+        r.request = prepared
+        r.elapsed = timedelta(seconds=time.monotonic() - start)
+        r._content = content
+        return APIResponse(r)
+
+    async def query(self, method_verb, endpoint, authenticate=False,
+                    *args, **kwargs):
+        """
+        Coroutine version of APIClient.query().
+        :return: APIResponse
+        """
+        attempt = 0
+        while True:
+            # Shares rate limits and circuit breaker with the blocking clients
+            delay = self.client._before_send(endpoint, authenticate)
+            try:
+                if delay:
+                    await asyncio.sleep(delay)
+
+                url, request_kwargs = self.client.prepare_query(
+                    method_verb, endpoint, authenticate, *args, **kwargs)
+                r = await self.api_request(method_verb, url, **request_kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Map to requests' exceptions, which the RetryPolicy expects
+                error = requests.ConnectionError(e)
+                delay = self.client._after_send(method_verb, authenticate,
+                                                attempt, error=error)
+                if delay is None:
+                    raise error from e
+            except BaseException:
+                # Including cancellation
+                self.client._abort_send()
+                raise
+            else:
+                delay = self.client._after_send(method_verb, authenticate,
+                                                attempt, response=r)
+                if delay is None:
+                    break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        log.debug("Made %s request made to %s. Status code %s",
+                  r.request.method, r.request.url, r.status_code)
+        if self.client.lean_responses:
+            r.lean()
+        return r
+
+    async def call(self, method_name, *args, **kwargs):
+        """
+        Runs the given method of the wrapped interface asynchronously.
+        The method is executed against a copy of the client whose query()
+        only records its arguments; the recorded query is then sent via
+        self.query() and formatted using the method's formatter, if any.
+        :param method_name: name of the method to run, i.e. 'ticker'
+        :return: APIResponse
+        """
+        method = getattr(type(self.client), method_name)
+        func = getattr(method, '__wrapped__', method)
+
+        # Share the wrapped client's cache, if the method may be cached
+        cache, ttl, key = self.client.cache, getattr(method, 'ttl', None), None
+        if ttl and cache is not None:
+            key = make_key(func.__name__, args, kwargs)
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return copy.copy(cached)
+
+        recorder = _QueryRecorder()
+        client = copy.copy(self.client)
+        client.query = recorder
+        func(client, *args, **kwargs)
+        if len(recorder.calls) != 1:
+            raise NotImplementedError("%s.%s() cannot be run asynchronously!"
+                                      % (type(self.client).__name__,
+                                         method_name))
+
+        method_verb, endpoint, authenticate, q_args, q_kwargs = recorder.calls[0]
+        r = await self.query(method_verb, endpoint, authenticate, *q_args,
+                             **q_kwargs)
+        if hasattr(method, 'formatter'):
+            r = format_api_response(r, method.formatter, self.client,
+                                    *args, **kwargs)
+        if key is not None and r.ok:
+            r.formatted  # format once, rather than on every cache hit
+            cache.set(key, copy.copy(r), cache.ttl(func.__name__, ttl),
+                      size=r.content_length)
+        return r
+
+    """
+    BitEx Standardized Methods
+    """
+
+    async def ticker(self, *args, **kwargs):
+        return await self.call('ticker', *args, **kwargs)
+
+    async def order_book(self, *args, **kwargs):
+        return await self.call('order_book', *args, **kwargs)
+
+    async def trades(self, *args, **kwargs):
+        return await self.call('trades', *args, **kwargs)
+
+    async def bid(self, *args, **kwargs):
+        return await self.call('bid', *args, **kwargs)
+
+    async def ask(self, *args, **kwargs):
+        return await self.call('ask', *args, **kwargs)
+
+    async def cancel_order(self, *args, **kwargs):
+        return await self.call('cancel_order', *args, **kwargs)
+
+    async def balance(self, *args, **kwargs):
+        return await self.call('balance', *args, **kwargs)
@@ -4,24 +4,36 @@ and feature the respective exchanges authentication method (sign()).
 """
 # Import Built-ins
 import logging
-import json
 import hashlib
 import hmac
 import base64
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
+from ...codec import dumps as json_dumps
 
 
 log = logging.getLogger(__name__)
 
 
 class BitfinexREST(APIClient):
+    # Per-endpoint limits of the v1 API, in requests per minute.
+    rate_limit = RateLimit(default=Rate(60, 60), private=Rate(90, 60),
+                           endpoints={'pubticker': Rate(30, 60),
+                                      'stats': Rate(10, 60),
+                                      'lendbook': Rate(45, 60),
+                                      'book': Rate(60, 60),
+                                      'trades': Rate(45, 60),
+                                      'lends': Rate(60, 60),
+                                      'symbols': Rate(5, 60),
+                                      'symbols_details': Rate(5, 60)})
+
     def __init__(self, key=None, secret=None, api_version='v1',
-                 url='https://api.bitfinex.com', timeout=5):
+                 url='https://api.bitfinex.com', timeout=5, **kwargs):
         super(BitfinexREST, self).__init__(url, api_version=api_version,
                                            key=key, secret=secret,
-                                           timeout=timeout)
+                                           timeout=timeout, **kwargs)
 
     def sign(self, url, endpoint, endpoint_path, method_verb, *args, **kwargs):
         try:
@@ -32,10 +44,10 @@ class BitfinexREST(APIClient):
             req['request'] = endpoint_path
             req['nonce'] = self.nonce()
 
-            js = json.dumps(req)
+            js = json_dumps(req)
             data = base64.standard_b64encode(js.encode('utf8'))
         else:
-            data = '/api/' + endpoint_path + self.nonce() + json.dumps(req)
+            data = '/api/' + endpoint_path + self.nonce() + json_dumps(req)
         h = hmac.new(self.secret.encode('utf8'), data, hashlib.sha384)
         #h = hmac.new(self.secret.encode('utf8'), bytes(data,encoding='utf-8'), hashlib.sha384)
         signature = h.hexdigest()
@@ -9,18 +9,22 @@ import hmac
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
 
 
 class BitstampREST(APIClient):
+    # 600 requests per 10 minutes.
+    rate_limit = RateLimit(default=Rate(600, 600))
+
     def __init__(self, user_id='', key=None, secret=None, api_version=None,
-                 url='https://www.bitstamp.net/api', timeout=5):
+                 url='https://www.bitstamp.net/api', timeout=5, **kwargs):
         self.id = user_id
         super(BitstampREST, self).__init__(url, api_version=api_version,
                                            key=key, secret=secret,
-                                           timeout=timeout)
+                                           timeout=timeout, **kwargs)
 
     def load_key(self, path):
         """Load key and secret from file."""
@@ -12,16 +12,20 @@ import urllib.parse
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
 
 
 class BittrexREST(APIClient):
+    rate_limit = RateLimit(default=Rate(1, 1, burst=5))
+
     def __init__(self, key=None, secret=None, api_version='v1.1',
-                 url='https://bittrex.com/api', timeout=5):
+                 url='https://bittrex.com/api', timeout=5, **kwargs):
         super(BittrexREST, self).__init__(url, api_version=api_version, key=key,
-                                          secret=secret, timeout=timeout)
+                                          secret=secret,
+                                          timeout=timeout, **kwargs)
 
     def sign(self, url, endpoint, endpoint_path, method_verb, *args, **kwargs):
 
@@ -11,18 +11,21 @@ import urllib.parse
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
 
 
 class BterREST(APIClient):
+    rate_limit = RateLimit(default=Rate(1, 1))
+
     def __init__(self, key=None, secret=None, api_version=None,
-                 url='http://data.bter.com/api', timeout=5):
+                 url='http://data.bter.com/api', timeout=5, **kwargs):
         api_version = '1' if not api_version else api_version
         super(BterREST, self).__init__(url, api_version=api_version,
                                            key=key, secret=secret,
-                                           timeout=timeout)
+                                           timeout=timeout, **kwargs)
 
     def sign(self, uri, endpoint, endpoint_path, method_verb, *args, **kwargs):
         try:
@@ -0,0 +1,151 @@
+"""
+TTL cache for slow-changing public endpoints (asset pairs, currencies etc).
+
+Caching is opt-in: methods decorated with return_api_response(formatter,
+ttl=...) are served from the client's cache once it has been enabled via
+APIClient.enable_cache(). Cached entries are the formatted APIResponse
+objects, so both json() and `formatted` come for free on a hit.
+"""
+# Import Built-Ins
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a per-entry TTL.
+
+    The cache is bounded both by number of entries and by the total size of
+    the cached response bodies; the least recently used entries are evicted
+    once either bound is exceeded.
+    """
+    def __init__(self, max_entries=256, max_bytes=2 ** 20, ttls=None):
+        """
+        Initialize Object.
+        :param max_entries: maximum number of cached entries
+        :param max_bytes: maximum total size of the cached entries, in bytes
+        :param ttls: dict of method name: ttl in seconds, overriding the ttl
+                     given to return_api_response(); a ttl of 0 disables
+                     caching for that method
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = ttls or {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, name, default):
+        """
+        Returns the ttl to use for the given method.
+        :param name: name of the method
+        :param default: ttl declared by the method
+        :return: ttl in seconds
+        """
+        return self.ttls.get(name, default)
+
+    def get(self, key, now=None):
+        """
+        Returns the cached value for key, or None if it isn't cached or has
+        expired.
+        :param key: cache key, as returned by bitex.utils.make_key()
+        :param now: monotonic timestamp, defaults to time.monotonic()
+        :return: cached value or None
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            try:
+                value, size, expires = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if now >= expires:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl, size=0, now=None):
+        """
+        Caches value under key for ttl seconds.
+        :param key: cache key, as returned by bitex.utils.make_key()
+        :param value: obj to cache
+        :param ttl: seconds after which the entry expires
+        :param size: size of value in bytes, counted towards max_bytes
+        :param now: monotonic timestamp, defaults to time.monotonic()
+        :return: bool, whether value was cached
+        """
+        if not ttl or (self.max_bytes is not None and size > self.max_bytes):
+            return False
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = value, size, now + ttl
+            self.size += size
+            while (len(self._entries) > self.max_entries or
+                   (self.max_bytes is not None and self.size > self.max_bytes)):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+        return True
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+    def invalidate(self, name=None):
+        """
+        Removes cached entries.
+        :param name: name of the method whose entries to remove, or a key as
+                     returned by bitex.utils.make_key(); removes all entries
+                     if None
+        :return: int, number of entries removed
+        """
+        with self._lock:
+            if name is None:
+                keys = list(self._entries)
+            elif name in self._entries:
+                keys = [name]
+            else:
+                keys = [key for key in self._entries if key[0] == name]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        """
+        Removes all cached entries.
+        :return:
+        """
+        self.invalidate()
+
+    def stats(self):
+        """
+        Returns the cache's counters and current size.
+        :return: dict
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions,
+                    'expirations': self.expirations,
+                    'entries': len(self._entries), 'bytes': self.size}
@@ -11,16 +11,20 @@ import urllib.parse
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
 
 
 class CCEXRest(APIClient):
+    rate_limit = RateLimit(default=Rate(1, 1))
+
     def __init__(self, key=None, secret=None, api_version=None,
-                 url='https://c-cex.com/t', timeout=5):
+                 url='https://c-cex.com/t', timeout=5, **kwargs):
         super(CCEXRest, self).__init__(url, api_version=api_version, key=key,
-                                         secret=secret, timeout=timeout)
+                                         secret=secret,
+                                         timeout=timeout, **kwargs)
 
     def sign(self, uri, endpoint, endpoint_path, method_verb, *args, **kwargs):
         nonce = self.nonce()
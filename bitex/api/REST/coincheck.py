@@ -4,23 +4,26 @@ and feature the respective exchanges authentication method (sign()).
 """
 # Import Built-ins
 import logging
-import json
 import hashlib
 import hmac
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
+from ...codec import dumps as json_dumps
 
 
 log = logging.getLogger(__name__)
 
 
 class CoincheckREST(APIClient):
+    rate_limit = RateLimit(default=Rate(1, 1))
+
     def __init__(self, key=None, secret=None, api_version='api',
-                 url='https://coincheck.com', timeout=5):
+                 url='https://coincheck.com', timeout=5, **kwargs):
         super(CoincheckREST, self).__init__(url, api_version=api_version,
                                             key=key, secret=secret,
-                                            timeout=timeout)
+                                            timeout=timeout, **kwargs)
 
     def sign(self, url, endpoint, endpoint_path, method_verb, *args, **kwargs):
 
@@ -30,7 +33,7 @@ class CoincheckREST(APIClient):
         except KeyError:
             params = {}
 
-        params = json.dumps(params)
+        params = json_dumps(params)
         # sig = nonce + url + req
         data = (nonce + endpoint_path + params).encode('utf-8')
         h = hmac.new(self.secret.encode('utf8'), data, hashlib.sha256)
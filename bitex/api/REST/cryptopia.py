@@ -4,7 +4,6 @@ and feature the respective exchanges authentication method (sign()).
 """
 # Import Built-ins
 import logging
-import json
 import hashlib
 import hmac
 import base64
@@ -13,16 +12,21 @@ import urllib.parse
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
+from ...codec import dumps as json_dumps
 
 
 log = logging.getLogger(__name__)
 
 
 class CryptopiaREST(APIClient):
+    rate_limit = RateLimit(default=Rate(1, 1, burst=5))
+
     def __init__(self, key=None, secret=None, api_version=None,
-                 url='https://www.cryptopia.co.nz/api', timeout=5):
+                 url='https://www.cryptopia.co.nz/api', timeout=5, **kwargs):
         super(CryptopiaREST, self).__init__(url, api_version=api_version, key=key,
-                                         secret=secret, timeout=timeout)
+                                         secret=secret,
+                                         timeout=timeout, **kwargs)
 
     def sign(self, uri, endpoint, endpoint_path, method_verb, *args, **kwargs):
         nonce = self.nonce()
@@ -31,7 +35,7 @@ class CryptopiaREST(APIClient):
         except KeyError:
             params = {}
 
-        post_data = json.dumps(params)
+        post_data = json_dumps(params)
 
         # generate signature
         md5 = hashlib.md5()
@@ -0,0 +1,19 @@
+"""
+Contains Exceptions raised by the REST API clients.
+"""
+# Import Built-Ins
+import logging
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a query, while the circuit breaker of the
+    exchange is open - i.e. after too many consecutive failed queries.
+    """
+    def __init__(self, message=None):
+        if not message:
+            message = "Circuit breaker is open - exchange appears to be down!"
+        super(CircuitOpenError, self).__init__(message)
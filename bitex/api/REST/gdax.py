@@ -14,6 +14,7 @@ from requests.auth import AuthBase
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
@@ -44,11 +45,15 @@ class GdaxAuth(AuthBase):
 
 
 class GDAXRest(APIClient):
+    # Public: 3 req/s, bursts of 6; private: 5 req/s, bursts of 10.
+    rate_limit = RateLimit(default=Rate(3, 1, burst=6),
+                           private=Rate(5, 1, burst=10))
+
     def __init__(self, passphrase='', key=None, secret=None, api_version=None,
-                 url='https://api.gdax.com', timeout=5):
+                 url='https://api.gdax.com', timeout=5, **kwargs):
         self.passphrase = passphrase
         super(GDAXRest, self).__init__(url, api_version=api_version, key=key,
-                                       secret=secret, timeout=timeout)
+                                       secret=secret, timeout=timeout, **kwargs)
 
     def load_key(self, path):
         """
@@ -4,23 +4,29 @@ and feature the respective exchanges authentication method (sign()).
 """
 # Import Built-ins
 import logging
-import json
 import hashlib
 import hmac
 import base64
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
+from ...codec import dumps as json_dumps
 
 
 log = logging.getLogger(__name__)
 
 
 class GeminiREST(APIClient):
+    # Public: 120 req/min, private: 600 req/min; recommended not to exceed
+    # 1 req/s and 5 req/s respectively.
+    rate_limit = RateLimit(default=Rate(1, 1), private=Rate(5, 1))
+
     def __init__(self, key=None, secret=None, api_version='v1',
-                 url='https://api.gemini.com', timeout=5):
+                 url='https://api.gemini.com', timeout=5, **kwargs):
         super(GeminiREST, self).__init__(url, api_version=api_version, key=key,
-                                         secret=secret, timeout=timeout)
+                                         secret=secret,
+                                         timeout=timeout, **kwargs)
 
     def sign(self, uri, endpoint, endpoint_path, method_verb, *args, **kwargs):
         nonce = self.nonce()
@@ -32,7 +38,7 @@ class GeminiREST(APIClient):
         payload['nonce'] = nonce
         payload['request'] = endpoint_path
 
-        js = json.dumps(payload)
+        js = json_dumps(payload)
         data = base64.standard_b64encode(js.encode('utf8'))
         h = hmac.new(self.secret.encode('utf8'), data, hashlib.sha384)
         signature = h.hexdigest()
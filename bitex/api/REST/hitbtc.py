@@ -11,18 +11,21 @@ import urllib.parse
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
 
 
 class HitBTCREST(APIClient):
+    rate_limit = RateLimit(default=Rate(10, 1, burst=10))
+
     def __init__(self, key=None, secret=None, api_version='1',
-                 url='https://api.hitbtc.com/api/', timeout=5):
+                 url='https://api.hitbtc.com/api/', timeout=5, **kwargs):
         api_version = '' if not api_version else api_version
         super(HitBTCREST, self).__init__(url, api_version=api_version,
                                          key=key, secret=secret,
-                                         timeout=timeout)
+                                         timeout=timeout, **kwargs)
 
     def sign(self, uri, endpoint, endpoint_path, method_verb, *args, **kwargs):
         try:
@@ -4,24 +4,28 @@ and feature the respective exchanges authentication method (sign()).
 """
 # Import Built-ins
 import logging
-import json
 import hashlib
 import hmac
 import base64
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
+from ...codec import dumps as json_dumps
 
 
 log = logging.getLogger(__name__)
 
 
 class ItbitREST(APIClient):
+    rate_limit = RateLimit(default=Rate(1, 1, burst=5))
+
     def __init__(self, user_id = '', key=None, secret=None, api_version='v1',
-                 url='https://api.itbit.com', timeout=5):
+                 url='https://api.itbit.com', timeout=5, **kwargs):
         self.userId = user_id
         super(ItbitREST, self).__init__(url, api_version=api_version,
-                                 key=key, secret=secret, timeout=timeout)
+                                 key=key, secret=secret,
+                                 timeout=timeout, **kwargs)
 
     def load_key(self, path):
         """
@@ -48,8 +52,7 @@ class ItbitREST(APIClient):
         timestamp = self.nonce()
         nonce = self.nonce()
 
-        message = json.dumps([verb, url, body, nonce, timestamp],
-                             separators=(',', ':'))
+        message = json_dumps([verb, url, body, nonce, timestamp])
         sha256_hash = hashlib.sha256()
         nonced_message = nonce + message
         sha256_hash.update(nonced_message.encode('utf8'))
@@ -12,16 +12,29 @@ import urllib.parse
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
 
 
 class KrakenREST(APIClient):
+    # Public calls: 1/s; private calls increase a counter (max 15), which
+    # decays by 1 every 3s; ledger & trade history queries count double,
+    # order placement and cancellation is limited by the matching engine.
+    rate_limit = RateLimit(default=Rate(1, 1), private=Rate(1, 3, burst=15),
+                           costs={'private/Ledgers': 2,
+                                  'private/QueryLedgers': 2,
+                                  'private/TradesHistory': 2,
+                                  'private/QueryTrades': 2,
+                                  'private/AddOrder': 0,
+                                  'private/CancelOrder': 0})
+
     def __init__(self, key=None, secret=None, api_version='0',
-                 url='https://api.kraken.com', timeout=5):
+                 url='https://api.kraken.com', timeout=5, **kwargs):
         super(KrakenREST, self).__init__(url, api_version=api_version,
-                                         key=key, secret=secret, timeout=timeout)
+                                         key=key, secret=secret,
+                                         timeout=timeout, **kwargs)
 
     def sign(self, url, endpoint, endpoint_path, method_verb, *args, **kwargs):
         try:
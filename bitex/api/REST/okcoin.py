@@ -9,17 +9,21 @@ import hmac
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
 
 
 class OKCoinREST(APIClient):
+    # 6000 requests per 10 minutes.
+    rate_limit = RateLimit(default=Rate(6000, 600, burst=10))
+
     def __init__(self, key=None, secret=None, api_version='v1',
-                 url='https://www.okcoin.com/api', timeout=5):
+                 url='https://www.okcoin.com/api', timeout=5, **kwargs):
         super(OKCoinREST, self).__init__(url, api_version=api_version,
                                          key=key, secret=secret,
-                                         timeout=timeout)
+                                         timeout=timeout, **kwargs)
 
     def sign(self,url, endpoint, endpoint_path, method_verb, *args, **kwargs):
         nonce = self.nonce()
@@ -11,17 +11,21 @@ import urllib.parse
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
 
 
 class PoloniexREST(APIClient):
+    # 6 requests per second.
+    rate_limit = RateLimit(default=Rate(6, 1, burst=6))
+
     def __init__(self, key=None, secret=None, api_version=None,
-                 url='https://poloniex.com', timeout=5):
+                 url='https://poloniex.com', timeout=5, **kwargs):
         super(PoloniexREST, self).__init__(url, api_version=api_version,
                                            key=key, secret=secret,
-                                           timeout=timeout)
+                                           timeout=timeout, **kwargs)
 
     def sign(self, uri, endpoint, endpoint_path, method_verb, *args, **kwargs):
         try:
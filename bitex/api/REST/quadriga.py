@@ -9,18 +9,22 @@ import hmac
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
 
 
 class QuadrigaCXREST(APIClient):
+    # 30 requests per minute.
+    rate_limit = RateLimit(default=Rate(30, 60))
+
     def __init__(self, key=None, secret=None, client_id='', api_version='v2',
-                 url='https://api.quoine.com/', timeout=5):
+                 url='https://api.quoine.com/', timeout=5, **kwargs):
         self.client_id = client_id
         super(QuadrigaCXREST, self).__init__(url, api_version=api_version,
                                              key=key, secret=secret,
-                                             timeout=timeout)
+                                             timeout=timeout, **kwargs)
 
     def load_key(self, path):
         """
@@ -15,6 +15,7 @@ except ImportError:
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
@@ -25,12 +26,16 @@ class QuoineREST(APIClient):
     The Quoine Api requires the API version to be designated in each requests's
     header as {'X-Quoine-API-Version': 2}
     """
+    # 300 requests per 5 minutes.
+    rate_limit = RateLimit(default=Rate(300, 300))
+
     def __init__(self, key=None, secret=None, api_version=None,
-                 url='https://api.quoine.com', timeout=5):
+                 url='https://api.quoine.com', timeout=5, **kwargs):
         if not jwt_available:
             raise SystemError("No JWT Installed! Quoine API Unavailable!")
         super(QuoineREST, self).__init__(url, api_version=api_version,
-                                         key=key, secret=secret, timeout=timeout)
+                                         key=key, secret=secret,
+                                         timeout=timeout, **kwargs)
 
     def sign(self, uri, endpoint, endpoint_path, method_verb, *args, **kwargs):
         try:
@@ -0,0 +1,184 @@
+"""
+Token-bucket rate limiting for REST clients.
+
+Each APIClient class declares its exchange's limits as a RateLimit profile in
+its `rate_limit` attribute. All clients sharing a profile - i.e. all instances
+of KrakenREST and bitex.Kraken, in any thread, as well as AsyncAPIClients
+wrapping them - draw from the same RateLimiter, and hence the same buckets.
+"""
+# Import Built-Ins
+import logging
+import threading
+import time
+from collections import namedtuple
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class Rate(namedtuple('Rate', ['calls', 'period', 'burst'])):
+    """
+    Allows `calls` per `period` seconds, with up to `burst` calls in quick
+    succession. burst defaults to 1, which spaces calls evenly.
+    """
+    def __new__(cls, calls, period=1, burst=None):
+        return super(Rate, cls).__new__(cls, calls, period, burst or 1)
+
+    def bucket(self):
+        return TokenBucket(self.calls / self.period, self.burst)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Tokens are reserved up-front, so that callers
+    are scheduled in the order they arrived, and can wait for their turn
+    either blocking (acquire()) or asynchronously (reserve() + sleep).
+    """
+    def __init__(self, rate, capacity):
+        """
+        Initialize Object.
+        :param rate: tokens added per second
+        :param capacity: maximum number of tokens held by the bucket
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1, now=None):
+        """
+        Takes the given number of tokens from the bucket, and returns how long
+        the caller has to wait before it may use them.
+        :param tokens: number of tokens to take
+        :param now: monotonic timestamp, defaults to time.monotonic()
+        :return: float, seconds to wait
+        """
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self, tokens=1):
+        """
+        Blocks until the given number of tokens may be used.
+        :param tokens: number of tokens to take
+        :return: float, seconds waited
+        """
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class RateLimit:
+    """
+    Declarative rate-limit profile of an exchange.
+
+    Example:
+        RateLimit(default=Rate(1, 1), private=Rate(1, 3, burst=15),
+                  endpoints={'public/OHLC': Rate(1, 2)},
+                  costs={'private/Ledgers': 2})
+    """
+    def __init__(self, default=None, private=None, endpoints=None, costs=None):
+        """
+        Initialize Object.
+        :param default: Rate of all unauthenticated calls without a more
+                        specific entry in endpoints; None for no limit
+        :param private: Rate of all authenticated calls without a more
+                        specific entry in endpoints; defaults to default
+        :param endpoints: dict of endpoint prefix: Rate; each prefix has its
+                          own bucket, the longest matching prefix is used
+        :param costs: dict of endpoint prefix: tokens taken per call;
+                      defaults to 1
+        """
+        self.default = default
+        self.private = private if private is not None else default
+        self.endpoints = endpoints or {}
+        self.costs = costs or {}
+
+    def __repr__(self):
+        return ('RateLimit(default=%r, private=%r, endpoints=%r, costs=%r)' %
+                (self.default, self.private, self.endpoints, self.costs))
+
+
+class RateLimiter:
+    """
+    Holds the buckets for a RateLimit profile.
+    """
+    def __init__(self, profile):
+        self.profile = profile
+        self.default = profile.default.bucket() if profile.default else None
+        if profile.private is profile.default:
+            self.private = self.default
+        else:
+            self.private = profile.private.bucket()
+        self.endpoints = {prefix: rate.bucket()
+                          for prefix, rate in profile.endpoints.items()}
+
+    @staticmethod
+    def _match(mapping, endpoint):
+        matches = [prefix for prefix in mapping if endpoint.startswith(prefix)]
+        return max(matches, key=len) if matches else None
+
+    def reserve(self, endpoint, authenticate=False):
+        """
+        Reserves a call to the given endpoint.
+        :param endpoint: endpoint as passed to APIClient.query()
+        :param authenticate: bool, whether the call is authenticated
+        :return: float, seconds to wait before sending the call
+        """
+        prefix = self._match(self.profile.costs, endpoint)
+        cost = self.profile.costs[prefix] if prefix is not None else 1
+
+        prefix = self._match(self.endpoints, endpoint)
+        if prefix is not None:
+            bucket = self.endpoints[prefix]
+        else:
+            bucket = self.private if authenticate else self.default
+        if bucket is None or not cost:
+            return 0.0
+
+        delay = bucket.reserve(cost)
+        if delay:
+            log.debug("RateLimiter.reserve(): Delaying call to %s by %.3fs",
+                      endpoint, delay)
+        return delay
+
+    def acquire(self, endpoint, authenticate=False):
+        """
+        Blocks until a call to the given endpoint may be sent.
+        :return: float, seconds waited
+        """
+        delay = self.reserve(endpoint, authenticate)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(profile):
+    """
+    Returns the process-wide RateLimiter for the given profile.
+    :param profile: RateLimit obj
+    :return: RateLimiter
+    """
+    with _limiters_lock:
+        try:
+            return _limiters[id(profile)][1]
+        except KeyError:
+            # keep a reference to the profile, so its id() isn't reused
+            _limiters[id(profile)] = profile, RateLimiter(profile)
+            return _limiters[id(profile)][1]
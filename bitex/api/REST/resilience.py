@@ -0,0 +1,198 @@
+"""
+Retry policy and circuit breaker for REST queries.
+
+Only idempotent, unauthenticated queries are retried - signed queries carry a
+nonce and may have been executed by the exchange even if we never saw the
+reply, so they are never sent twice.
+
+Each exchange (identified by its API uri) has one CircuitBreaker, shared by
+all clients talking to it. After `failure_threshold` consecutive failures the
+breaker opens, and queries fail fast with CircuitOpenError for
+`reset_timeout` seconds. Then a single probe query is let through; if it
+succeeds, the breaker closes again.
+"""
+# Import Built-Ins
+import logging
+import random
+import threading
+import time
+
+# Import Third-Party
+import requests
+
+# Import Homebrew
+from .exceptions import CircuitOpenError
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """
+    Retries idempotent public queries with jittered exponential backoff.
+    """
+    idempotent_verbs = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, retries=2, backoff=0.25, max_backoff=8,
+                 statuses=(429, 500, 502, 503, 504)):
+        """
+        Initialize Object.
+        :param retries: maximum number of retries per query
+        :param backoff: base delay in seconds; doubled on every retry
+        :param max_backoff: upper bound of the delay in seconds
+        :param statuses: HTTP status codes which warrant a retry
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    def should_retry(self, method_verb, authenticate, attempt, response=None,
+                     error=None):
+        """
+        Decides whether a query should be sent again.
+        :param method_verb: valid request type (PUT, GET, POST etc)
+        :param authenticate: bool, whether the query was signed
+        :param attempt: number of retries made so far
+        :param response: requests.Response obj, if one was received
+        :param error: exception raised while sending the query, if any
+        :return: bool
+        """
+        if authenticate or method_verb.upper() not in self.idempotent_verbs:
+            return False
+        if attempt >= self.retries:
+            return False
+        if error is not None:
+            return isinstance(error, (requests.ConnectionError,
+                                      requests.Timeout))
+        return response.status_code in self.statuses
+
+    def delay(self, attempt, response=None):
+        """
+        Returns the time to wait before the given retry ("full jitter"). A
+        Retry-After header sent by the exchange takes precedence.
+        :param attempt: number of retries made so far
+        :param response: requests.Response obj, if one was received
+        :return: float, seconds
+        """
+        try:
+            return min(float(response.headers['Retry-After']),
+                       self.max_backoff)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            pass
+        return random.uniform(0, min(self.max_backoff,
+                                     self.backoff * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker. Its state and counters are exposed via
+    stats() for monitoring.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        """
+        Initialize Object.
+        :param name: str, name of the exchange (used for logging)
+        :param failure_threshold: consecutive failures which open the breaker
+        :param reset_timeout: seconds to fail fast before probing again
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Raises CircuitOpenError if the query may not be sent.
+        :return:
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if (self.state == self.OPEN and
+                    time.monotonic() - self.opened_at >= self.reset_timeout):
+                # Let a single probe through
+                log.info("CircuitBreaker: Probing %s..", self.name)
+                self.state = self.HALF_OPEN
+                return
+            self.rejected += 1
+        raise CircuitOpenError("Circuit breaker for %s is %s!" %
+                               (self.name, self.state))
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                log.info("CircuitBreaker: %s is back up - closing breaker.",
+                         self.name)
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release(self):
+        """
+        Gives up a probe let through by before_call() which was never sent,
+        i.e. because signing the query failed; the next query probes instead.
+        :return:
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if (self.state == self.HALF_OPEN or
+                    self.failures >= self.failure_threshold):
+                if self.state != self.OPEN:
+                    self.trips += 1
+                    log.warning("CircuitBreaker: Opening breaker for %s after "
+                                "%s failures.", self.name, self.failures)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self):
+        """
+        Returns the breaker's state and counters.
+        :return: dict
+        """
+        with self._lock:
+            return {'state': self.state, 'failures': self.failures,
+                    'trips': self.trips, 'rejected': self.rejected}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name, failure_threshold=5, reset_timeout=30):
+    """
+    Returns the process-wide CircuitBreaker for the given exchange, creating
+    it with the given settings if necessary.
+    :param name: str, identifies the exchange (i.e. its API uri)
+    :return: CircuitBreaker
+    """
+    with _breakers_lock:
+        try:
+            return _breakers[name]
+        except KeyError:
+            _breakers[name] = CircuitBreaker(name, failure_threshold,
+                                             reset_timeout)
+            return _breakers[name]
+
+
+def breaker_stats():
+    """
+    Returns the stats of all circuit breakers, keyed by exchange.
+    :return: dict
+    """
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.stats() for name, breaker in breakers.items()}
@@ -1,22 +1,152 @@
+# Import Built-Ins
+import copy
+import logging
+import threading
+
 # Import Third-Party
 from requests import Response
 
+# Import Homebrew
+from ... import codec
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+# Serializes formatting of responses shared by several threads
+_format_lock = threading.Lock()
+
 
 class APIResponse(Response):
+    """
+    requests.Response with a `formatted` attribute, holding the standardized
+    representation of the payload.
+
+    The payload is parsed only once - json() memoizes its result - and the
+    formatter passed to set_formatter() is applied on first access of
+    `formatted`. Note that json() hence returns the same object on every call.
+    Responses may be shared by several threads (see
+    bitex.api.REST.singleflight); the formatter is applied once regardless.
+
+    Call lean() to drop everything but status, headers, elapsed time and the
+    parsed payload, i.e. before keeping the response around for long.
+    `content_length` keeps the size of the raw content in bytes regardless.
+    """
+    __attrs__ = Response.__attrs__ + ['_json', '_formatted', 'content_length']
 
     def __init__(self, req_response, formatted_json=None):
-        for k, v in req_response.__dict__.items():
-            self.__dict__[k] = v
+        if req_response._content is False:
+            # streamed response - read it now, as we drop the raw connection
+            req_response.content
+        for k in req_response.__attrs__:
+            self.__dict__[k] = getattr(req_response, k, None)
+        self._content_consumed = True
+        self._next = None
+        self.raw = None
+        self._json = getattr(req_response, '_json', None)
+        self.content_length = getattr(req_response, 'content_length', None)
+        if self.content_length is None:
+            self.content_length = len(self._content or b'')
         self._formatted = formatted_json
+        self._formatter = None
+        self._formatted_with = None
 
     @property
     def formatted(self):
+        if self._formatter is not None:
+            with _format_lock:
+                if self._formatter is not None:
+                    formatter, args, kwargs = self._formatter
+                    try:
+                        self._formatted = formatter(self.json(), *args,
+                                                    **kwargs)
+                    except Exception:
+                        log.exception("Error while applying formatter!")
+                    self._formatter = None
         return self._formatted
 
     @formatted.setter
     def formatted(self, value):
+        self._formatter = self._formatted_with = None
         self._formatted = value
 
+    def set_formatter(self, formatter, *args, **kwargs):
+        """
+        Sets the formatter to apply to the payload on first access of
+        `formatted`.
+        If the response has been set up for a different formatter already -
+        i.e. by another call sharing it - a copy is returned instead, which
+        shares the parsed payload but gets its own `formatted`.
+        :param formatter: bitex.formatters.Formatter() method, or None
+        :param args: positional args passed to the formatter
+        :param kwargs: keyword args passed to the formatter
+        :return: APIResponse
+        """
+        key = (formatter, args, kwargs) if formatter is not None else None
+        if key == self._formatted_with:
+            # Pending or applied already
+            return self
+        r = self
+        if self._formatted_with is not None:
+            r = copy.copy(self)
+            r._formatted = None
+        r._formatter = r._formatted_with = key
+        return r
+
+    def json(self, **kwargs):
+        """
+        Returns the parsed payload; parsed on first call only, unless kwargs
+        for json.loads() are given. Parsing is done by bitex.codec.
+        :param kwargs: Optional kwargs for json.loads()
+        :return: parsed payload
+        """
+        if kwargs:
+            return super(APIResponse, self).json(**kwargs)
+        if self._json is None:
+            try:
+                self._json = codec.loads(self.content)
+            except (codec.JSONDecodeError, TypeError):
+                # Not UTF-8 encoded, or not JSON at all - let requests decode
+                # it or raise its usual error
+                self._json = super(APIResponse, self).json()
+        return self._json
+
+    def lean(self):
+        """
+        Parses the payload, and drops the raw content as well as the request,
+        cookies and history to save memory. Status, headers, elapsed time,
+        url and the parsed payload (as well as `formatted`) remain available.
+        The raw content is kept if it cannot be parsed.
+        :return: self
+        """
+        try:
+            self.json()
+        except ValueError:
+            pass
+        else:
+            self._content = None
+        if self._formatter is None:
+            # Release the args of the formatted call
+            self._formatted_with = None
+        self.request = None
+        self.cookies = None
+        self.history = []
+        return self
+
+    def __getstate__(self):
+        # Apply a pending formatter, as it (and its args) can't be pickled
+        self.formatted
+        return super(APIResponse, self).__getstate__()
+
+    def __setstate__(self, state):
+        super(APIResponse, self).__setstate__(state)
+        self._formatter = self._formatted_with = None
+
+    def __copy__(self):
+        # requests.Response pickles only its __attrs__, which lack formatted
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        return new
+
 
 if __name__ == '__main__':
     from bitex import Kraken
@@ -24,4 +154,4 @@ if __name__ == '__main__':
     k = Kraken()
     resp = k.ticker('XXBTZEUR')
     print(resp.formatted)
-    print(resp.json())
\ No newline at end of file
+    print(resp.json())
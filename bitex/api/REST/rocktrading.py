@@ -9,17 +9,20 @@ import hmac
 
 # Import Homebrew
 from .api import APIClient
+from .ratelimit import Rate, RateLimit
 
 
 log = logging.getLogger(__name__)
 
 
 class RockTradingREST(APIClient):
+    rate_limit = RateLimit(default=Rate(10, 1, burst=10))
+
     def __init__(self, key=None, secret=None, api_version='v1',
-                 url='https://api.therocktrading.com', timeout=5):
+                 url='https://api.therocktrading.com', timeout=5, **kwargs):
         super(RockTradingREST, self).__init__(url, api_version=api_version,
                                               key=key, secret=secret,
-                                              timeout=timeout)
+                                              timeout=timeout, **kwargs)
 
     def sign(self, uri, endpoint, endpoint_path, method_verb, *args, **kwargs):
         nonce = self.nonce()
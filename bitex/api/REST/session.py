@@ -0,0 +1,79 @@
+"""
+Provides a keep-alive HTTP session with a bounded connection pool, which is
+owned by each APIClient and reused across all of its queries.
+"""
+# Import Built-Ins
+import logging
+import threading
+import time
+
+# Import Third-Party
+import requests
+from requests.adapters import HTTPAdapter
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session with a configurable urllib3 connection pool.
+
+    Connections are kept alive between requests and shared by all threads
+    using the session; at most `pool_maxsize` connections are kept open per
+    host. If the session has not been used for `idle_timeout` seconds, the
+    pooled connections are closed before the next request, so we don't send
+    requests down sockets the exchange has long since dropped.
+    """
+    def __init__(self, pool_connections=1, pool_maxsize=10, pool_block=False,
+                 idle_timeout=30):
+        """
+        Initialize Session.
+        :param pool_connections: number of per-host pools to cache
+        :param pool_maxsize: maximum number of connections kept per host
+        :param pool_block: bool, block if no free connection is available,
+                           instead of opening a throw-away connection
+        :param idle_timeout: seconds after which idle connections are evicted;
+                             None disables eviction
+        """
+        super(PooledSession, self).__init__()
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.idle_timeout = idle_timeout
+        self.evictions = 0
+        self._last_used = time.monotonic()
+        self._lock = threading.Lock()
+
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def evict_idle(self, now=None):
+        """
+        Closes all pooled connections if the session has been idle for longer
+        than self.idle_timeout. The pools are re-created on the next request.
+        :param now: monotonic timestamp, defaults to time.monotonic()
+        :return: bool, True if connections were evicted
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = now - self._last_used
+            self._last_used = now
+            if self.idle_timeout is None or idle < self.idle_timeout:
+                return False
+            self.evictions += 1
+
+        log.debug("PooledSession.evict_idle(): Session idle for %.1fs - "
+                  "closing pooled connections", idle)
+        for adapter in self.adapters.values():
+            adapter.close()
+        return True
+
+    def request(self, *args, **kwargs):
+        self.evict_idle()
+        return super(PooledSession, self).request(*args, **kwargs)
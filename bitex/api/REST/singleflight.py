@@ -0,0 +1,127 @@
+"""
+Single-flight coalescing of identical public queries.
+
+While an unauthenticated GET query is in flight, identical queries (same
+exchange, endpoint and request kwargs) issued by other threads don't hit the
+network; they wait for the first one and share its APIResponse - including
+its parsed payload and, if formatted with the same formatter and arguments,
+its `formatted` result.
+"""
+# Import Built-Ins
+import logging
+import threading
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+def freeze(obj):
+    """
+    Converts obj into a hashable equivalent (dicts and lists into tuples).
+    :param obj: request kwargs or one of their values
+    :return: hashable obj
+    """
+    if isinstance(obj, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    try:
+        hash(obj)
+    except TypeError:
+        return repr(obj)
+    return obj
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers with the same
+    key get the result (or exception) of the call in flight.
+    """
+    def __init__(self, name=None):
+        self.name = name
+        self.calls = 0
+        self.deduplicated = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Calls func(*args, **kwargs), unless a call with the same key is in
+        flight already - in which case its outcome is shared.
+        :param key: hashable obj identifying the call
+        :param func: callable to run
+        :return: func's return value
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """
+        Returns the number of calls made and of those that were deduplicated.
+        :return: dict
+        """
+        with self._lock:
+            return {'calls': self.calls, 'deduplicated': self.deduplicated,
+                    'in_flight': len(self._in_flight)}
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def get_group(name):
+    """
+    Returns the process-wide SingleFlight group of the given exchange.
+    :param name: str, identifies the exchange (i.e. its API uri)
+    :return: SingleFlight
+    """
+    with _groups_lock:
+        try:
+            return _groups[name]
+        except KeyError:
+            _groups[name] = SingleFlight(name)
+            return _groups[name]
+
+
+def single_flight_stats():
+    """
+    Returns the stats of all SingleFlight groups, keyed by exchange.
+    :return: dict
+    """
+    with _groups_lock:
+        groups = dict(_groups)
+    return {name: group.stats() for name, group in groups.items()}
@@ -1,7 +1,28 @@
-from .bitfinex import BitfinexWSS
-from .bitstamp import BitstampWSS
-from .gdax import GDAXWSS
-from .gemini import GeminiWSS
-from .hitbtc import HitBTCWSS
-from .okcoin import OKCoinWSS
-from .poloniex import PoloniexWSS
+"""
+Websocket clients; each is imported on first access, along with the
+websocket library it depends on.
+"""
+# Import Homebrew
+from ..._lazy import lazy_exports
+
+__all__ = ['BitfinexWSS', 'BitstampWSS', 'GDAXWSS', 'GeminiWSS', 'HitBTCWSS',
+           'OKCoinWSS', 'PoloniexWSS', 'L2Book', 'L3Book', 'BoundedQueue',
+           'AsyncWSSRuntime', 'ShmRing', 'ShmRingReader']
+
+_exports = {
+    'BitfinexWSS': ('.bitfinex', 'BitfinexWSS'),
+    'BitstampWSS': ('.bitstamp', 'BitstampWSS'),
+    'GDAXWSS': ('.gdax', 'GDAXWSS'),
+    'GeminiWSS': ('.gemini', 'GeminiWSS'),
+    'HitBTCWSS': ('.hitbtc', 'HitBTCWSS'),
+    'OKCoinWSS': ('.okcoin', 'OKCoinWSS'),
+    'PoloniexWSS': ('.poloniex', 'PoloniexWSS'),
+    'L2Book': ('.orderbook', 'L2Book'),
+    'L3Book': ('.orderbook', 'L3Book'),
+    'BoundedQueue': ('.queues', 'BoundedQueue'),
+    'AsyncWSSRuntime': ('.aio', 'AsyncWSSRuntime'),
+    'ShmRing': ('.shm', 'ShmRing'),
+    'ShmRingReader': ('.shm', 'ShmRingReader'),
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
@@ -0,0 +1,306 @@
+"""
+Asyncio runtime for the websocket clients.
+
+Each client started via its own start() method runs at least one receiving
+thread per connection - GeminiWSS one per symbol - plus controller and
+processing threads. AsyncWSSRuntime instead hosts any number of clients on a
+single event loop: it opens the connections returned by each client's
+_connections(), and calls the client's _on_open(), _on_message() and
+_on_tick() hooks - the same protocol code the client's threads run.
+
+Messages are consumed with `async for`:
+
+    runtime = AsyncWSSRuntime(BitfinexWSS(pairs=['BTCUSD']),
+                              GeminiWSS(['btcusd', 'ethusd']))
+    async for name, channel, pair, *data in runtime:
+        ...
+
+Code which isn't asynchronous may call start() instead, which runs the loop
+in a single background thread, and read from the clients' data_q as before.
+
+Requires the `websockets` package.
+"""
+# Import Built-Ins
+import asyncio
+import logging
+import time
+from collections import deque
+from queue import Empty
+from threading import Event, Thread, get_ident
+
+# Import Third-Party
+try:
+    import websockets
+    websockets_available = True
+except ImportError:
+    websockets_available = False
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class _Connection:
+    """
+    Connection obj handed to a client's hooks. send() may be called from any
+    thread; payloads are written to the websocket by a writer task.
+    """
+    def __init__(self, runtime):
+        self._runtime = runtime
+        self._outbox = asyncio.Queue()
+
+    def send(self, payload):
+        self._runtime._call(self._outbox.put_nowait, payload)
+
+    def close(self):
+        self._runtime._call(self._outbox.put_nowait, None)
+
+
+class AsyncWSSRuntime:
+    """
+    Hosts websocket clients on a single asyncio event loop, see module
+    docstring.
+
+    Once a consumer iterates over the runtime, all messages published by its
+    clients are routed to it, tagged with the client's name; at most maxsize
+    of them are buffered (unbounded if 0), after which the oldest are dropped.
+    Otherwise, messages are put on each client's data_q - note that a full
+    data_q with the 'block' policy stalls the event loop until there's room.
+    """
+    def __init__(self, *clients, maxsize=0, reconnect_delay=1,
+                 tick_interval=1, connect_kwargs=None):
+        """
+        Initialize Object.
+        :param clients: WSSAPI objs implementing the protocol hooks
+        :param maxsize: int, max. number of buffered messages for `async for`
+        :param reconnect_delay: float, seconds to wait before reconnecting
+        :param tick_interval: float, seconds between calls of _on_tick()
+        :param connect_kwargs: dict, passed to websockets.connect()
+        """
+        if not websockets_available:
+            raise SystemError("No websockets Installed! AsyncWSSRuntime "
+                              "Unavailable!")
+        self.clients = list(clients)
+        self.maxsize = maxsize
+        self.reconnect_delay = reconnect_delay
+        self.tick_interval = tick_interval
+        self.connect_kwargs = connect_kwargs or {}
+        self.running = False
+        self._done = False
+
+        self._loop = None
+        self._loop_thread = None  # Thread ident of the event loop
+        self._thread = None
+        self._started = Event()
+        self._stopped = None
+        self._tasks = []
+        self._sockets = {client: {} for client in self.clients}
+        self._messages = None
+        self._waiter = None
+        self._stats = {'reconnects': 0, 'messages': 0, 'dropped': 0}
+
+    def _call(self, func, *args):
+        # Runs func in the event loop; directly, if called from it
+        if get_ident() == self._loop_thread:
+            func(*args)
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    ##
+    # Thread facade
+    ##
+
+    def start(self):
+        """
+        Runs the event loop in a background thread, and returns once the
+        clients' connections are being established.
+        :return:
+        """
+        self._started.clear()
+        self._thread = Thread(target=asyncio.run, args=(self.run(),),
+                              daemon=True, name='AsyncWSSRuntime Thread')
+        self._thread.start()
+        self._started.wait()
+
+    def stop(self):
+        """
+        Closes all connections and stops the event loop; also works from
+        within the loop, if run() was awaited directly.
+        :return:
+        """
+        if self._loop is not None and self._stopped is not None:
+            self._call(self._stopped.set)
+        if self._thread is not None and get_ident() != self._loop_thread:
+            self._thread.join()
+            self._thread = None
+
+    ##
+    # Event loop
+    ##
+
+    async def run(self):
+        """
+        Connects all clients, and keeps their connections alive until stop()
+        is called.
+        :return:
+        """
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = get_ident()
+        self._stopped = asyncio.Event()
+        self.running = True
+        self._done = False
+        for client in self.clients:
+            client.running = True
+            for key, url in client._connections():
+                self._tasks.append(asyncio.ensure_future(
+                    self._connect(client, key, url)))
+            self._tasks.append(asyncio.ensure_future(
+                self._housekeeping(client)))
+        self._started.set()
+
+        try:
+            await self._stopped.wait()
+        finally:
+            self.running = False
+            for client in self.clients:
+                client.running = False
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            self._done = True
+            if self._waiter is not None and not self._waiter.done():
+                self._waiter.set_result(None)
+            self._loop_thread = None
+
+    async def _connect(self, client, key, url):
+        """
+        Keeps the given connection of client alive, passing received messages
+        to its _on_message() hook.
+        """
+        while client.running:
+            try:
+                async with websockets.connect(url, max_size=None,
+                                              **self.connect_kwargs) as ws:
+                    await self._session(client, key, ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("AsyncWSSRuntime: %s connection %s failed!",
+                              client.name, url)
+            if client.running:
+                self._stats['reconnects'] += 1
+                await asyncio.sleep(self.reconnect_delay)
+
+    async def _session(self, client, key, ws):
+        conn = _Connection(self)
+        writer = asyncio.ensure_future(self._write(ws, conn))
+        self._sockets[client][key] = ws
+        try:
+            client._on_open(key, conn)
+            async for raw in ws:
+                self._stats['messages'] += 1
+                try:
+                    in_sync = client._on_message(key, raw, time.time())
+                except Exception:
+                    log.exception("AsyncWSSRuntime: %s failed to handle %r!",
+                                  client.name, raw)
+                    continue
+                if in_sync is False:
+                    break
+        finally:
+            if self._sockets[client].get(key) is ws:
+                del self._sockets[client][key]
+            writer.cancel()
+
+    @staticmethod
+    async def _write(ws, conn):
+        while True:
+            payload = await conn._outbox.get()
+            if payload is None:
+                await ws.close()
+                return
+            await ws.send(payload)
+
+    async def _housekeeping(self, client):
+        """
+        Calls the client's _on_tick() hook, and evaluates the commands its
+        handlers put on its _controller_q: 'stop' closes the client, an
+        endpoint (connection key) re-establishes that connection, and any
+        other command, i.e. 'restart', all of the client's connections.
+        """
+        while client.running:
+            await asyncio.sleep(self.tick_interval)
+            keys = set()
+            try:
+                if client._on_tick(time.time()) is False:
+                    keys.update(self._sockets[client])
+            except Exception:
+                log.exception("AsyncWSSRuntime: %s._on_tick() failed!",
+                              client.name)
+            while True:
+                try:
+                    cmd = client._controller_q.get_nowait()
+                except Empty:
+                    break
+                if cmd == 'stop':
+                    client.running = False
+                if cmd in self._sockets[client]:
+                    keys.add(cmd)
+                else:
+                    keys.update(self._sockets[client])
+            for key in keys:
+                ws = self._sockets[client].get(key)
+                if ws is not None:
+                    await ws.close()
+
+    ##
+    # Consumer interface
+    ##
+
+    def _deliver(self, client, msg):
+        buffer = self._messages
+        if self.maxsize and len(buffer) >= self.maxsize:
+            buffer.popleft()
+            self._stats['dropped'] += 1
+        buffer.append((client.name,) + msg)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _subscribe(self):
+        self._messages = deque()
+        for client in self.clients:
+            def deliver(msg, client=client):
+                self._call(self._deliver, client, msg)
+            client.add_subscriber(target=deliver)
+
+    async def messages(self):
+        """
+        Asynchronous generator of (client name, channel, pair, ..) tuples, in
+        arrival order; ends once the runtime was stopped. Iterate in the event
+        loop running the runtime, i.e. alongside `await runtime.run()`.
+        :return:
+        """
+        if self._messages is None:
+            self._subscribe()
+        buffer = self._messages
+        while True:
+            while buffer:
+                yield buffer.popleft()
+            if self._done:
+                return
+            self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
+
+    def __aiter__(self):
+        return self.messages()
+
+    def stats(self):
+        """
+        Returns the number of open connections, reconnects, received and
+        dropped messages.
+        :return: dict
+        """
+        return dict(self._stats, connections=sum(len(sockets) for sockets in
+                                                 self._sockets.values()))
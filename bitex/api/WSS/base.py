@@ -1,11 +1,13 @@
 # Import Built-Ins
+import asyncio
 import logging
 from queue import Queue, Empty
-from threading import Thread
+from threading import Lock, Thread
 
 # Import Third-Party
 
 # Import Homebrew
+from .queues import BoundedQueue
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -16,7 +18,19 @@ class WSSAPI:
     Base Class with no actual connection functionality. This is added in the
     subclass, as the various wss APIs are too diverse in order to distill a
     sensible pool of common attributes.
+
+    Received data is put on self.data_q, a BoundedQueue holding at most
+    queue_maxsize messages (unbounded if 0); see bitex.api.WSS.queues for the
+    available queue_policy values. Set these on a subclass, or call
+    configure_queue() on an instance before starting it.
+
+    Consumers interested in particular channels and pairs only may register
+    via add_subscriber() instead; messages are routed to the subscribers of
+    their (channel, pair), and only put on data_q if there are none.
     """
+    queue_maxsize = 0
+    queue_policy = 'block'
+
     def __init__(self, addr, name):
         """
         Initialize Object.
@@ -35,7 +49,13 @@ class WSSAPI:
         self._controller_q = Queue()
 
         # Queue storing all received data
-        self.data_q = Queue()
+        self.data_q = BoundedQueue(self.queue_maxsize, self.queue_policy)
+
+        # Dict of (channel, pair): tuple of subscribers; replaced, rather than
+        # modified, so publish() can read it without locking
+        self._subscribers = {}
+        self._subscribers_lock = Lock()
+        self._wildcards = False  # Whether a subscriber used channel/pair None
 
         # Internal Controller thread, responsible for starts / restarts / stops
         self._controller_thread = None
@@ -84,6 +104,47 @@ class WSSAPI:
             log.debug("WSSAPI._controller(): Received command: %s", cmd)
             Thread(target=self.eval_command, args=(cmd,)).start()
 
+    ##
+    # Protocol hooks, shared by the client's own threads and the asyncio
+    # runtime (see bitex.api.WSS.aio)
+    ##
+
+    def _connections(self):
+        """
+        Returns the websocket connections the client needs.
+        :return: list of (key, url) tuples; key is passed to the other hooks
+        """
+        raise NotImplementedError("%s can't be hosted by the asyncio runtime!"
+                                  % self.__class__.__name__)
+
+    def _on_open(self, key, conn):
+        """
+        Called once a connection was established; sends subscriptions.
+        :param key: key of the connection, as returned by _connections()
+        :param conn: connection obj, offering send(str)
+        :return:
+        """
+        pass
+
+    def _on_message(self, key, raw, ts):
+        """
+        Handles a message received via the given connection.
+        :param key: key of the connection, as returned by _connections()
+        :param raw: str, message as received
+        :param ts: timestamp, declares when data was received by the client
+        :return: False to have the connection re-established
+        """
+        raise NotImplementedError()
+
+    def _on_tick(self, ts):
+        """
+        Called about once a second while the client is hosted by the asyncio
+        runtime, for periodic housekeeping.
+        :param ts: current timestamp
+        :return: False to have the client's connections re-established
+        """
+        pass
+
     def send(self, payload):
         """
         Method to send instructions for subcribing, unsubscribing, etc to
@@ -109,3 +170,160 @@ class WSSAPI:
 
     def get(self, **kwargs):
         return self.data_q.get(**kwargs)
+
+    def get_batch(self, max_items=100, timeout=None):
+        """
+        Removes and returns up to max_items messages from self.data_q in
+        arrival order, under a single lock acquisition; waits at most timeout
+        seconds for the first one (forever, if None).
+        :param max_items: int, max. number of messages to return
+        :param timeout: float, seconds to wait for the first message
+        :return: list of messages; empty if the timeout expired
+        """
+        try:
+            return self.data_q.get_batch(max_items, timeout)
+        except AttributeError:
+            # Not a BoundedQueue (i.e. a multiprocessing.Queue)
+            pass
+        try:
+            batch = [self.data_q.get(timeout=timeout)]
+        except Empty:
+            return []
+        try:
+            while len(batch) < max_items:
+                batch.append(self.data_q.get_nowait())
+        except Empty:
+            pass
+        return batch
+
+    def batches(self, max_items=100, timeout=1):
+        """
+        Yields batches of messages (see get_batch()) until the client was
+        stopped and self.data_q is drained.
+        :param max_items: int, max. number of messages per batch
+        :param timeout: float, seconds between checks whether the client is
+                        still running
+        :return: generator of lists
+        """
+        while True:
+            batch = self.get_batch(max_items, timeout)
+            if batch:
+                yield batch
+            elif not self.running:
+                return
+
+    async def get_batch_async(self, max_items=100, timeout=None):
+        """
+        Coroutine version of get_batch(); waits in the loop's default executor,
+        so the event loop isn't blocked.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.get_batch, max_items,
+                                          timeout)
+
+    async def batches_async(self, max_items=100, timeout=1):
+        """
+        Asynchronous generator version of batches().
+        """
+        while True:
+            batch = await self.get_batch_async(max_items, timeout)
+            if batch:
+                yield batch
+            elif not self.running:
+                return
+
+    def configure_queue(self, maxsize, policy='block', **kwargs):
+        """
+        Replaces self.data_q with a new BoundedQueue. Call this before
+        starting the client; messages queued already are discarded.
+        :param maxsize: int, max. number of queued messages; 0 is unbounded
+        :param policy: str, 'block', 'drop_oldest', 'drop_newest' or
+                       'conflate'; don't conflate delta channels (book
+                       updates), see bitex.api.WSS.queues
+        :param kwargs: passed to BoundedQueue, i.e. the conflation key
+        :return:
+        """
+        if self.running:
+            raise RuntimeError("Cannot replace the data queue of a running "
+                               "client!")
+        self.queue_maxsize, self.queue_policy = maxsize, policy
+        self.data_q = BoundedQueue(maxsize, policy, **kwargs)
+
+    def add_subscriber(self, channel=None, pair=None, target=None,
+                       maxsize=0, policy='block'):
+        """
+        Subscribes target to the messages of the given channel and pair.
+        Messages are passed to it as the tuples otherwise put on data_q.
+        :param channel: str, channel as found in the first field of a message;
+                        None for all channels
+        :param pair: str, pair as found in the second field of a message;
+                     None for all pairs
+        :param target: callable, or object with a put() method (i.e. a Queue);
+                       if None, a new BoundedQueue is created
+        :param maxsize: int, max. size of the created queue
+        :param policy: str, drop policy of the created queue
+        :return: target, or the created queue
+        """
+        if target is None:
+            target = BoundedQueue(maxsize, policy)
+        with self._subscribers_lock:
+            subscribers = self._subscribers.get((channel, pair), ())
+            self._subscribers[(channel, pair)] = subscribers + (target,)
+            self._wildcards |= channel is None or pair is None
+        return target
+
+    def remove_subscriber(self, channel=None, pair=None, target=None):
+        """
+        Removes target from the subscribers of the given channel and pair.
+        :param channel: str or None, as passed to add_subscriber()
+        :param pair: str or None, as passed to add_subscriber()
+        :param target: subscriber, as returned by add_subscriber()
+        :return:
+        """
+        with self._subscribers_lock:
+            subscribers = tuple(s for s in self._subscribers.get((channel, pair),
+                                                                ())
+                                if s is not target)
+            if subscribers:
+                self._subscribers[(channel, pair)] = subscribers
+            else:
+                self._subscribers.pop((channel, pair), None)
+            self._wildcards = any(None in key for key in self._subscribers)
+
+    def publish(self, channel, pair, *data):
+        """
+        Passes a message to the subscribers of its channel and pair - and of
+        its channel or all channels - or puts it on data_q if there are none.
+        Callables are called directly, in the publishing thread.
+        :param channel: str, name of the channel
+        :param pair: str, pair the data belongs to
+        :param data: remaining fields of the message
+        :return:
+        """
+        msg = (channel, pair) + data
+        subscribers = self._subscribers
+        targets = subscribers.get((channel, pair), ())
+        if self._wildcards:
+            targets += (subscribers.get((channel, None), ()) +
+                        subscribers.get((None, pair), ()) +
+                        subscribers.get((None, None), ()))
+        if not targets:
+            self.data_q.put(msg)
+            return
+        for target in targets:
+            try:
+                if callable(target):
+                    target(msg)
+                else:
+                    target.put(msg)
+            except Exception:
+                log.exception("WSSAPI.publish(): Subscriber %r failed on %s",
+                              target, msg[:2])
+
+    def queue_stats(self):
+        """
+        Returns the size, bound, policy and number of dropped messages of
+        self.data_q.
+        :return: dict
+        """
+        return self.data_q.stats()
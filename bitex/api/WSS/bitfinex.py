@@ -1,9 +1,10 @@
 # Import Built-Ins
 import logging
-import json
 import time
 import queue
+import heapq
 import threading
+import zlib
 from threading import Thread
 
 # Import Third-Party
@@ -12,6 +13,8 @@ from websocket import WebSocketConnectionClosedException
 
 # Import Homebrew
 from .base import WSSAPI
+from .orderbook import L2Book, L3Book, absolute
+from ...codec import loads as json_loads, dumps as json_dumps
 
 # import Server-side Exceptions
 from .exceptions import InvalidBookLengthError, GenericSubscriptionError
@@ -29,11 +32,76 @@ from .exceptions import FaultyPayloadError
 log = logging.getLogger(__name__)
 
 
+def _negate(amount):
+    # Restores the signed amount of an ask, as sent by the server
+    if isinstance(amount, str):
+        return '-' + amount
+    return -amount
+
+
+class _BookChecksum:
+    """
+    Computes Bitfinex' CRC32 checksum over the interleaved top 25 bids and asks
+    of a book, as `price:amount` (or `id:amount` for raw books) joined by ':'.
+
+    The entries and the running CRC after each entry are kept, so a new
+    computation only hashes the entries from the first changed one onwards.
+    """
+    depth = 25
+
+    def __init__(self):
+        self._entries = []
+        self._crcs = [0]
+
+    def compute(self, bids, asks):
+        """
+        Returns the checksum of the given levels, as signed 32-bit int.
+        :param bids: list of (price or order id, amount) tuples, best first
+        :param asks: list of (price or order id, amount) tuples, best first;
+                     amounts are negative
+        :return: int
+        """
+        entries = []
+        for i in range(self.depth):
+            if i < len(bids):
+                entries.append(bids[i])
+            if i < len(asks):
+                entries.append(asks[i])
+
+        # Skip the unchanged prefix
+        start = 0
+        end = min(len(entries), len(self._entries))
+        while start < end and entries[start] == self._entries[start]:
+            start += 1
+
+        crcs = self._crcs[:start + 1]
+        crc = crcs[-1]
+        for i in range(start, len(entries)):
+            key, amount = entries[i]
+            token = ('%s:%s' if i == 0 else ':%s:%s') % (key, amount)
+            crc = zlib.crc32(token.encode('ascii'), crc)
+            crcs.append(crc)
+        self._entries, self._crcs = entries, crcs
+        return crc - 2 ** 32 if crc >= 2 ** 31 else crc
+
+
 class BitfinexWSS(WSSAPI):
     """
     Client Class to connect to Bitfinex Websocket API. Data is stored in attributes.
     Features error handling and logging, as well as reconnection automation if
     the Server issues a connection reset.
+
+    If checksums are enabled via config(checksum=True), each checksum sent is
+    verified against the locally maintained book of its channel; on a
+    mismatch, only that channel is resubscribed to, which provides a fresh
+    snapshot. Checksums are calculated from prices and amounts as received,
+    and hence require decimals_as_strings.
+
+    If sequencing is enabled via config(sequencing=True), the sequence number
+    trailing each message is checked for gaps and duplicates; duplicates are
+    dropped, and on a gap all book channels are resubscribed to, as the
+    connection-wide sequence doesn't tell which channel missed an update.
+    See sequence_stats().
     """
 
     def __init__(self, pairs=None):
@@ -53,16 +121,30 @@ class BitfinexWSS(WSSAPI):
                           'LTCBTC', 'DSHUSD', 'DSHBTC']
 
         # Set up variables for receiver and main loop threads
-        self._receiver_lock = threading.Lock()
-        self._processor_lock = threading.Lock()
+        self._unpaused = threading.Event()  # Cleared while paused
+        self._unpaused.set()
+        self._paused_payloads = []  # Payloads sent while paused
+        self._send_lock = threading.Lock()
         self.receiver_q = queue.Queue()
+        self.housekeeping_interval = 1  # Max. seconds between heartbeat checks
         self.receiver_thread = None
         self.processing_thread = None
 
         self.ping_timer = None
         self.timeout = 5
-        self._heartbeats = {}
-        self._late_heartbeats = {}
+        self.ping_interval = 30  # Seconds between pings
+        self.heartbeat_timeout = 10  # Seconds a channel may stay silent
+        # Called with channel id, channel label and seconds since the last
+        # message, when a channel is late
+        self.on_late_channel = None
+        self._heartbeats = {}  # Dict of channel id: time of last message
+        self._late_heartbeats = {}  # Dict of channel id: time it was found late
+        # Min-heap of (deadline, channel id); entries whose deadline doesn't
+        # match self._deadlines[chan_id] are stale, and dropped when popped
+        self._deadline_heap = []
+        self._deadlines = {}
+        self._next_ping = None
+        self._late_count = 0
 
         # Set up book-keeping variables & configurations
         self.api_version = None
@@ -71,6 +153,15 @@ class BitfinexWSS(WSSAPI):
         self.channel_states = {}  # Dict for matching channel ids with status of each channel (alive/dead)
         self.channel_configs = {}  # Variables, as set by subscribe command
         self.wss_config = {}  # Config as passed by 'config' command
+        self._config_kwargs = {}  # Arguments of the last config() call
+        self.books = {}  # Dict of pair: L2Book, maintained from book channels
+        self.raw_books = {}  # Dict of pair: L3Book, from raw book channels
+        self._checksums = {}  # Dict of channel id: _BookChecksum
+        self._checksum_stats = {}
+        self._resubscribing = {}  # channel id: label to subscribe to again
+        self._sequences = {}  # 'public'/'auth': last sequence number received
+        self._sequence_stats = {'gaps': 0, 'duplicates': 0, 'auth_gaps': 0,
+                                'auth_duplicates': 0}
 
         self._event_handlers = {'error': self._raise_error,
                                 'unsubscribed': self._handle_unsubscribed,
@@ -115,45 +206,93 @@ class BitfinexWSS(WSSAPI):
         elif cmd == 'stop':
             self.stop()
 
+    def _schedule(self, chan_id, deadline):
+        """
+        Schedules the heartbeat check of a channel; any earlier entry of the
+        channel becomes stale.
+        :param chan_id: int, channel id
+        :param deadline: timestamp, when to check the channel
+        :return:
+        """
+        self._deadlines[chan_id] = deadline
+        heapq.heappush(self._deadline_heap, (deadline, chan_id))
+
+    def _next_deadline(self):
+        """
+        Returns the timestamp of the next heartbeat check or ping, or None.
+        """
+        deadlines = [d for d in (self._next_ping, self._deadline_heap and
+                                 self._deadline_heap[0][0]) if d]
+        return min(deadlines) if deadlines else None
+
     def _check_heartbeats(self, ts, *args, **kwargs):
         """
-        Checks if the heartbeats are on-time. If not, the channel id is escalated
-        to self._late_heartbeats and a warning is issued; once a hb is received
-        again from this channel, it'll be removed from this dict, and an Info
-        message logged.
+        Checks the channels whose heartbeat deadline has passed, and pings the
+        server every self.ping_interval seconds.
+
+        Receiving a message only records its time; a channel's deadline is
+        moved when it's due, so only due channels are looked at. A channel
+        which hasn't sent anything for self.heartbeat_timeout seconds is
+        escalated to self._late_heartbeats, counted, logged and passed to
+        self.on_late_channel; it is checked again once it sends data again
+        (see handle_data()).
         :param ts: timestamp, declares when data was received by the client
         :return:
         """
-        for chan_id in self._heartbeats:
-            if ts - self._heartbeats[chan_id] >= 10:
-                if chan_id not in self._late_heartbeats:
-                    try:
-                        # This is newly late; escalate
-                        log.warning("BitfinexWSS.heartbeats: Channel %s hasn't "
-                                    "sent a heartbeat in %s seconds!",
-                                    self.channel_labels[chan_id],
-                                    ts - self._heartbeats[chan_id])
-                        self._late_heartbeats[chan_id] = ts
-                    except KeyError:
-                        # This channel ID Is not known to us - log and raise
-                        log.error("BitfinexWSS.heartbeats: Channel %s is not "
-                                  "registered in the connector's registry! "
-                                  "Restarting Connection to avoid errors..",
-                                  chan_id)
-                        raise UnknownChannelError
-                else:
-                    # We know of this already
-                    continue
-            else:
-                # its not late
-                try:
-                    self._late_heartbeats.pop(chan_id)
-                except KeyError:
-                    # wasn't late before, check next channel
-                    continue
-                log.info("BitfinexWSS.heartbeats: Channel %s has sent a "
-                         "heartbeat again!", self.channel_labels[chan_id])
-            self.ping()
+        heap = self._deadline_heap
+        while heap and heap[0][0] <= ts:
+            deadline, chan_id = heapq.heappop(heap)
+            if self._deadlines.get(chan_id) != deadline:
+                continue  # Stale entry
+            try:
+                last = self._heartbeats[chan_id]
+            except KeyError:
+                self._deadlines.pop(chan_id)
+                continue
+            if ts - last < self.heartbeat_timeout:
+                self._schedule(chan_id, last + self.heartbeat_timeout)
+                continue
+
+            # This is newly late; escalate
+            del self._deadlines[chan_id]
+            self._late_heartbeats[chan_id] = ts
+            self._late_count += 1
+            label = self.channel_labels.get(chan_id)
+            log.warning("BitfinexWSS.heartbeats: Channel %s hasn't sent a "
+                        "heartbeat in %s seconds!", label or chan_id,
+                        ts - last)
+            if self.on_late_channel is not None:
+                self.on_late_channel(chan_id, label, ts - last)
+
+        if self._next_ping is None:
+            self._next_ping = ts + self.ping_interval
+        elif ts >= self._next_ping:
+            self._next_ping = ts + self.ping_interval
+            if self.conn and self.ping_timer is None and \
+                    self._unpaused.is_set():
+                self.ping()
+
+    def _handle_late_channel_message(self, ts, chan_id):
+        """
+        Called for the first message of a channel escalated as late.
+        :param ts: timestamp, declares when data was received by the client
+        :param chan_id: int, channel id
+        :return:
+        """
+        self._late_heartbeats.pop(chan_id)
+        self._schedule(chan_id, ts + self.heartbeat_timeout)
+        log.info("BitfinexWSS.heartbeats: Channel %s has sent a "
+                 "heartbeat again!", self.channel_labels.get(chan_id, chan_id))
+
+    def heartbeat_stats(self):
+        """
+        Returns the number of times channels were found late, and the labels
+        of the channels currently late.
+        :return: dict
+        """
+        return {'late': self._late_count,
+                'late_channels': [self.channel_labels.get(chan_id, chan_id)
+                                  for chan_id in self._late_heartbeats]}
 
     def _check_ping(self):
         """
@@ -165,20 +304,43 @@ class BitfinexWSS(WSSAPI):
 
     def pause(self):
         """
-        Pauses the client
+        Pauses the client, as requested by the server during maintenance
+        (info code 20060). Messages are still received and processed, but
+        outgoing payloads (subscriptions, pings, ..) are held back until
+        unpause() is called.
         :return:
         """
-        self._receiver_lock.acquire()
+        with self._send_lock:
+            self._unpaused.clear()
         log.info("BitfinexWSS.pause(): Pausing client..")
 
     def unpause(self):
         """
-        Unpauses the client
+        Unpauses the client (info code 20061), and sends the payloads held
+        back while paused.
         :return:
         """
-        self._receiver_lock.release()
+        with self._send_lock:
+            self._unpaused.set()
+            payloads, self._paused_payloads = self._paused_payloads, []
+            if self.conn is None:
+                log.info("BitfinexWSS.unpause(): Not connected - dropping %s "
+                         "payloads!", len(payloads))
+                payloads = []
+            for payload in payloads:
+                self.conn.send(payload)
         log.info("BitfinexWSS.pause(): Unpausing client..")
 
+    def _reset_pause(self):
+        """
+        Unpauses the client without sending the payloads held back, as they
+        belong to a previous connection; a new connection starts unpaused.
+        :return:
+        """
+        with self._send_lock:
+            self._unpaused.set()
+            self._paused_payloads = []
+
     def start(self):
         """
         Start the websocket client threads
@@ -220,6 +382,8 @@ class BitfinexWSS(WSSAPI):
         super(BitfinexWSS, self).stop()
 
         log.info("BitfinexWSS.stop(): Stopping client..")
+        # Wake up the processing thread
+        self.receiver_q.put(None)
 
         log.info("BitfinexWSS.stop(): Joining receiver thread..")
         try:
@@ -250,6 +414,12 @@ class BitfinexWSS(WSSAPI):
         self.processing_thread = None
         self.receiver_thread = None
 
+        # Flags, sequences and pauses are per connection
+        self.wss_config = {}
+        self._sequences = {}
+        self.ping_timer = None
+        self._reset_pause()
+
         log.info("BitfinexWSS.stop(): Done!")
 
     def restart(self, soft=False):
@@ -259,21 +429,37 @@ class BitfinexWSS(WSSAPI):
         :return:
         """
         log.info("BitfinexWSS.restart(): Restarting client..")
+        # stop() resets a pause, so start() doesn't hold back subscriptions
         super(BitfinexWSS, self).restart()
 
         # cache channel labels temporarily if soft == True
         channel_labels = [self.channel_labels[k] for k in self.channel_labels] if soft else None
 
-        # clear previous channel caches
-        self.channels = {}
-        self.channel_labels = {}
-        self.channel_states = {}
+        self._clear_channels()
 
         if channel_labels:
             # re-subscribe to channels
             for channel_name, kwargs in channel_labels:
+                # Raw books are subscribed to via the book channel
+                if channel_name == 'raw_book':
+                    channel_name = 'book'
                 self._subscribe(channel_name, **kwargs)
 
+    def _clear_channels(self):
+        """
+        Clears the channel caches of the previous connection.
+        :return:
+        """
+        self.channels = {}
+        self.channel_labels = {}
+        self.channel_states = {}
+        self._checksums = {}
+        self._resubscribing = {}
+        self._heartbeats = {}
+        self._late_heartbeats = {}
+        self._deadline_heap = []
+        self._deadlines = {}
+
     def receive(self):
         """
         Receives incoming websocket messages, and puts them on the Client queue
@@ -281,28 +467,23 @@ class BitfinexWSS(WSSAPI):
         :return:
         """
         while self.running:
-            if self._receiver_lock.acquire(blocking=False):
-                try:
-                    raw = self.conn.recv()
-                except WebSocketTimeoutException:
-                    self._receiver_lock.release()
-                    continue
-                except WebSocketConnectionClosedException:
-                    # this needs to restart the client, while keeping track
-                    # of the currently subscribed channels!
-                    self.conn = None
-                    self._controller_q.put('restart')
-                except AttributeError:
-                    # self.conn is None, idle loop until shutdown of thread
-                    self._receiver_lock.release()
-                    continue
-                msg = time.time(), json.loads(raw)
-                log.debug("receiver Thread: Data Received: %s", msg)
-                self.receiver_q.put(msg)
-                self._receiver_lock.release()
-            else:
-                # The receiver_lock was locked, idling until available
-                time.sleep(0.5)
+            try:
+                # Blocks until a message arrives, or the connection times out
+                raw = self.conn.recv()
+            except WebSocketTimeoutException:
+                continue
+            except WebSocketConnectionClosedException:
+                # this needs to restart the client, while keeping track
+                # of the currently subscribed channels!
+                self.conn = None
+                self._controller_q.put('restart')
+                break
+            except AttributeError:
+                # self.conn is None, the client is being shut down
+                break
+            msg = time.time(), json_loads(raw)
+            log.debug("receiver Thread: Data Received: %s", msg)
+            self.receiver_q.put(msg)
 
     def process(self):
         """
@@ -312,56 +493,96 @@ class BitfinexWSS(WSSAPI):
         """
 
         while self.running:
-            if self._processor_lock.acquire(blocking=False):
-
-                if self.ping_timer:
-                    try:
-                        self._check_ping()
-                    except TimeoutError:
-                        log.exception("BitfinexWSS.ping(): TimedOut! (%ss)" %
-                                      self.ping_timer)
-                    except (WebSocketConnectionClosedException,
-                            ConnectionResetError):
-                        log.exception("BitfinexWSS.ping(): Connection Error!")
-                        self.conn = None
-                if not self.conn:
-                    # The connection was killed - initiate restart
+            if self.ping_timer:
+                try:
+                    self._check_ping()
+                except TimeoutError:
+                    log.error("BitfinexWSS.ping(): TimedOut! (%ss) - "
+                              "initiating restart", self.timeout)
+                    # Pings aren't sent while one is outstanding; a new
+                    # connection pings again
+                    self.ping_timer = None
                     self._controller_q.put('restart')
+                except (WebSocketConnectionClosedException,
+                        ConnectionResetError):
+                    log.exception("BitfinexWSS.ping(): Connection Error!")
+                    self.conn = None
+            if not self.conn:
+                # The connection was killed - initiate restart
+                self._controller_q.put('restart')
+
+            timeout = self.housekeeping_interval
+            deadline = self._next_deadline()
+            if deadline is not None:
+                timeout = max(0, min(timeout, deadline - time.time()))
+            try:
+                # Blocks until the receiver hands over a message; wakes up
+                # when a heartbeat check or ping is due only
+                item = self.receiver_q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is None:
+                # Idle, or woken up by stop()
+                ts = time.time()
+            else:
+                ts, data = item
+                self._process_message(ts, data)
 
-                skip_processing = False
+            self._check_heartbeats(ts)
 
-                try:
-                    ts, data = self.receiver_q.get(timeout=0.1)
-                except queue.Empty:
-                    skip_processing = True
-                    ts = time.time()
-                    data = None
-
-                if not skip_processing:
-                    log.debug("Processing Data: %s", data)
-                    if isinstance(data, list):
-                        self.handle_data(ts, data)
-                    else:  # Not a list, hence it could be a response
-                        try:
-                            self.handle_response(ts, data)
-                        except UnknownEventError:
-
-                            # We don't know what event this is- Raise an
-                            # error & log data!
-                            log.exception("main() - UnknownEventError: %s",
-                                          data)
-                            log.info("main() - Shutting Down due to "
-                                     "Unknown Error!")
-                            self._controller_q.put('stop')
-                        except ConnectionResetError:
-                            log.info("processor Thread: Connection Was reset, "
-                                     "initiating restart")
-                            self._controller_q.put('restart')
-
-                self._check_heartbeats(ts)
-                self._processor_lock.release()
-            else:
-                time.sleep(0.5)
+    def _process_message(self, ts, data):
+        """
+        Passes a decoded message to the data or response handlers.
+        :param ts: timestamp, declares when data was received by the client
+        :param data: list or dict, as received via wss
+        :return:
+        """
+        log.debug("Processing Data: %s", data)
+        if isinstance(data, list):
+            self.handle_data(ts, data)
+        else:  # Not a list, hence it could be a response
+            try:
+                self.handle_response(ts, data)
+            except UnknownEventError:
+
+                # We don't know what event this is- Raise an
+                # error & log data!
+                log.exception("main() - UnknownEventError: %s", data)
+                log.info("main() - Shutting Down due to Unknown Error!")
+                self._controller_q.put('stop')
+            except ConnectionResetError:
+                log.info("processor Thread: Connection Was reset, "
+                         "initiating restart")
+                self._controller_q.put('restart')
+
+    ##
+    # Protocol hooks, used by bitex.api.WSS.aio.AsyncWSSRuntime
+    ##
+
+    def _connections(self):
+        return [(None, self.addr)]
+
+    def _on_open(self, key, conn):
+        # Channel ids, flags and sequences are per connection
+        self.conn = conn
+        self.wss_config = {}
+        self._sequences = {}
+        self.ping_timer = None
+        self._reset_pause()
+        self._clear_channels()
+        self.setup_subscriptions()
+
+    def _on_message(self, key, raw, ts):
+        self._process_message(ts, json_loads(raw))
+        self._check_heartbeats(ts)
+
+    def _on_tick(self, ts):
+        if self.ping_timer and ts - self.ping_timer > self.timeout:
+            log.error("BitfinexWSS._on_tick(): Ping timed out! (%ss)",
+                      self.timeout)
+            return False
+        self._check_heartbeats(ts)
 
     ##
     # Response Message Handlers
@@ -411,7 +632,8 @@ class BitfinexWSS(WSSAPI):
         if chanId in self.channels:
             raise AlreadyRegisteredError()
 
-        self._heartbeats[chanId] = time.time()
+        self._heartbeats[chanId] = now = time.time()
+        self._schedule(chanId, now + self.heartbeat_timeout)
 
         try:
             channel_key = ('raw_'+channel
@@ -455,6 +677,15 @@ class BitfinexWSS(WSSAPI):
         except KeyError:
             raise NotRegisteredError()
 
+        self.channel_labels.pop(chanId, None)
+        self._checksums.pop(chanId, None)
+        try:
+            channel_name, kwargs = self._resubscribing.pop(chanId)
+        except KeyError:
+            pass
+        else:
+            self._subscribe(channel_name, **kwargs)
+
         try:
             self._heartbeats.pop(chanId)
         except KeyError:
@@ -517,8 +748,22 @@ class BitfinexWSS(WSSAPI):
                  ts - self.ping_timer)
         self.ping_timer = None
 
-    def _handle_conf(self, ts, *args, **kwargs):
-        pass
+    def _handle_conf(self, ts, *args, flags=0, status=None, **kwargs):
+        """
+        Handles responses to config() commands - stores the confirmed flags
+        in self.wss_config.
+        :param ts: timestamp, declares when data was received by the client
+        :param flags: int, flags as confirmed by the server
+        :param status: str, 'OK' if the config was applied
+        :return:
+        """
+        if status != 'OK':
+            log.error("_handle_conf(): Config was not applied! %s - %s", status,
+                      kwargs)
+            return
+        self.wss_config['flags'] = flags
+        # The sequence starts over when sequencing is (re-)enabled
+        self._sequences = {}
 
     ##
     # Data Message Handlers
@@ -538,15 +783,66 @@ class BitfinexWSS(WSSAPI):
             # Too many or too few values
             raise FaultyPayloadError("handle_data(): %s - %s" % (msg, e))
         self._heartbeats[chan_id] = ts
+        if chan_id in self._late_heartbeats:
+            self._handle_late_channel_message(ts, chan_id)
+        if self.wss_config.get('flags', 0) & 65536:
+            if chan_id == 0:
+                # Auth messages carry the public and the auth sequence
+                *data, seq, auth_seq = data
+                if not self._check_sequence('auth', auth_seq):
+                    return
+            else:
+                *data, seq = data
+            if not self._check_sequence('public', seq):
+                return
         if data[0] == 'hb':
             self._handle_hearbeat(ts, chan_id)
             return
+        if data[0] == 'cs':
+            self._handle_checksum(ts, chan_id, data[1])
+            return
         try:
             self.channels[chan_id](ts, chan_id, data)
         except KeyError:
             raise NotRegisteredError("handle_data: %s not registered - "
                                      "Payload: %s" % (chan_id, msg))
 
+    def _check_sequence(self, key, seq):
+        """
+        Checks a sequence number against the last one received; counts gaps
+        and duplicates, and resubscribes to the book channels on a gap of the
+        public sequence.
+        :param key: 'public' or 'auth'
+        :param seq: int, sequence number
+        :return: False if the message is a duplicate, True otherwise
+        """
+        last = self._sequences.get(key)
+        prefix = '' if key == 'public' else 'auth_'
+        if last is not None:
+            if seq <= last:
+                self._sequence_stats[prefix + 'duplicates'] += 1
+                return False
+            if seq != last + 1:
+                log.warning("BitfinexWSS: %s sequence gap (%s -> %s)!", key,
+                            last, seq)
+                self._sequence_stats[prefix + 'gaps'] += 1
+                if key == 'public':
+                    for chan_id, (channel_key, _) in list(
+                            self.channel_labels.items()):
+                        if channel_key in ('book', 'raw_book'):
+                            self.resubscribe(chan_id)
+        self._sequences[key] = seq
+        return True
+
+    def sequence_stats(self):
+        """
+        Returns the number of gaps and duplicates of the public and auth
+        sequences, and the last sequence numbers received.
+        :return: dict
+        """
+        return dict(self._sequence_stats, last=self._sequences.get('public'),
+                    auth_last=self._sequences.get('auth'))
+
     @staticmethod
     def _handle_hearbeat(*args, **kwargs):
         """
@@ -568,31 +864,139 @@ class BitfinexWSS(WSSAPI):
         """
         pair = self.channel_labels[chan_id][1]['pair']
         entry = (*data, ts)
-        self.data_q.put(('ticker', pair, entry))
+        self.publish('ticker', pair, entry)
 
     def _handle_book(self, ts, chan_id, data):
         """
-        Updates the order book stored in self.books[chan_id]
+        Updates the order book stored in self.books[pair]
         :param ts: timestamp, declares when data was received by the client
         :param chan_id: int, channel id
         :param data: dict, tuple or list of data received via wss
         :return:
         """
         pair = self.channel_labels[chan_id][1]['pair']
+        try:
+            book = self.books[pair]
+        except KeyError:
+            book = self.books[pair] = L2Book(pair)
+
+        levels = data[0]
+        if levels and isinstance(levels[0], list):
+            # Snapshot
+            book.clear()
+            for level in levels:
+                self._update_book(book, ts, *level)
+        else:
+            self._update_book(book, ts, *levels)
+
         entry = data, ts
-        self.data_q.put(('order_book', pair, entry))
+        self.publish('order_book', pair, entry)
+
+    @staticmethod
+    def _update_book(book, ts, price, count, amount):
+        """
+        Applies a single level of a book snapshot or update to book. Levels
+        with a count of 0 are removed; their amount is 1 for bids, -1 for
+        asks.
+        :param book: L2Book obj
+        :param ts: timestamp, declares when data was received by the client
+        :return:
+        """
+        side = 'bids' if float(amount) > 0 else 'asks'
+        if int(count) == 0:
+            book.remove(side, price, ts=ts)
+        else:
+            book.set(side, price, absolute(amount), count, ts=ts)
 
     def _handle_raw_book(self, ts, chan_id, data):
         """
-        Updates the raw order books stored in self.raw_books[chan_id]
+        Updates the raw order books stored in self.raw_books[pair]
         :param ts: timestamp, declares when data was received by the client
         :param chan_id: int, channel id
         :param data: dict, tuple or list of data received via wss
         :return:
         """
         pair = self.channel_labels[chan_id][1]['pair']
+        try:
+            book = self.raw_books[pair]
+        except KeyError:
+            book = self.raw_books[pair] = L3Book(pair)
+
+        orders = data[0]
+        if orders and isinstance(orders[0], list):
+            # Snapshot
+            book.clear()
+            for order in orders:
+                self._update_raw_book(book, ts, *order)
+        else:
+            self._update_raw_book(book, ts, *orders)
+
         entry = data, ts
-        self.data_q.put(('raw_order_book', pair, entry))
+        self.publish('raw_order_book', pair, entry)
+
+    @staticmethod
+    def _update_raw_book(book, ts, order_id, price, amount):
+        """
+        Applies a single order of a raw book snapshot or update to book.
+        Orders with a price of 0 are removed.
+        :param book: L3Book obj
+        :param ts: timestamp, declares when data was received by the client
+        :return:
+        """
+        if float(price) == 0:
+            book.remove_order(order_id, ts=ts)
+        else:
+            side = 'bids' if float(amount) > 0 else 'asks'
+            book.add(order_id, side, price, absolute(amount), ts=ts)
+
+    def _handle_checksum(self, ts, chan_id, checksum):
+        """
+        Verifies the checksum sent for a book channel against the local book,
+        and resubscribes to the channel on a mismatch.
+        :param ts: timestamp, declares when data was received by the client
+        :param chan_id: int, channel id
+        :param checksum: int, signed CRC32 as sent by the server
+        :return:
+        """
+        channel_key, kwargs = self.channel_labels[chan_id]
+        pair = kwargs['pair']
+        try:
+            calc = self._checksums[chan_id]
+        except KeyError:
+            calc = self._checksums[chan_id] = _BookChecksum()
+
+        if channel_key == 'raw_book':
+            book = self.raw_books.get(pair)
+            levels = {side: ([] if book is None else
+                             [(order_id, size) for order_id, _, size
+                              in book.top_orders(side, calc.depth)])
+                      for side in ('bids', 'asks')}
+        else:
+            book = self.books.get(pair)
+            levels = {'bids': [], 'asks': []} if book is None else \
+                book.depth(calc.depth)
+        asks = [(key, _negate(size)) for key, size in levels['asks']]
+
+        try:
+            stats = self._checksum_stats[(channel_key, pair)]
+        except KeyError:
+            stats = self._checksum_stats[(channel_key, pair)] = {
+                'verified': 0, 'mismatches': 0}
+        if calc.compute(levels['bids'], asks) == checksum:
+            stats['verified'] += 1
+            return
+
+        stats['mismatches'] += 1
+        log.warning("BitfinexWSS: Checksum mismatch on %s %s - "
+                    "resubscribing..", channel_key, pair)
+        self.resubscribe(chan_id)
+
+    def checksum_stats(self):
+        """
+        Returns the number of verified and mismatching checksums per book.
+        :return: dict of (channel, pair): dict
+        """
+        return {key: dict(stats) for key, stats in self._checksum_stats.items()}
 
     def _handle_trades(self, ts, chan_id, data):
         """
@@ -604,7 +1008,7 @@ class BitfinexWSS(WSSAPI):
         """
         pair = self.channel_labels[chan_id][1]['pair']
         entry = data, ts
-        self.data_q.put(('trades', pair, entry))
+        self.publish('trades', pair, entry)
 
     def _handle_candles(self, ts, chan_id, data):
         """
@@ -616,7 +1020,7 @@ class BitfinexWSS(WSSAPI):
         """
         pair = self.channel_labels[chan_id][1]['key'].split(':')[-1][1:]
         entry = data, ts
-        self.data_q.put(('ohlc', pair, entry))
+        self.publish('ohlc', pair, entry)
 
     def _handle_auth(self, ts, chan_id, data):
         keys = {'hts': self._handle_auth_trades,
@@ -663,66 +1067,90 @@ class BitfinexWSS(WSSAPI):
 
     def _handle_auth_trades(self, ts, data):
         entry = data, ts
-        self.data_q.put(('account_trades', 'NA', entry))
+        self.publish('account_trades', 'NA', entry)
 
     def _handle_auth_positions(self, ts, data):
         entry = data, ts
-        self.data_q.put(('account_positions', 'NA', entry))
+        self.publish('account_positions', 'NA', entry)
 
     def _handle_auth_orders(self, ts, data):
         entry = data, ts
-        self.data_q.put(('account_orders', 'NA', entry))
+        self.publish('account_orders', 'NA', entry)
 
     def _handle_auth_wallet(self, ts, data):
         entry = data, ts
-        self.data_q.put(('account_wallet', 'NA', entry))
+        self.publish('account_wallet', 'NA', entry)
 
     def _handle_auth_balance(self, ts, data):
         entry = data, ts
-        self.data_q.put(('account_balance', 'NA', entry))
+        self.publish('account_balance', 'NA', entry)
 
     def _handle_auth_margin_info(self, ts, data):
         entry = data, ts
-        self.data_q.put(('account_margin_info', 'NA', entry))
+        self.publish('account_margin_info', 'NA', entry)
 
     def _handle_auth_funding_info(self, ts, data):
         entry = data, ts
-        self.data_q.put(('account_funding_info', 'NA', entry))
+        self.publish('account_funding_info', 'NA', entry)
 
     def _handle_auth_offers(self, ts, data):
         entry = data, ts
-        self.data_q.put(('account_offers', 'NA', entry))
+        self.publish('account_offers', 'NA', entry)
 
     def _handle_auth_credits(self, ts, data):
         entry = data, ts
-        self.data_q.put(('account_credits', 'NA', entry))
+        self.publish('account_credits', 'NA', entry)
 
     def _handle_auth_loans(self, event, data):
         entry = data, time.time()
-        self.data_q.put(('account_loans', 'NA', entry))
+        self.publish('account_loans', 'NA', entry)
 
     def _handle_auth_funding_trades(self, event, data):
         entry = data, time.time()
-        self.data_q.put(('account_funding_trades', 'NA', entry))
+        self.publish('account_funding_trades', 'NA', entry)
 
     ##
     # Commands
     ##
 
     def send(self, payload):
-        self.conn.send(json.dumps(payload))
+        payload = json_dumps(payload)
+        with self._send_lock:
+            if not self._unpaused.is_set():
+                # Paused - sent by unpause()
+                self._paused_payloads.append(payload)
+                return
+            self.conn.send(payload)
 
     def ping(self):
         """
         Pings Websocket server to check if it's still alive.
-        Required for connection tests
+        Required for connection tests; not sent while paused, as it would be
+        held back and time out.
         :return:
         """
+        if not self._unpaused.is_set():
+            return
         self.ping_timer = time.time()
         self.send({'event': 'ping'})
 
+    def resubscribe(self, chan_id):
+        """
+        Unsubscribes from the given channel, and subscribes to it again once
+        the server confirmed it; other channels remain untouched.
+        :param chan_id: int, channel id
+        :return:
+        """
+        if chan_id in self._resubscribing:
+            return
+        channel_key, kwargs = self.channel_labels[chan_id]
+        # Raw books are subscribed to via the book channel
+        channel_name = 'book' if channel_key == 'raw_book' else channel_key
+        self._resubscribing[chan_id] = channel_name, kwargs
+        self.send({'event': 'unsubscribe', 'chanId': chan_id})
+
     def setup_subscriptions(self):
-        self.config(decimals_as_strings=True)
+        self.config(**self._config_kwargs)
         for pair in self.pairs:
             self.ticker(pair)
             self.ohlc(pair)
@@ -731,15 +1159,20 @@ class BitfinexWSS(WSSAPI):
             self.trades(pair)
 
     def config(self, decimals_as_strings=True, ts_as_dates=False,
-               sequencing=False, **kwargs):
+               sequencing=False, checksum=False, **kwargs):
         """
         Send configuration to websocket server
         :param decimals_as_strings: bool, turn on/off decimals as strings
         :param ts_as_dates: bool, decide to request timestamps as dates instead
         :param sequencing: bool, turn on sequencing
+        :param checksum: bool, turn on book checksums
         :param kwargs:
         :return:
         """
+        # Sent again upon reconnects
+        self._config_kwargs = dict(kwargs, ts_as_dates=ts_as_dates,
+                                   decimals_as_strings=decimals_as_strings,
+                                   sequencing=sequencing, checksum=checksum)
         flags = 0
         if decimals_as_strings:
             flags += 8
@@ -747,6 +1180,8 @@ class BitfinexWSS(WSSAPI):
             flags += 32
         if sequencing:
             flags += 65536
+        if checksum:
+            flags += 131072
         payload = {'event': 'conf', 'flags': flags}
         payload.update(kwargs)
         self.send(payload)
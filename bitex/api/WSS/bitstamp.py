@@ -1,11 +1,17 @@
 # Import Built-Ins
 import logging
+import queue
+import threading
+import time
+from functools import partial
 
 # Import Third-Party
 import pusherclient
 
 # Import Homebrew
 from .base import WSSAPI
+from .orderbook import L2Book, L3Book
+from ...codec import loads as json_loads
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -21,6 +27,19 @@ class BitstampWSS(WSSAPI):
 
     If you need to have per-channel customization, you will have to overwrite
     the _register_*_channel() methods accordingly.
+
+    Order books are maintained per pair from the diff_order_book channels, in
+    self.books[pair] (L2Book), and from the live_orders channels, in
+    self.live_books[pair] (L3Book). Each is built on a REST snapshot, fetched
+    in a separate thread when the first message of a pair arrives; messages
+    received meanwhile are buffered and replayed on top of it. Diffs are
+    applied in microtimestamp order - diffs already contained in the
+    snapshot, or older than the last applied diff, are skipped. See bbo() and
+    book_stats().
+
+    Diffs carry no sequence numbers, so those missed while disconnected go
+    unnoticed; the books are discarded and rebuilt on a new snapshot after
+    every (re)connect instead.
     """
     def __init__(self, key=None, exclude=None, include_only=None, **kwargs):
         """
@@ -64,6 +83,20 @@ class BitstampWSS(WSSAPI):
                 raise ValueError("'exclude: must be a list of strings of"
                                  "valid channel name! %s" % self.channels)
 
+        self.books = {}  # Dict of pair: L2Book, from diff_order_book
+        self.live_books = {}  # Dict of pair: L3Book, from live_orders
+        # (channel, pair): microtimestamp of the last applied diff or snapshot
+        self._last = {}
+        self._buffers = {}  # (channel, pair): messages awaiting a snapshot
+        # Incremented by _reset_books(); snapshots requested before are
+        # discarded
+        self._epoch = 0
+        self._stats = {}
+        self._book_lock = threading.Lock()
+        self._snapshot_q = queue.Queue()
+        self._snapshot_thread = None
+        self._rest = None
+
     def start(self):
         """
         Extension of Pusher.connect() method, which registers all callbacks with
@@ -94,7 +127,7 @@ class BitstampWSS(WSSAPI):
         :param data:
         :return:
         """
-        self.data_q.put(('live_trades', pair, data))
+        self.publish('live_trades', pair, data)
 
     def btcusd_lt_callback(self, data):
         self.live_trades_callback('BTCUSD', data)
@@ -125,7 +158,7 @@ class BitstampWSS(WSSAPI):
         :param data:
         :return:
         """
-        self.data_q.put(('order_book', pair, data))
+        self.publish('order_book', pair, data)
 
     def btcusd_ob_callback(self, data):
         self.order_book_callback('BTCUSD', data)
@@ -157,7 +190,8 @@ class BitstampWSS(WSSAPI):
         :param data:
         :return:
         """
-        self.data_q.put(('diff_order_book', pair, data))
+        self._handle_book_message('diff_order_book', pair, data)
+        self.publish('diff_order_book', pair, data)
 
     def btcusd_dob_callback(self, data):
         self.diff_order_book_callback('BTCUSD', data)
@@ -189,7 +223,7 @@ class BitstampWSS(WSSAPI):
         :param data:
         :return:
         """
-        self.data_q.put(('live_orders', pair, data))
+        self.publish('live_orders', pair, data)
 
     def btcusd_lo_callback(self, data):
         self.live_orders_callback('BTCUSD', data)
@@ -209,6 +243,20 @@ class BitstampWSS(WSSAPI):
     def xrpbtc_lo_callback(self, data):
         self.live_orders_callback('XRPBTC', data)
 
+    def _on_live_order(self, pair, callback, event, data):
+        """
+        Applies a live_orders event to the pair's L3Book, then passes its
+        payload on to the pair's live_orders callback. pusher passes only the
+        payload, so the event's name is bound when registering the channels.
+        :param pair: str, e.g. 'BTCUSD'
+        :param callback: the pair's *_lo_callback()
+        :param event: 'order_created', 'order_changed' or 'order_deleted'
+        :param data: str, as received via pusher
+        :return:
+        """
+        self._handle_book_message('live_orders', pair, data, event)
+        callback(data)
+
     """
     Register Methods
     """
@@ -219,6 +267,7 @@ class BitstampWSS(WSSAPI):
         Responsible for binding callbacks to channels before we connect.
         :return:
         """
+        self._reset_books()
         self._register_diff_order_book_channels()
         self._register_live_orders_channels()
         self._register_live_trades_channels()
@@ -287,12 +336,216 @@ class BitstampWSS(WSSAPI):
         self._bind_channels(event, channels)
 
     def _register_live_orders_channels(self):
-        channels = {'live_orders': self.btcusd_lo_callback,
-                    'live_orders_btceur': self.btceur_lo_callback,
-                    'live_orders_eurusd': self.eurusd_lo_callback,
-                    'live_orders_xrpusd': self.xrpusd_lo_callback,
-                    'live_orders_xrpeur': self.xrpeur_lo_callback,
-                    'live_orders_xrpbtc': self.xrpbtc_lo_callback}
+        """
+        Registers the binding for the live_orders channels; events are
+        dispatched via _on_live_order().
+        :return:
+        """
+        channels = {'live_orders': ('BTCUSD', self.btcusd_lo_callback),
+                    'live_orders_btceur': ('BTCEUR', self.btceur_lo_callback),
+                    'live_orders_eurusd': ('EURUSD', self.eurusd_lo_callback),
+                    'live_orders_xrpusd': ('XRPUSD', self.xrpusd_lo_callback),
+                    'live_orders_xrpeur': ('XRPEUR', self.xrpeur_lo_callback),
+                    'live_orders_xrpbtc': ('XRPBTC', self.xrpbtc_lo_callback)}
 
         events = ['order_created', 'order_changed', 'order_deleted']
-        self._bind_channels(events, channels)
+        for channel_name, (pair, callback) in channels.items():
+            if channel_name in self.channels:
+                channel = self.pusher.subscribe(channel_name)
+                for event in events:
+                    channel.bind(event, partial(self._on_live_order, pair,
+                                                callback, event))
+
+    """
+    Order Books
+    """
+
+    def bbo(self, pair, live=False):
+        """
+        Returns the best bid and ask of pair, without querying the REST API.
+        :param pair: str, e.g. 'BTCUSD'
+        :param live: bool, read from the live_orders book instead of the
+                     diff_order_book book
+        :return: tuple of (price, size) tuples, or (None, None) if the book
+                 isn't built yet
+        """
+        book = (self.live_books if live else self.books).get(pair)
+        if book is None:
+            return None, None
+        return book.bbo()
+
+    def book_stats(self):
+        """
+        Returns the snapshots and skipped (stale) messages of each book, and
+        whether it is currently in sync.
+        :return: dict of (channel, pair): dict
+        """
+        with self._book_lock:
+            return {key: dict(stats, synced=key in self._last)
+                    for key, stats in self._stats.items()}
+
+    def _count(self, key, name):
+        try:
+            stats = self._stats[key]
+        except KeyError:
+            stats = self._stats[key] = {'snapshots': 0, 'stale': 0}
+        stats[name] += 1
+
+    def _handle_book_message(self, channel, pair, data, event=None):
+        """
+        Applies a diff_order_book or live_orders message to the pair's book;
+        if the book isn't built yet, the message is buffered and a snapshot is
+        requested.
+        :param channel: 'diff_order_book' or 'live_orders'
+        :param pair: str, e.g. 'BTCUSD'
+        :param data: str or dict, as received via pusher
+        :param event: name of the live_orders event
+        :return:
+        """
+        if isinstance(data, str):
+            data = json_loads(data)
+        key = channel, pair
+        msg = int(data['microtimestamp']), event, data
+        with self._book_lock:
+            if key not in self._last:
+                try:
+                    self._buffers[key].append(msg)
+                except KeyError:
+                    self._buffers[key] = [msg]
+                    self._request_snapshot(key)
+                return
+
+            if channel == 'live_orders':
+                self._apply_order(self.live_books[pair], event, data)
+            elif msg[0] <= self._last[key]:
+                self._count(key, 'stale')
+            else:
+                self._apply_diff(self.books[pair], data)
+                self._last[key] = msg[0]
+
+    def _reset_books(self):
+        """
+        Discards all books, and any messages buffered for them; each is
+        rebuilt on a new snapshot once its next message arrives.
+        :return:
+        """
+        with self._book_lock:
+            self._epoch += 1
+            self.books.clear()
+            self.live_books.clear()
+            self._last.clear()
+            self._buffers.clear()
+
+    def _request_snapshot(self, key):
+        if self._snapshot_thread is None or not self._snapshot_thread.is_alive():
+            self._snapshot_thread = threading.Thread(
+                target=self._build_books, daemon=True,
+                name='Bitstamp Snapshot Thread')
+            self._snapshot_thread.start()
+        self._snapshot_q.put((key, self._epoch))
+
+    def _build_books(self):
+        """
+        Builds the books put on self._snapshot_q from a REST snapshot, and
+        replays the messages buffered since. Runs in a dedicated thread; the
+        snapshot is loaded without holding the book lock.
+        :return:
+        """
+        while True:
+            key, epoch = self._snapshot_q.get()
+            channel, pair = key
+            if epoch != self._epoch:
+                # Requested before a reconnect
+                continue
+            try:
+                # Per-order snapshots (group=2) for live_orders
+                snapshot = self._fetch_snapshot(
+                    pair, group=2 if channel == 'live_orders' else 1)
+                # Error replies lack these keys
+                last = int(snapshot['microtimestamp'])
+                if channel == 'live_orders':
+                    book = L3Book(pair)
+                    for side in ('bids', 'asks'):
+                        for price, size, order_id in snapshot[side]:
+                            book.add(int(order_id), side, price, size)
+                else:
+                    book = L2Book(pair)
+                    self._apply_diff(book, snapshot)
+            except Exception:
+                log.exception("BitstampWSS: Fetching snapshot of %s failed - "
+                              "retrying..", pair)
+                time.sleep(1)
+                self._snapshot_q.put((key, epoch))
+                continue
+
+            with self._book_lock:
+                if epoch != self._epoch:
+                    continue
+                self._count(key, 'snapshots')
+                buffered = self._buffers.pop(key, ())
+                if channel == 'live_orders':
+                    # Replayed in order of arrival - an order's
+                    # microtimestamp doesn't order its events
+                    for _, event, data in buffered:
+                        self._apply_order(book, event, data)
+                    self.live_books[pair] = book
+                else:
+                    for mts, _, data in sorted(buffered, key=lambda m: m[0]):
+                        if mts <= last:
+                            self._count(key, 'stale')
+                            continue
+                        self._apply_diff(book, data)
+                        last = mts
+                    self.books[pair] = book
+                self._last[key] = last
+                log.info("BitstampWSS: %s book of %s synced at %s", channel,
+                         pair, last)
+
+    def _fetch_snapshot(self, pair, group=1):
+        """
+        Queries an order book snapshot via the Bitstamp REST interface.
+        :param pair: str, e.g. 'BTCUSD'
+        :param group: 1 for price levels, 2 for individual orders
+        :return: dict of 'microtimestamp', 'bids' and 'asks'
+        """
+        if self._rest is None:
+            from ...interfaces.bitstamp import Bitstamp
+            self._rest = Bitstamp()
+        return self._rest.order_book(pair.lower(), group=group).json()
+
+    @staticmethod
+    def _apply_diff(book, data):
+        """
+        Applies the levels of a snapshot or diff to book; levels with an
+        amount of 0 are removed.
+        :param book: L2Book obj
+        :param data: dict of 'bids' and 'asks'
+        :return:
+        """
+        ts = int(data['microtimestamp']) / 1e6
+        for side in ('bids', 'asks'):
+            for price, amount in data[side]:
+                if float(amount) == 0:
+                    book.remove(side, price, ts=ts)
+                else:
+                    book.set(side, price, amount, ts=ts)
+
+    @staticmethod
+    def _apply_order(book, event, data):
+        """
+        Applies a live_orders event to book.
+        :param book: L3Book obj
+        :param event: 'order_created', 'order_changed' or 'order_deleted'
+        :param data: dict, as received via pusher
+        :return:
+        """
+        ts = int(data['microtimestamp']) / 1e6
+        # Sizes are summed exactly per level - use the decimal strings, as
+        # found in REST snapshots
+        amount = str(data.get('amount_str', data['amount']))
+        if event == 'order_deleted' or float(amount) == 0:
+            book.remove_order(data['id'], ts=ts)
+        else:
+            side = 'bids' if int(data['order_type']) == 0 else 'asks'
+            book.add(data['id'], side, str(data.get('price_str', data['price'])),
+                     amount, ts=ts)
@@ -1,20 +1,34 @@
 # Import Built-Ins
 import logging
-import json
+import queue
 import threading
 import time
+from decimal import Decimal
 
 # Import Third-Party
 from websocket import create_connection, WebSocketTimeoutException
 import requests
 # Import Homebrew
 from .base import WSSAPI
+from .orderbook import L3Book
+from ...codec import loads as json_loads, dumps as json_dumps
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
 
 
 class GDAXWSS(WSSAPI):
+    """
+    Streams the full channel of all GDAX products, and maintains a per-order
+    book of each product in self.books[product], built from a REST level 3
+    snapshot and the messages following it.
+
+    Messages are applied in `sequence` order. If a gap is detected, the
+    product's book is resynced from a new snapshot in a separate thread;
+    messages of the product are buffered in the meantime, while all other
+    products are processed as usual. Gaps, duplicates and resyncs are counted
+    per product, see book_stats().
+    """
     def __init__(self):
         super(GDAXWSS, self).__init__('wss://ws-feed.gdax.com', 'GDAX')
         self.conn = None
@@ -22,6 +36,15 @@ class GDAXWSS(WSSAPI):
         self.pairs = [x['id'] for x in r]
         self._data_thread = None
 
+        self.books = {}  # Dict of product: L3Book
+        self._sequences = {}  # product: last applied sequence, None if stale
+        self._buffers = {}  # product: messages received while resyncing
+        self._stats = {}
+        self._book_lock = threading.Lock()
+        self._resync_q = queue.Queue()
+        self._resync_thread = None
+        self._rest = None
+
     def start(self):
         super(GDAXWSS, self).start()
 
@@ -36,15 +59,180 @@ class GDAXWSS(WSSAPI):
 
     def _process_data(self):
         self.conn = create_connection(self.addr, timeout=4)
-        payload = json.dumps({'type': 'subscribe', 'product_ids': self.pairs})
-        self.conn.send(payload)
+        self._on_open(None, self.conn)
         while self.running:
             try:
-                data = json.loads(self.conn.recv())
+                raw = self.conn.recv()
             except (WebSocketTimeoutException, ConnectionResetError):
                 self._controller_q.put('restart')
+                continue
+            self._on_message(None, raw, time.time())
+        self.conn = None
+
+    def _connections(self):
+        return [(None, self.addr)]
+
+    def _on_open(self, key, conn):
+        conn.send(json_dumps({'type': 'subscribe', 'product_ids': self.pairs}))
+
+    def _on_message(self, key, raw, ts):
+        data = json_loads(raw)
+        if 'product_id' in data:
+            if 'sequence' in data:
+                self._handle_book_message(data)
+            self.publish('order_book', data['product_id'], data, ts)
+
+    ##
+    # Order Books
+    ##
+
+    def book_stats(self):
+        """
+        Returns the sequence gaps, duplicates and resyncs of each product's
+        book, and whether it is currently in sync.
+        :return: dict of product: dict
+        """
+        with self._book_lock:
+            return {product: dict(stats, synced=self._sequences.get(product)
+                                  is not None)
+                    for product, stats in self._stats.items()}
+
+    def _count(self, product, key):
+        try:
+            stats = self._stats[product]
+        except KeyError:
+            stats = self._stats[product] = {'gaps': 0, 'duplicates': 0,
+                                            'resyncs': 0}
+        stats[key] += 1
 
-            if 'product_id' in data:
-                self.data_q.put(('order_book', data['product_id'],
-                                 data, time.time()))
-        self.conn = None
\ No newline at end of file
+    def _handle_book_message(self, msg):
+        """
+        Applies a full channel message to its product's book, if it is next in
+        sequence; otherwise the message is buffered, and a resync of the book
+        is requested.
+        :param msg: dict, as received via wss
+        :return:
+        """
+        product, sequence = msg['product_id'], msg['sequence']
+        with self._book_lock:
+            last = self._sequences.get(product)
+            if last is not None:
+                if sequence <= last:
+                    self._count(product, 'duplicates')
+                    return
+                if sequence == last + 1:
+                    self._apply(self.books[product], msg)
+                    self._sequences[product] = sequence
+                    return
+                log.warning("GDAXWSS: Sequence gap for %s (%s -> %s) - "
+                            "resyncing book..", product, last, sequence)
+                self._count(product, 'gaps')
+                self._sequences[product] = None
+
+            # Book is stale or wasn't built yet
+            try:
+                self._buffers[product].append(msg)
+            except KeyError:
+                self._buffers[product] = [msg]
+                self._request_resync(product)
+
+    def _request_resync(self, product):
+        self._count(product, 'resyncs')
+        if self._resync_thread is None or not self._resync_thread.is_alive():
+            self._resync_thread = threading.Thread(target=self._resync,
+                                                   daemon=True,
+                                                   name='GDAX Resync Thread')
+            self._resync_thread.start()
+        self._resync_q.put(product)
+
+    def _resync(self):
+        """
+        Rebuilds the books of products put on self._resync_q from a level 3
+        snapshot, and replays the messages buffered since. Runs in a dedicated
+        thread; the snapshot is loaded without holding the book lock, so other
+        products are processed meanwhile.
+        :return:
+        """
+        while True:
+            product = self._resync_q.get()
+            try:
+                snapshot = self._fetch_snapshot(product)
+                # Error replies, i.e. when rate limited, lack these keys
+                book = L3Book(product)
+                for side in ('bids', 'asks'):
+                    for price, size, order_id in snapshot[side]:
+                        book.add(order_id, side, price, size)
+                sequence = int(snapshot['sequence'])
+            except Exception:
+                log.exception("GDAXWSS: Fetching snapshot of %s failed - "
+                              "retrying..", product)
+                time.sleep(1)
+                self._resync_q.put(product)
+                continue
+
+            with self._book_lock:
+                last = sequence
+                buffered = sorted(self._buffers.pop(product, ()),
+                                  key=lambda m: m['sequence'])
+                for i, msg in enumerate(buffered):
+                    if msg['sequence'] <= last:
+                        continue
+                    if msg['sequence'] != last + 1:
+                        # Snapshot is older than the buffer - try again
+                        log.warning("GDAXWSS: Snapshot of %s doesn't connect "
+                                    "to the buffered messages - resyncing "
+                                    "again..", product)
+                        self._buffers[product] = buffered[i:]
+                        self._request_resync(product)
+                        break
+                    self._apply(book, msg)
+                    last = msg['sequence']
+                else:
+                    self.books[product] = book
+                    self._sequences[product] = last
+                    log.info("GDAXWSS: Book of %s synced at sequence %s",
+                             product, last)
+
+    def _fetch_snapshot(self, product):
+        """
+        Queries a level 3 order book snapshot via the GDAX REST interface.
+        :param product: str, product id
+        :return: dict of 'sequence', 'bids' and 'asks'
+        """
+        if self._rest is None:
+            from ...interfaces.gdax import GDAX
+            self._rest = GDAX()
+        return self._rest.order_book(product, level=3).json()
+
+    @staticmethod
+    def _apply(book, msg):
+        """
+        Applies a full channel message to the given book.
+        :param book: L3Book obj
+        :param msg: dict, as received via wss
+        :return:
+        """
+        kind = msg['type']
+        if kind == 'open':
+            side = 'bids' if msg['side'] == 'buy' else 'asks'
+            book.add(msg['order_id'], side, msg['price'],
+                     msg['remaining_size'])
+        elif kind == 'done':
+            book.remove_order(msg['order_id'])
+        elif kind == 'match':
+            order_id = msg['maker_order_id']
+            try:
+                side, price, size = book.orders[order_id]
+            except KeyError:
+                return
+            remaining = Decimal(size) - Decimal(msg['size'])
+            if remaining > 0:
+                book.add(order_id, side, price, str(remaining))
+            else:
+                book.remove_order(order_id)
+        elif kind == 'change':
+            order_id = msg['order_id']
+            if order_id in book.orders and msg.get('new_size') is not None:
+                side, price, _ = book.orders[order_id]
+                book.add(order_id, side, price, msg['new_size'])
+        # 'received' messages don't alter the book until the order is open
@@ -62,17 +62,19 @@ class GeminiWSS(WSSAPI):
                 self._controller_q.put(endpoint)
 
             log.debug("%s, %s", endpoint, msg)
-            ep, pair = endpoint.split('/')
-            log.debug("_subscription_thread(): Putting data on q..")
-            try:
-                self.data_q.put((ep, pair, msg, time.time()), timeout=1)
-            except TimeoutError:
-                continue
-            finally:
-                log.debug("_subscription_thread(): Data Processed, looping back..")
+            self._on_message(endpoint, msg, time.time())
+            log.debug("_subscription_thread(): Data Processed, looping back..")
         conn.close()
         log.debug("_subscription_thread(): Thread Loop Ended.")
 
+    def _connections(self):
+        # Gemini streams each symbol via a separate connection
+        return [(endpoint, self.addr + endpoint) for endpoint in self.endpoints]
+
+    def _on_message(self, endpoint, raw, ts):
+        ep, pair = endpoint.split('/')
+        self.publish(ep, pair, raw, ts)
+
     def start(self):
         super(GeminiWSS, self).start()
 
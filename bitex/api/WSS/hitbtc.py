@@ -2,7 +2,6 @@
 import logging
 from threading import Thread
 from queue import Queue, Empty
-import json
 import time
 import hmac
 import hashlib
@@ -11,12 +10,23 @@ from websocket import create_connection, WebSocketTimeoutException
 
 # Import Homebrew
 from .base import WSSAPI
+from .orderbook import L2Book
+from ...codec import loads as json_loads, dumps as json_dumps
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
 
 
 class HitBTCWSS(WSSAPI):
+    """
+    Streams HitBTC market data, and maintains an L2Book per symbol in
+    self.books, applying incremental refreshes on top of the last full
+    snapshot.
+
+    Incremental refreshes must continue the snapshot's snapshotSeqNo without
+    gaps. On a gap, the symbol's book is marked stale and the data connection
+    is re-established, upon which the server sends fresh snapshots.
+    """
     def __init__(self, key=None, secret=None):
         data_addr = 'ws://api.hitbtc.com:80'
         super(HitBTCWSS, self).__init__(data_addr, 'HitBTC')
@@ -31,6 +41,10 @@ class HitBTCWSS(WSSAPI):
 
         self.trade_command_q = Queue()
 
+        self.books = {}  # Dict of symbol: L2Book
+        self._sequences = {}  # symbol: last applied seqNo, None if stale
+        self._stats = {}
+
     def start(self, duplex=False):
         super(HitBTCWSS, self).start()
 
@@ -64,20 +78,102 @@ class HitBTCWSS(WSSAPI):
             self._controller_q.put('restart_data')
             return
 
-        while self.running:
-            try:
-                data = conn.recv()
-                data = json.loads(data)
-            except WebSocketTimeoutException:
-                self._controller_q.put('restart_data')
-                return
-            try:
-                pair = data['MarketDataIncrementalRefresh']['symbol']
-                endpoint = 'MarketDataIncrementalRefresh'
-            except KeyError:
-                pair = data['MarketDataSnapshotFullRefresh']['symbol']
-                endpoint = 'MarketDataSnapshotFullRefresh'
-            self.data_q.put((endpoint, pair, data[endpoint], time.time()))
+        try:
+            while self.running:
+                try:
+                    raw = conn.recv()
+                except WebSocketTimeoutException:
+                    self._controller_q.put('restart_data')
+                    return
+                if self._on_message(None, raw, time.time()) is False:
+                    # Reconnect, to receive fresh snapshots
+                    self._controller_q.put('restart_data')
+                    return
+        finally:
+            conn.close()
+
+    def _connections(self):
+        return [(None, self.addr)]
+
+    def _on_message(self, key, raw, ts):
+        data = json_loads(raw)
+        try:
+            pair = data['MarketDataIncrementalRefresh']['symbol']
+            endpoint = 'MarketDataIncrementalRefresh'
+        except KeyError:
+            pair = data['MarketDataSnapshotFullRefresh']['symbol']
+            endpoint = 'MarketDataSnapshotFullRefresh'
+        in_sync = self._handle_book(endpoint, data[endpoint], ts)
+        self.publish(endpoint, pair, data[endpoint], ts)
+        return in_sync
+
+    def _handle_book(self, endpoint, data, ts):
+        """
+        Applies a snapshot or incremental refresh to the symbol's book.
+        :param endpoint: 'MarketDataSnapshotFullRefresh' or
+                         'MarketDataIncrementalRefresh'
+        :param data: dict, as received via wss
+        :param ts: timestamp, declares when data was received by the client
+        :return: False if a sequence gap was detected, True otherwise
+        """
+        symbol = data['symbol']
+        try:
+            stats = self._stats[symbol]
+        except KeyError:
+            stats = self._stats[symbol] = {'snapshots': 0, 'gaps': 0,
+                                           'duplicates': 0}
+
+        if endpoint == 'MarketDataSnapshotFullRefresh':
+            book = self.books[symbol] = L2Book(symbol)
+            self._update_book(book, data, ts)
+            self._sequences[symbol] = data['snapshotSeqNo']
+            stats['snapshots'] += 1
+            return True
+
+        last = self._sequences.get(symbol)
+        if last is None:
+            # No snapshot yet, or stale - wait for the next snapshot
+            return True
+        if data['seqNo'] <= last:
+            # Contained in the snapshot, or received already
+            stats['duplicates'] += 1
+            return True
+        if data['seqNo'] != last + 1:
+            log.warning("HitBTCWSS: Sequence gap for %s (%s -> %s)!", symbol,
+                        last, data['seqNo'])
+            stats['gaps'] += 1
+            self._sequences[symbol] = None
+            return False
+        self._update_book(self.books[symbol], data, ts)
+        self._sequences[symbol] = data['seqNo']
+        return True
+
+    @staticmethod
+    def _update_book(book, data, ts):
+        """
+        Applies the levels of a snapshot or incremental refresh to book;
+        levels with a size of 0 are removed.
+        :param book: L2Book obj
+        :param data: dict, as received via wss
+        :param ts: timestamp, declares when data was received by the client
+        :return:
+        """
+        for key, side in (('bid', 'bids'), ('ask', 'asks')):
+            for level in data.get(key, ()):
+                if float(level['size']) == 0:
+                    book.remove(side, level['price'], ts=ts)
+                else:
+                    book.set(side, level['price'], level['size'], ts=ts)
+
+    def book_stats(self):
+        """
+        Returns the number of snapshots, sequence gaps and skipped duplicate
+        refreshes of each symbol's book, and whether it is currently in sync.
+        :return: dict of symbol: dict
+        """
+        return {symbol: dict(stats,
+                             synced=self._sequences.get(symbol) is not None)
+                for symbol, stats in self._stats.items()}
 
     def _trade_thread(self):
         try:
@@ -93,7 +189,7 @@ class HitBTCWSS(WSSAPI):
             except WebSocketTimeoutException:
                 self._controller_q.put('restart_data')
                 return
-            self.data_q.put(json.loads(data))
+            self.data_q.put(json_loads(data))
 
             try:
                 payload = self.trade_command_q.get()
@@ -116,11 +212,11 @@ class HitBTCWSS(WSSAPI):
         package = {'apikey': self.key,
                    'message': {'nonce': nonce, 'payload': payload}}
 
-        signature = hmac.new(self.secret, json.dumps(payload).hexdigest,
+        signature = hmac.new(self.secret, json_dumps(payload).hexdigest,
                              hashlib.sha512).hexdigest()
         package['signature'] = signature
 
-        return json.dumps(package)
+        return json_dumps(package)
 
     def send(self, payload, auth=False):
         pkg = self.sign(payload) if auth else payload
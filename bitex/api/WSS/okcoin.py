@@ -1,6 +1,5 @@
 # Import Built-Ins
 import logging
-import json
 import threading
 import time
 
@@ -10,6 +9,7 @@ import requests
 
 # Import Homebrew
 from .base import WSSAPI
+from ...codec import loads as json_loads, dumps as json_dumps
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
@@ -38,6 +38,20 @@ class OKCoinWSS(WSSAPI):
 
     def _process_data(self):
         self.conn = create_connection(self.addr, timeout=4)
+        self._on_open(None, self.conn)
+        while self.running:
+            try:
+                raw = self.conn.recv()
+            except (WebSocketTimeoutException, ConnectionResetError):
+                self._controller_q.put('restart')
+                continue
+            self._on_message(None, raw, time.time())
+        self.conn = None
+
+    def _connections(self):
+        return [(None, self.addr)]
+
+    def _on_open(self, key, conn):
         for pair in self.pairs:
             payload = [{'event': 'addChannel',
                         'channel': 'ok_sub_spotusd_%s_ticker' % pair},
@@ -48,17 +62,12 @@ class OKCoinWSS(WSSAPI):
                        {'event': 'addChannel',
                         'channel': 'ok_sub_spotusd_%s_kline_1min' % pair}]
             log.debug(payload)
-            self.conn.send(json.dumps(payload))
-        while self.running:
-            try:
-                data = json.loads(self.conn.recv())
-            except (WebSocketTimeoutException, ConnectionResetError):
-                self._controller_q.put('restart')
+            conn.send(json_dumps(payload))
 
-            if 'data' in data:
-                pair = ''.join(data['channel'].split('spot')[1].split('_')[:2]).upper()
-                self.data_q.put((data['channel'], pair, data['data'],
-                                 time.time()))
-            else:
-                log.debug(data)
-        self.conn = None
\ No newline at end of file
+    def _on_message(self, key, raw, ts):
+        data = json_loads(raw)
+        if 'data' in data:
+            pair = ''.join(data['channel'].split('spot')[1].split('_')[:2]).upper()
+            self.publish(data['channel'], pair, data['data'], ts)
+        else:
+            log.debug(data)
@@ -0,0 +1,271 @@
+"""
+Local order books maintained from websocket feeds.
+
+Price levels are kept in sortedcontainers.SortedDicts, keyed by the float
+value of the price, so that updates cost O(log n) and the best bid and ask
+are read in O(1). Prices and sizes are stored as received - i.e. as strings,
+if the exchange sends decimals as strings.
+"""
+# Import Built-Ins
+import logging
+import threading
+from decimal import Decimal
+from operator import neg
+
+# Import Third-Party
+from sortedcontainers import SortedDict
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+def absolute(amount):
+    """
+    Returns the absolute value of amount, keeping its type.
+    :param amount: str, int or float
+    :return: str, int or float
+    """
+    if isinstance(amount, str):
+        return amount.lstrip('-')
+    return abs(amount)
+
+
+def _number(size):
+    # Sizes received as strings are summed exactly
+    return Decimal(size) if isinstance(size, str) else size
+
+
+class L2Book:
+    """
+    Thread-safe, price-aggregated order book of a single pair.
+
+    Each level is stored as a (price, size, count) tuple; count is None if the
+    exchange doesn't provide it.
+    """
+    def __init__(self, pair=None):
+        """
+        Initialize Object.
+        :param pair: str, pair the book belongs to
+        """
+        self.pair = pair
+        self.bids = SortedDict(neg)
+        self.asks = SortedDict()
+        self.updates = 0
+        self.ts = None
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return '%s(%r, bid=%r, ask=%r)' % (self.__class__.__name__, self.pair,
+                                           self.best_bid(), self.best_ask())
+
+    def _side(self, side):
+        return self.bids if side == 'bids' else self.asks
+
+    def set(self, side, price, size, count=None, ts=None):
+        """
+        Adds or replaces the level at price.
+        :param side: 'bids' or 'asks'
+        :param price: price of the level
+        :param size: aggregated size of the level
+        :param count: number of orders at the level, if provided
+        :param ts: timestamp of the update
+        :return:
+        """
+        with self._lock:
+            self._side(side)[float(price)] = price, size, count
+            self.updates += 1
+            self.ts = ts
+
+    def remove(self, side, price, ts=None):
+        """
+        Removes the level at price, if it exists.
+        :param side: 'bids' or 'asks'
+        :param price: price of the level
+        :param ts: timestamp of the update
+        :return: the removed level, or None
+        """
+        with self._lock:
+            self.updates += 1
+            self.ts = ts
+            return self._side(side).pop(float(price), None)
+
+    def clear(self):
+        with self._lock:
+            self.bids.clear()
+            self.asks.clear()
+
+    def best_bid(self):
+        """
+        Returns the best bid as a (price, size) tuple, or None.
+        """
+        with self._lock:
+            if not self.bids:
+                return None
+            return self.bids.peekitem(0)[1][:2]
+
+    def best_ask(self):
+        """
+        Returns the best ask as a (price, size) tuple, or None.
+        """
+        with self._lock:
+            if not self.asks:
+                return None
+            return self.asks.peekitem(0)[1][:2]
+
+    def bbo(self):
+        """
+        Returns the best bid and ask, read consistently under a single lock.
+        :return: tuple of (price, size) tuples, or None for an empty side
+        """
+        with self._lock:
+            bid = self.bids.peekitem(0)[1][:2] if self.bids else None
+            ask = self.asks.peekitem(0)[1][:2] if self.asks else None
+            return bid, ask
+
+    def depth(self, n=10):
+        """
+        Returns the best n levels of each side.
+        :param n: number of levels per side
+        :return: dict of 'bids' and 'asks', each a list of (price, size)
+                 tuples, best first
+        """
+        with self._lock:
+            return {'bids': [level[:2] for level in self.bids.values()[:n]],
+                    'asks': [level[:2] for level in self.asks.values()[:n]]}
+
+    def snapshot(self):
+        """
+        Returns a copy of the entire book.
+        :return: dict of 'pair', 'ts', 'bids' and 'asks'; the latter are
+                 lists of (price, size, count) tuples, best first
+        """
+        with self._lock:
+            return {'pair': self.pair, 'ts': self.ts,
+                    'bids': list(self.bids.values()),
+                    'asks': list(self.asks.values())}
+
+
+class L3Book(L2Book):
+    """
+    Thread-safe, per-order book of a single pair.
+
+    Orders are indexed by id, and by price level; adding, changing and
+    removing an order costs O(1), plus O(log n) if a price level is created
+    or removed. The aggregated levels are maintained incrementally, so the
+    L2 views of L2Book (best_bid(), best_ask(), depth() and snapshot()) are
+    available without rescanning the orders.
+    """
+    def __init__(self, pair=None):
+        super(L3Book, self).__init__(pair)
+        self.orders = {}  # order id: (side, price, size)
+        # side: {level key: {order id: size}}, in order of arrival
+        self._index = {'bids': {}, 'asks': {}}
+        self._totals = {'bids': {}, 'asks': {}}  # side: {level key: size}
+
+    def _add(self, order_id, side, price, size, replaced=0):
+        key = float(price)
+        orders = self._index[side].setdefault(key, {})
+        orders[order_id] = amount = _number(size)
+        total = self._totals[side].get(key, 0) + amount - replaced
+        self._totals[side][key] = total
+        self.orders[order_id] = side, price, size
+        self._side(side)[key] = (price, str(total) if isinstance(size, str)
+                                 else total, len(orders))
+
+    def _remove(self, order_id):
+        side, price, size = self.orders.pop(order_id)
+        key = float(price)
+        orders = self._index[side][key]
+        amount = orders.pop(order_id)
+        if not orders:
+            del self._index[side][key]
+            del self._totals[side][key]
+            del self._side(side)[key]
+            return
+        total = self._totals[side][key] - amount
+        self._totals[side][key] = total
+        self._side(side)[key] = (price, str(total) if isinstance(size, str)
+                                 else total, len(orders))
+
+    def add(self, order_id, side, price, size, ts=None):
+        """
+        Adds an order, replacing the order with the same id, if any. An order
+        whose size changed keeps its place in the queue of its price level.
+        :param order_id: id of the order
+        :param side: 'bids' or 'asks'
+        :param price: price of the order
+        :param size: remaining size of the order
+        :param ts: timestamp of the update
+        :return:
+        """
+        with self._lock:
+            replaced = 0
+            try:
+                old_side, old_price, _ = self.orders[order_id]
+            except KeyError:
+                pass
+            else:
+                if old_side == side and float(old_price) == float(price):
+                    replaced = self._index[side][float(price)][order_id]
+                else:
+                    self._remove(order_id)
+            self._add(order_id, side, price, size, replaced)
+            self.updates += 1
+            self.ts = ts
+
+    def remove_order(self, order_id, ts=None):
+        """
+        Removes an order, if it exists.
+        :param order_id: id of the order
+        :param ts: timestamp of the update
+        :return: the removed (side, price, size) tuple, or None
+        """
+        with self._lock:
+            self.updates += 1
+            self.ts = ts
+            try:
+                order = self.orders[order_id]
+            except KeyError:
+                return None
+            self._remove(order_id)
+            return order
+
+    def top_orders(self, side, n=25):
+        """
+        Returns the best n orders of the given side - best price first, and
+        in order of arrival within a price level.
+        :param side: 'bids' or 'asks'
+        :param n: number of orders
+        :return: list of (order id, price, size) tuples
+        """
+        orders = []
+        with self._lock:
+            for key in self._side(side):
+                for order_id in self._index[side][key]:
+                    if len(orders) == n:
+                        return orders
+                    _, price, size = self.orders[order_id]
+                    orders.append((order_id, price, size))
+        return orders
+
+    def orders_at(self, side, price):
+        """
+        Returns the orders at the given price level, in order of arrival.
+        :param side: 'bids' or 'asks'
+        :param price: price of the level
+        :return: list of (order id, size) tuples
+        """
+        with self._lock:
+            key = float(price)
+            return [(order_id, self.orders[order_id][2])
+                    for order_id in self._index[side].get(key, ())]
+
+    def clear(self):
+        with self._lock:
+            super(L3Book, self).clear()
+            self.orders.clear()
+            for side in ('bids', 'asks'):
+                self._index[side].clear()
+                self._totals[side].clear()
@@ -1,12 +1,12 @@
 # Import Built-Ins
-import signal
+import asyncio
 import logging
-import multiprocessing as mp
 import time
+from functools import partial
+from threading import Thread
 
 # Import Third-Party
 from autobahn.asyncio.wamp import ApplicationRunner, ApplicationSession
-from asyncio import coroutine, get_event_loop
 import requests
 
 # Import Homebrew
@@ -17,67 +17,148 @@ log = logging.getLogger(__name__)
 
 
 class PoloniexSession(ApplicationSession):
-
-    @coroutine
-    def onJoin(self, *args, **kwargs):
-        channel = self.config.extra['channel']
-
-        def onTicker(*args, **kwargs):
-            self.config.extra['queue'].put((channel, (args, kwargs, time.time())))
-
-        if self.config.extra['is_killed'].is_set():
-            raise KeyboardInterrupt()
-        try:
-            yield from self.subscribe(onTicker, self.config.extra['channel'])
-
-        except Exception as e:
-            raise
-
-
-class PlnxEndpoint(mp.Process):
-    def __init__(self, endpoint, q, **kwargs):
-        super(PlnxEndpoint, self).__init__(name='%s Endpoint Process' %
-                                                endpoint, **kwargs)
-        self.endpoint = endpoint
-        self.q = q
-        self.is_killed = mp.Event()
-
-    def run(self):
-        self.runner = ApplicationRunner("wss://api.poloniex.com:443", 'realm1',
-                                   extra={'channel': self.endpoint,
-                                          'queue': self.q,
-                                          'is_killed': self.is_killed})
-        self.runner.run(PoloniexSession)
-
-    def join(self, *args, **kwargs):
-        self.is_killed.set()
-        super(PlnxEndpoint, self).join(*args, **kwargs)
+    """
+    WAMP session subscribing to a group of Poloniex topics; events are passed
+    to PoloniexWSS._on_event().
+    """
+    async def onJoin(self, details):
+        wss = self.config.extra['wss']
+        for topic in self.config.extra['topics']:
+            await self.subscribe(partial(wss._on_event, topic), topic)
+        log.debug("PoloniexSession.onJoin(): Subscribed to %s topics",
+                  len(self.config.extra['topics']))
+
+    def onDisconnect(self):
+        disconnected = self.config.extra['disconnected']
+        if not disconnected.done():
+            disconnected.set_result(None)
 
 
 class PoloniexWSS(WSSAPI):
-    def __init__(self, endpoints=None):
-        super(PoloniexWSS, self).__init__(None, 'Poloniex')
-        self.data_q = mp.Queue()
-        self.connections = {}
+    """
+    Subscribes to all endpoints (WAMP topics) via a small number of sessions,
+    which share a single event loop running in a background thread; the
+    endpoints are distributed evenly across them. Dropped sessions are
+    re-established after reconnect_delay seconds.
+
+    Messages are published as (topic, pair, args, kwargs, ts) tuples; pair is
+    the topic itself for markets, and the ticker's currency pair for the
+    'ticker' topic.
+    """
+    def __init__(self, endpoints=None, sessions=1):
+        """
+        Initialize Object.
+        :param endpoints: list of topics; all markets and 'ticker' if None
+        :param sessions: int, number of WAMP sessions to multiplex the
+                         endpoints over
+        """
+        super(PoloniexWSS, self).__init__('wss://api.poloniex.com:443',
+                                          'Poloniex')
         if endpoints:
             self.endpoints = endpoints
         else:
             r = requests.get('https://poloniex.com/public?command=returnTicker')
             self.endpoints = list(r.json().keys())
             self.endpoints.append('ticker')
+        self.sessions = max(1, min(sessions, len(self.endpoints)))
+        self.reconnect_delay = 5
+
+        self._loop = None
+        self._loop_thread = None
+        self._stopped = None
+
+    def _topic_groups(self):
+        """
+        Returns the endpoints, split into one group per session.
+        :return: list of lists
+        """
+        return [self.endpoints[i::self.sessions] for i in range(self.sessions)]
 
-        for endpoint in self.endpoints:
-            self.connections[endpoint] = PlnxEndpoint(endpoint, self.data_q)
+    def _on_event(self, topic, *args, **kwargs):
+        ts = time.time()
+        pair = args[0] if topic == 'ticker' and args else topic
+        self.publish(topic, pair, args, kwargs, ts)
 
     def start(self):
         super(PoloniexWSS, self).start()
-        for conn in self.connections:
-            self.connections[conn].start()
+        self._loop = asyncio.new_event_loop()
+        self._stopped = None
+        self._loop_thread = Thread(target=self._run_loop, daemon=True,
+                                   name='Poloniex Session Thread')
+        self._loop_thread.start()
 
     def stop(self):
-        for conn in self.connections:
-            self.connections[conn].join()
         super(PoloniexWSS, self).stop()
+        if self._loop_thread is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._set_stopped)
+        except RuntimeError:
+            # The loop thread has exited already, and closed the loop
+            pass
+        self._loop_thread.join()
+        self._loop_thread = None
+
+    def _set_stopped(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run_sessions())
+        finally:
+            self._loop.close()
+
+    async def _run_sessions(self):
+        # Created within the loop; on Python < 3.10, an Event binds to the
+        # loop current when it's created
+        self._stopped = asyncio.Event()
+        if not self.running:
+            return
+        tasks = [asyncio.ensure_future(self._run_session(topics))
+                 for topics in self._topic_groups()]
+        try:
+            await self._stopped.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_session(self, topics):
+        """
+        Keeps a session subscribed to topics alive, until the client is
+        stopped.
+        :param topics: list of topics
+        :return:
+        """
+        while self.running:
+            disconnected = self._loop.create_future()
+            runner = ApplicationRunner(self.addr, 'realm1',
+                                       extra={'wss': self, 'topics': topics,
+                                              'disconnected': disconnected})
+            transport = protocol = None
+            try:
+                transport, protocol = await runner.run(PoloniexSession,
+                                                       start_loop=False)
+                await disconnected
+            except asyncio.CancelledError:
+                raise
+            except OSError as e:
+                log.error("PoloniexWSS: Connection failed: %s", e)
+            except Exception:
+                log.exception("PoloniexWSS: Session Error!")
+            finally:
+                if protocol is not None and not disconnected.done():
+                    # Close the websocket properly, i.e. when stopped
+                    protocol.sendClose()
+                    await asyncio.wait([disconnected], timeout=1)
+                if transport is not None:
+                    transport.close()
+            if self.running:
+                log.info("PoloniexWSS: Session disconnected, reconnecting "
+                         "in %ss..", self.reconnect_delay)
+                await asyncio.sleep(self.reconnect_delay)
 
 
 if __name__ == "__main__":
@@ -87,4 +168,4 @@ if __name__ == "__main__":
     time.sleep(5)
     wss.stop()
     while not wss.data_q.empty():
-        print(wss.data_q.get())
\ No newline at end of file
+        print(wss.data_q.get())
@@ -0,0 +1,160 @@
+"""
+Bounded data queues for the websocket clients.
+
+When a consumer falls behind, an unbounded queue grows until the process
+runs out of memory. A BoundedQueue holds at most maxsize messages, and
+applies one of the following policies to a message put on a full queue:
+
+    block        waits for a free slot, applying backpressure to the
+                 connection's receiving thread
+    drop_oldest  discards the oldest queued message
+    drop_newest  discards the new message
+    conflate     replaces the queued message with the same key - by default
+                 the message's (channel, pair) - keeping its position; if
+                 there is none, the oldest queued message is discarded
+
+Discarded and replaced messages are counted in `dropped`.
+
+Conflation suits channels whose messages each carry the full state, such as
+tickers. Don't conflate delta channels, such as book or raw book updates:
+each update only makes sense on top of the previous ones, so dropping any of
+them leaves a book built from the queue corrupted.
+"""
+# Import Built-Ins
+import logging
+import time
+from collections import deque
+from queue import Queue
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+BLOCK = 'block'
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+CONFLATE = 'conflate'
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, CONFLATE)
+
+
+def channel_and_pair(item):
+    """
+    Returns the conflation key of a data_q message, i.e. its first two
+    fields, or None if it has none.
+    :param item: message, usually a (channel, pair, data, ..) tuple
+    :return: tuple or None
+    """
+    try:
+        key = tuple(item[:2])
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class BoundedQueue(Queue):
+    """
+    queue.Queue with a drop policy, see module docstring.
+    """
+    def __init__(self, maxsize=0, policy=BLOCK, key=channel_and_pair):
+        """
+        Initialize Object.
+        :param maxsize: int, max. number of queued messages; 0 is unbounded
+        :param policy: str, one of POLICIES
+        :param key: callable returning the conflation key of a message
+        """
+        if policy not in POLICIES:
+            raise ValueError("policy must be one of %s, not %r!" %
+                             (POLICIES, policy))
+        self.policy = policy
+        self.key = key
+        self.dropped = 0
+        super(BoundedQueue, self).__init__(maxsize)
+
+    # Conflating queues store [key, message] cells, and index them by key
+
+    def _init(self, maxsize):
+        self.queue = deque()
+        self._pending = {}
+
+    def _put(self, item):
+        if self.policy != CONFLATE:
+            self.queue.append(item)
+            return
+        cell = [self.key(item), item]
+        self.queue.append(cell)
+        if cell[0] is not None:
+            self._pending[cell[0]] = cell
+
+    def _get(self):
+        if self.policy != CONFLATE:
+            return self.queue.popleft()
+        key, item = cell = self.queue.popleft()
+        if key is not None and self._pending.get(key) is cell:
+            del self._pending[key]
+        return item
+
+    def put(self, item, block=True, timeout=None):
+        """
+        Puts item on the queue, applying the queue's policy if it is full.
+        :param item: message
+        :param block: bool, passed to Queue.put() for the block policy
+        :param timeout: float, passed to Queue.put() for the block policy
+        :return:
+        """
+        if self.policy == BLOCK or self.maxsize <= 0:
+            return super(BoundedQueue, self).put(item, block, timeout)
+
+        with self.not_full:
+            if self._qsize() >= self.maxsize:
+                self.dropped += 1
+                if self.policy == DROP_NEWEST:
+                    return
+                if self.policy == CONFLATE:
+                    cell = self._pending.get(self.key(item))
+                    if cell is not None:
+                        cell[1] = item
+                        return
+                # Make room - the discarded message's task is taken over
+                self._get()
+                self.unfinished_tasks -= 1
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def get_batch(self, max_items=100, timeout=None):
+        """
+        Removes and returns up to max_items messages in arrival order, under
+        a single acquisition of the queue's lock. Waits for the first message
+        at most timeout seconds (forever, if None).
+        :param max_items: int, max. number of messages to return
+        :param timeout: float, seconds to wait for the first message
+        :return: list of messages; empty if the timeout expired
+        """
+        with self.not_empty:
+            if timeout is None:
+                while not self._qsize():
+                    self.not_empty.wait()
+            else:
+                end = time.monotonic() + timeout
+                while not self._qsize():
+                    remaining = end - time.monotonic()
+                    if remaining <= 0:
+                        return []
+                    self.not_empty.wait(remaining)
+            batch = [self._get()
+                     for _ in range(min(max_items, self._qsize()))]
+            self.not_full.notify(len(batch))
+            return batch
+
+    def stats(self):
+        """
+        Returns the queue's size, bound, policy and number of dropped messages.
+        :return: dict
+        """
+        with self.mutex:
+            return {'size': self._qsize(), 'maxsize': self.maxsize,
+                    'policy': self.policy, 'dropped': self.dropped}
@@ -0,0 +1,332 @@
+"""
+Shared-memory ring buffer for distributing market data across processes.
+
+A ShmRing is written by a single producer process - any number of websocket
+clients in it may publish to it, see ShmRing.subscriber() - and read by any
+number of ShmRingReaders, in the same or other processes. Unlike a
+multiprocessing.Queue, records aren't pickled and sent through a pipe; each
+reader decodes them straight from the shared buffer, and readers don't
+consume records from one another.
+
+Records have a fixed size, and hold a kind (TICKER, TRADE or LEVEL), a side
+(BID/BUY or ASK/SELL), a pair id, a price, a size and a timestamp. Pair names
+are registered in a table in the shared memory, so readers may resolve ids
+via ShmRingReader.pair().
+
+Layout:
+
+    header    magic, version, capacity, max. pairs, number of pairs, and
+              the position of the next record to write
+    pairs     max_pairs names of up to 16 bytes
+    slots     capacity slots of a sequence number and a record
+
+Each slot is guarded by a seqlock: the producer sets its sequence number to
+2 * position + 1 before writing the record at position, and to
+2 * position + 2 afterwards. A reader which finds any other number before or
+after decoding the record was lapped by the producer - the ring doesn't wait
+for slow readers - skips ahead, and counts the records it missed in `lost`.
+Python offers no memory fences, so this relies on stores becoming visible in
+program order, as they do on x86.
+"""
+# Import Built-Ins
+import logging
+import struct
+import threading
+import time
+
+# Import Third-Party
+try:
+    from multiprocessing import resource_tracker, shared_memory
+    shared_memory_available = True
+except ImportError:
+    shared_memory_available = False
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+TICKER = 1
+TRADE = 2
+LEVEL = 3
+
+BID = BUY = 0
+ASK = SELL = 1
+
+MAGIC = b'BXRB'
+VERSION = 1
+
+# magic, version, capacity, max. pairs, number of pairs, write position
+_HEADER = struct.Struct('<4sIQIIQ')
+_WRITE_POS = struct.Struct('<Q')
+_WRITE_POS_OFFSET = _HEADER.size - _WRITE_POS.size
+_N_PAIRS = struct.Struct('<I')
+_N_PAIRS_OFFSET = _WRITE_POS_OFFSET - _N_PAIRS.size
+_PAIR = struct.Struct('16s')
+# sequence number, followed by the record: kind, side, pair id, price, size,
+# timestamp
+_SLOT = struct.Struct('<QBBxxIddd')
+_SEQ = struct.Struct('<Q')
+_RECORD = struct.Struct('<BBxxIddd')
+
+# Serializes ShmRingReader._attach()'s patching of resource_tracker.register
+_attach_lock = threading.Lock()
+
+
+def _size(capacity, max_pairs):
+    return _HEADER.size + max_pairs * _PAIR.size + capacity * _SLOT.size
+
+
+class ShmRing:
+    """
+    Producer side of the ring, see module docstring. Safe to use from several
+    threads of the producer process.
+    """
+    def __init__(self, name=None, capacity=65536, max_pairs=1024):
+        """
+        Creates a new ring in shared memory.
+        :param name: str, name of the shared memory block; random if None
+        :param capacity: int, number of records the ring holds
+        :param max_pairs: int, max. number of pairs which may be registered
+        """
+        if not shared_memory_available:
+            raise SystemError("No multiprocessing.shared_memory Installed! "
+                              "ShmRing Unavailable!")
+        self.capacity = capacity
+        self.max_pairs = max_pairs
+        self.shm = shared_memory.SharedMemory(name, create=True,
+                                              size=_size(capacity, max_pairs))
+        self.name = self.shm.name
+        self._buf = self.shm.buf
+        _HEADER.pack_into(self._buf, 0, MAGIC, VERSION, capacity, max_pairs,
+                          0, 0)
+        self._slots = _HEADER.size + max_pairs * _PAIR.size
+        self._pos = 0
+        self._pairs = {}  # Dict of pair: pair id
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        self.unlink()
+
+    def pair_id(self, pair):
+        """
+        Returns the id of pair, registering it if necessary.
+        :param pair: str, name of the pair; at most 16 bytes when encoded
+        :return: int
+        """
+        try:
+            return self._pairs[pair]
+        except KeyError:
+            pass
+        name = pair.encode()
+        if len(name) > _PAIR.size:
+            raise ValueError("Pair names may be at most %s bytes long, not %r!"
+                             % (_PAIR.size, pair))
+        with self._lock:
+            if pair in self._pairs:
+                return self._pairs[pair]
+            pair_id = len(self._pairs)
+            if pair_id >= self.max_pairs:
+                raise ValueError("Cannot register %r - all %s pair ids are "
+                                 "taken!" % (pair, self.max_pairs))
+            _PAIR.pack_into(self._buf, _HEADER.size + pair_id * _PAIR.size,
+                            name)
+            _N_PAIRS.pack_into(self._buf, _N_PAIRS_OFFSET, pair_id + 1)
+            self._pairs[pair] = pair_id
+            return pair_id
+
+    def write(self, kind, pair, price, size, ts=None, side=BID):
+        """
+        Appends a record, overwriting the oldest one if the ring is full.
+        :param kind: TICKER, TRADE or LEVEL
+        :param pair: str, name of the pair
+        :param price: float
+        :param size: float; for LEVEL, 0 removes the level
+        :param ts: float, timestamp; now if None
+        :param side: BID/BUY or ASK/SELL
+        :return: int, position of the record
+        """
+        pair_id = self.pair_id(pair)
+        if ts is None:
+            ts = time.time()
+        buf = self._buf
+        with self._lock:
+            pos = self._pos
+            offset = self._slots + (pos % self.capacity) * _SLOT.size
+            _SEQ.pack_into(buf, offset, 2 * pos + 1)
+            _RECORD.pack_into(buf, offset + _SEQ.size, kind, side, pair_id,
+                              float(price), float(size), ts)
+            _SEQ.pack_into(buf, offset, 2 * pos + 2)
+            self._pos = pos + 1
+            _WRITE_POS.pack_into(buf, _WRITE_POS_OFFSET, pos + 1)
+        return pos
+
+    def ticker(self, pair, price, size=0, ts=None):
+        return self.write(TICKER, pair, price, size, ts)
+
+    def trade(self, pair, price, size, ts=None, side=BUY):
+        return self.write(TRADE, pair, price, size, ts, side)
+
+    def level(self, pair, side, price, size, ts=None):
+        return self.write(LEVEL, pair, price, size, ts, side)
+
+    def subscriber(self, convert):
+        """
+        Returns a subscriber for WSSAPI.add_subscriber(), which writes the
+        records convert() extracts from each message to the ring.
+        :param convert: callable, taking a message and returning an iterable
+                        of (kind, pair, price, size, ts, side) tuples
+        :return: callable
+        """
+        def publish(msg):
+            for record in convert(msg):
+                self.write(*record)
+        return publish
+
+    def close(self):
+        self._buf = None
+        self.shm.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory once all processes closed it.
+        :return:
+        """
+        self.shm.unlink()
+
+
+class ShmRingReader:
+    """
+    Consumer side of the ring, see module docstring.
+
+    Records are returned as (kind, side, pair id, price, size, ts) tuples.
+    """
+    def __init__(self, name, from_start=False):
+        """
+        Attaches to an existing ring.
+        :param name: str, name of the ring's shared memory block
+        :param from_start: bool, whether to start reading at the oldest
+                           record still in the ring, rather than the next one
+        """
+        if not shared_memory_available:
+            raise SystemError("No multiprocessing.shared_memory Installed! "
+                              "ShmRingReader Unavailable!")
+        self.shm = self._attach(name)
+        self._buf = self.shm.buf
+        magic, version, capacity, max_pairs, _, write_pos = \
+            _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("%r is not a ShmRing!" % name)
+        self.capacity = capacity
+        self._slots = _HEADER.size + max_pairs * _PAIR.size
+        self._pairs = []
+        self.pos = max(0, write_pos - capacity) if from_start else write_pos
+        self.lost = 0
+
+    @staticmethod
+    def _attach(name):
+        try:
+            return shared_memory.SharedMemory(name, track=False)
+        except TypeError:
+            pass
+        # Python < 3.13 - keep the resource tracker from unlinking the block
+        # once this process exits. Unregistering after the fact would remove
+        # the producer's registration, if both share a tracker.
+        # The patch is process-wide: readers attaching concurrently could
+        # otherwise restore each other's no-op, so they take turns. Other
+        # threads creating shared memory meanwhile, i.e. a ShmRing, would
+        # not be registered either - create rings before attaching readers
+        # from other threads.
+        with _attach_lock:
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                return shared_memory.SharedMemory(name)
+            finally:
+                resource_tracker.register = register
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def pair(self, pair_id):
+        """
+        Returns the name of the pair with the given id.
+        :param pair_id: int
+        :return: str
+        """
+        while pair_id >= len(self._pairs):
+            n_pairs = _N_PAIRS.unpack_from(self._buf, _N_PAIRS_OFFSET)[0]
+            if pair_id >= n_pairs:
+                raise KeyError(pair_id)
+            offset = _HEADER.size + len(self._pairs) * _PAIR.size
+            name = _PAIR.unpack_from(self._buf, offset)[0]
+            self._pairs.append(name.rstrip(b'\0').decode())
+        return self._pairs[pair_id]
+
+    def pending(self):
+        """
+        Returns the number of records written since the last read.
+        :return: int
+        """
+        return _WRITE_POS.unpack_from(self._buf, _WRITE_POS_OFFSET)[0] - self.pos
+
+    def read(self, max_items=1000):
+        """
+        Returns up to max_items of the records written since the last read,
+        without waiting for new ones.
+        :param max_items: int
+        :return: list of (kind, side, pair id, price, size, ts) tuples
+        """
+        buf, capacity, slots = self._buf, self.capacity, self._slots
+        unpack_slot, unpack_seq = _SLOT.unpack_from, _SEQ.unpack_from
+        records = []
+        pos = self.pos
+        write_pos = _WRITE_POS.unpack_from(buf, _WRITE_POS_OFFSET)[0]
+        while len(records) < max_items and pos < write_pos:
+            if write_pos - pos > capacity:
+                # Lapped - skip the records which were overwritten
+                self.lost += write_pos - capacity - pos
+                pos = write_pos - capacity
+            offset = slots + (pos % capacity) * _SLOT.size
+            slot = unpack_slot(buf, offset)
+            if slot[0] == 2 * pos + 2 and unpack_seq(buf, offset)[0] == slot[0]:
+                records.append(slot[1:])
+                pos += 1
+            elif slot[0] < 2 * pos + 2:
+                # Not visible yet
+                break
+            else:
+                # Overwritten while reading - skip past the slot the
+                # producer may be writing to
+                write_pos = _WRITE_POS.unpack_from(buf, _WRITE_POS_OFFSET)[0]
+                self.lost += write_pos - capacity + 1 - pos
+                pos = write_pos - capacity + 1
+        self.pos = pos
+        return records
+
+    def wait(self, max_items=1000, timeout=None, interval=0.0005):
+        """
+        Like read(), but polls for at most timeout seconds (forever, if None)
+        until at least one record is available.
+        :param max_items: int
+        :param timeout: float, seconds
+        :param interval: float, seconds between polls
+        :return: list of records; empty if the timeout expired
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            records = self.read(max_items)
+            if records or (end is not None and time.monotonic() >= end):
+                return records
+            time.sleep(interval)
+
+    def close(self):
+        self._buf = None
+        self.shm.close()
@@ -1,3 +1,5 @@
-from . import REST
-from . import WSS
+# Import Homebrew
+from .._lazy import lazy_exports
 
+__getattr__, __dir__ = lazy_exports(__name__, {'REST': ('.REST', None),
+                                               'WSS': ('.WSS', None)})
@@ -0,0 +1,118 @@
+"""
+JSON codec used by all REST and WSS clients.
+
+Picks the fastest JSON library installed - orjson, then ujson - and falls back
+to the stdlib's json module. All backends produce compact output (no spaces
+after separators) and raise json.JSONDecodeError on malformed input, so
+callers don't need to care which one is in use.
+
+The backend can be chosen explicitly with set_backend(), i.e. to compare
+their performance (see benchmarks/bench_json_codec.py).
+"""
+# Import Built-Ins
+import logging
+import json
+
+# Import Third-Party
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def _json_loads(s):
+    return json.loads(s)
+
+
+def _json_dumps(obj):
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def _orjson_loads(s):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError already
+    return orjson.loads(s)
+
+
+def _orjson_dumps(obj):
+    try:
+        return orjson.dumps(obj).decode('utf-8')
+    except TypeError:
+        # i.e. non-str dict keys or ints exceeding 64 bit
+        return _json_dumps(obj)
+
+
+def _ujson_loads(s):
+    try:
+        return ujson.loads(s)
+    except ValueError as e:
+        if isinstance(s, bytes):
+            s = s.decode('utf-8', errors='replace')
+        raise JSONDecodeError(str(e), s, 0) from e
+
+
+def _ujson_dumps(obj):
+    return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+
+
+BACKENDS = {'json': (_json_loads, _json_dumps)}
+if ujson is not None:
+    BACKENDS['ujson'] = _ujson_loads, _ujson_dumps
+if orjson is not None:
+    BACKENDS['orjson'] = _orjson_loads, _orjson_dumps
+
+backend = None
+_loads = _dumps = None
+
+
+def set_backend(name=None):
+    """
+    Selects the JSON library to use.
+    :param name: 'orjson', 'ujson' or 'json'; defaults to the fastest one
+                 installed
+    :return: name of the selected backend
+    """
+    global backend, _loads, _dumps
+    if name is None:
+        name = next(n for n in ('orjson', 'ujson', 'json') if n in BACKENDS)
+    try:
+        _loads, _dumps = BACKENDS[name]
+    except KeyError:
+        raise ValueError("JSON backend %s is not installed!" % name)
+    backend = name
+    log.debug("Using %s to encode and decode JSON", name)
+    return name
+
+
+def loads(s):
+    """
+    Parses the given JSON document.
+    :param s: str or bytes (UTF-8)
+    :return: parsed obj
+    :raises json.JSONDecodeError: if s isn't valid JSON
+    """
+    return _loads(s)
+
+
+def dumps(obj):
+    """
+    Serializes obj to a compact JSON str.
+    :param obj: JSON serializable obj
+    :return: str
+    """
+    return _dumps(obj)
+
+
+set_backend()
@@ -1,19 +1,34 @@
-from .bitfinex import Bitfinex
-from .bitstamp import Bitstamp
-from .bittrex import Bittrex
-from .ccex import CCEX
-from .coincheck import Coincheck
-from .cryptopia import Cryptopia
-from .gemini import Gemini
-from .itbit import ItBit
-from .kraken import Kraken
-from .okcoin import OKCoin
-from .rocktrading import RockTradingLtd
-from .yunbi import Yunbi
-from .poloniex import Poloniex
-from .quoine import Quoine
-from .quadriga import QuadrigaCX
-from .gdax import GDAX
-from .vaultoro import Vaultoro
-from .hitbtc import HitBtc
-from .bter import Bter
+"""
+Exchange interfaces; each is imported on first access.
+"""
+# Import Homebrew
+from .._lazy import lazy_exports
+
+__all__ = ['Bitfinex', 'Bitstamp', 'Bittrex', 'CCEX', 'Coincheck', 'Cryptopia',
+           'Gemini', 'ItBit', 'Kraken', 'OKCoin', 'RockTradingLtd', 'Yunbi',
+           'Poloniex', 'Quoine', 'QuadrigaCX', 'GDAX', 'Vaultoro', 'HitBtc',
+           'Bter']
+
+_exports = {
+    'Bitfinex': ('.bitfinex', 'Bitfinex'),
+    'Bitstamp': ('.bitstamp', 'Bitstamp'),
+    'Bittrex': ('.bittrex', 'Bittrex'),
+    'CCEX': ('.ccex', 'CCEX'),
+    'Coincheck': ('.coincheck', 'Coincheck'),
+    'Cryptopia': ('.cryptopia', 'Cryptopia'),
+    'Gemini': ('.gemini', 'Gemini'),
+    'ItBit': ('.itbit', 'ItBit'),
+    'Kraken': ('.kraken', 'Kraken'),
+    'OKCoin': ('.okcoin', 'OKCoin'),
+    'RockTradingLtd': ('.rocktrading', 'RockTradingLtd'),
+    'Yunbi': ('.yunbi', 'Yunbi'),
+    'Poloniex': ('.poloniex', 'Poloniex'),
+    'Quoine': ('.quoine', 'Quoine'),
+    'QuadrigaCX': ('.quadriga', 'QuadrigaCX'),
+    'GDAX': ('.gdax', 'GDAX'),
+    'Vaultoro': ('.vaultoro', 'Vaultoro'),
+    'HitBtc': ('.hitbtc', 'HitBtc'),
+    'Bter': ('.bter', 'Bter'),
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _exports)
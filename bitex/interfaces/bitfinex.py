@@ -9,7 +9,6 @@ import logging
 
 # Import Homebrew
 from ..api.REST import BitfinexREST
-from ..api.WSS.bitfinex import BitfinexWSS
 from ..utils import return_api_response
 from ..formatters.bitfinex import BtfxFormatter as fmt
 # Init Logging Facilities
@@ -22,6 +21,7 @@ class Bitfinex(BitfinexREST):
         if key_file:
             self.load_key(key_file)
         if websocket:
+            from ..api.WSS.bitfinex import BitfinexWSS
             self.wss = BitfinexWSS(pairs=pairs)
             self.wss.start()
         else:
@@ -118,7 +118,7 @@ class Bitfinex(BitfinexREST):
     def lends(self, currency, **kwargs):
         return self.public_query('lends/%s' % currency, params=kwargs)
 
-    @return_api_response(fmt.pairs)
+    @return_api_response(fmt.pairs, ttl=3600)
     def pairs(self, details=False):
         if details:
             return self.public_query('symbols_details')
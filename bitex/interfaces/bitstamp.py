@@ -9,7 +9,6 @@ import logging
 
 # Import Homebrew
 from ..api.REST import BitstampREST
-from ..api.WSS.bitstamp import BitstampWSS
 from ..utils import return_api_response
 from ..formatters.bitstamp import BtstFormatter as fmt
 
@@ -24,6 +23,7 @@ class Bitstamp(BitstampREST):
             self.load_key(key_file)
 
         if websocket:
+            from ..api.WSS.bitstamp import BitstampWSS
             self.wss = BitstampWSS()
             self.wss.start()
         else:
@@ -95,7 +95,7 @@ class Bitstamp(BitstampREST):
     def hourly_ticker(self, pair):
         return self.public_query('v2/ticker_hour/%s' % pair)
 
-    @return_api_response(None)
+    @return_api_response(None, ttl=60)
     def eurusd_rate(self):
         return self.public_query('eur_usd')
 
@@ -104,7 +104,7 @@ class Bittrex(BittrexREST):
     def pairs(self):
         return self.public_query('getmarkets')
 
-    @return_api_response(None)
+    @return_api_response(None, ttl=3600)
     def currencies(self):
         return self.public_query('getcurrencies')
 
@@ -9,7 +9,6 @@ import logging
 
 # Import Homebrew
 from ..api.REST import GDAXRest
-from ..api.WSS.gdax import GDAXWSS
 from ..utils import return_api_response
 from ..formatters.gdax import GdaxFormatter as fmt
 
@@ -23,6 +22,7 @@ class GDAX(GDAXRest):
         if key_file:
             self.load_key(key_file)
         if websocket:
+            from ..api.WSS.gdax import GDAXWSS
             self.wss = GDAXWSS()
             self.wss.start()
         else:
@@ -99,7 +99,7 @@ class GDAX(GDAXRest):
     def time(self):
         return self.public_query('time')
 
-    @return_api_response(None)
+    @return_api_response(None, ttl=3600)
     def currencies(self):
         return self.public_query('currencies')
 
@@ -9,7 +9,6 @@ import logging
 
 # Import Homebrew
 from ..api.REST import GeminiREST
-from ..api.WSS.gemini import GeminiWSS
 from ..utils import return_api_response
 from ..formatters.gemini import GmniFormatter as fmt
 
@@ -23,6 +22,7 @@ class Gemini(GeminiREST):
         if key_file:
             self.load_key(key_file)
         if websocket:
+            from ..api.WSS.gemini import GeminiWSS
             self.wss = GeminiWSS()
             self.wss.start()
         else:
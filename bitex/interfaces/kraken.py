@@ -108,11 +108,11 @@ class Kraken(KrakenREST):
     def time(self):
         return self.public_query('Time')
 
-    @return_api_response(None)
+    @return_api_response(None, ttl=3600)
     def assets(self, **kwargs):
         return self.public_query('Assets', params=kwargs)
 
-    @return_api_response(fmt.pairs)
+    @return_api_response(fmt.pairs, ttl=3600)
     def pairs(self, **kwargs):
         return self.public_query('AssetPairs', params=kwargs)
 
@@ -9,7 +9,6 @@ import logging
 
 # Import Homebrew
 from ..api.REST import PoloniexREST
-from ..api.WSS.poloniex import PoloniexWSS
 from ..utils import return_api_response
 from ..formatters.poloniex import PlnxFormatter as fmt
 # Init Logging Facilities
@@ -22,6 +21,7 @@ class Poloniex(PoloniexREST):
         if key_file:
             self.load_key(key_file)
         if websocket:
+            from ..api.WSS.poloniex import PoloniexWSS
             self.wss = PoloniexWSS()
             self.wss.start()
         else:
@@ -0,0 +1,149 @@
+"""
+Runs a method on several exchange interfaces concurrently, using a bounded
+thread pool.
+
+Example:
+    from bitex import Kraken, Bitstamp, GDAX, multi
+
+    tickers = multi.query([Kraken(), Bitstamp(), GDAX()], 'ticker', 'BTCUSD',
+                          timeout=2)
+    tickers['Kraken']  # Kraken().ticker('BTCUSD').formatted
+
+    for exchange, ticker in multi.as_completed([Kraken(), Bitstamp()],
+                                               'ticker', 'BTCUSD'):
+        print(exchange, ticker)
+"""
+
+# Import Built-Ins
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Import Third-Party
+
+# Import Homebrew
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class MultiResponse(dict):
+    """
+    dict of exchange name: formatted result, containing all calls which
+    succeeded in time. Failed calls are stored in `errors`, calls which did
+    not finish in time in `timeouts`.
+    """
+    def __init__(self):
+        super(MultiResponse, self).__init__()
+        self.errors = {}
+        self.timeouts = []
+
+
+def _name_interfaces(interfaces):
+    """
+    Returns a dict of name: interface pairs. Interfaces passed as a list are
+    named after their class; duplicates are numbered (i.e. 'Kraken#2').
+    :param interfaces: list or dict of interface objects
+    :return: dict
+    """
+    if isinstance(interfaces, dict):
+        return dict(interfaces)
+
+    named = {}
+    for interface in interfaces:
+        name = type(interface).__name__
+        i = 1
+        while name in named:
+            i += 1
+            name = '%s#%s' % (type(interface).__name__, i)
+        named[name] = interface
+    return named
+
+
+def as_completed(interfaces, method, *args, timeout=None, max_workers=None,
+                 **kwargs):
+    """
+    Calls `method(*args, **kwargs)` on all given interfaces concurrently, and
+    yields (exchange name, result) tuples as the calls complete.
+
+    The result is the `formatted` attribute of the returned APIResponse, or
+    the exception instance if the call failed. Calls which take longer than
+    `timeout` seconds (measured from the moment a worker picked up the call)
+    yield a TimeoutError instance and are abandoned; their thread finishes in
+    the background, bounded by the client's own request timeout.
+
+    :param interfaces: list or dict of interface objects (i.e. Kraken())
+    :param method: str, name of the method to call (i.e. 'ticker')
+    :param args: positional args passed to each call
+    :param timeout: per-call timeout in seconds; None waits indefinitely
+    :param max_workers: size of the worker pool; defaults to one worker per
+                        interface, at most 32
+    :param kwargs: keyword args passed to each call
+    :return: generator of (str, result) tuples
+    """
+    interfaces = _name_interfaces(interfaces)
+    if not interfaces:
+        return
+    max_workers = max_workers or min(32, len(interfaces))
+    started = {}
+
+    def call(name, interface):
+        started[name] = time.monotonic()
+        r = getattr(interface, method)(*args, **kwargs)
+        return getattr(r, 'formatted', r)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {executor.submit(call, name, interface): name
+               for name, interface in interfaces.items()}
+    pending = set(futures)
+    try:
+        while pending:
+            wait_for = None
+            if timeout is not None:
+                now = time.monotonic()
+                for future in [f for f in pending if futures[f] in started]:
+                    if now - started[futures[future]] >= timeout:
+                        pending.remove(future)
+                        log.warning("as_completed(): %s.%s() timed out after "
+                                    "%ss", futures[future], method, timeout)
+                        yield futures[future], TimeoutError(
+                            "%s.%s() timed out" % (futures[future], method))
+                deadlines = [started[futures[f]] + timeout for f in pending
+                             if futures[f] in started]
+                wait_for = min(deadlines) - now if deadlines else timeout
+
+            done, _ = wait(pending, timeout=wait_for,
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    log.exception("as_completed(): Error during call to "
+                                  "%s.%s()", futures[future], method)
+                    yield futures[future], e
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def query(interfaces, method, *args, timeout=None, max_workers=None,
+          **kwargs):
+    """
+    Calls `method(*args, **kwargs)` on all given interfaces concurrently, and
+    returns the formatted results keyed by exchange name. See as_completed()
+    for details on the parameters.
+    :return: MultiResponse
+    """
+    results = MultiResponse()
+    for name, result in as_completed(interfaces, method, *args,
+                                     timeout=timeout, max_workers=max_workers,
+                                     **kwargs):
+        if isinstance(result, TimeoutError):
+            results.timeouts.append(name)
+        elif isinstance(result, Exception):
+            results.errors[name] = result
+        else:
+            results[name] = result
+    return results
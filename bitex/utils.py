@@ -4,6 +4,7 @@ Provides utility functions used across more than one module or sub module.
 """
 
 # Import Built-Ins
+import copy
 import logging
 import json
 from functools import wraps
@@ -17,17 +18,84 @@ import requests
 log = logging.getLogger(__name__)
 
 
-def return_api_response(formatter=None):
+def format_api_response(r, formatter, *args, **kwargs):
+    """
+    Validates the status and json payload of the given APIResponse, and sets
+    the formatter (if available) to be applied to it on first access of its
+    `formatted` attribute.
+    :param r: bitex.api.response.APIResponse() obj
+    :param formatter: bitex.formatters.Formatter() obj
+    :param args: positional args of the call which produced r
+    :param kwargs: keyword args of the call which produced r
+    :return: bitex.api.response.APIResponse()
+    """
+    # Check Status
+    try:
+        r.raise_for_status()
+    except requests.HTTPError:
+        log.exception("return_api_response: HTTPError for url %s", r.url)
+
+    #  Verify json data - APIResponse memoizes it, so it's parsed only once
+    try:
+        data = r.json()
+    except json.JSONDecodeError:
+        log.error('return_api_response: Error while parsing json. '
+                  'Request url was: %s, result is: '
+                  '%s', r.url, r.text)
+        data = None
+    except Exception:
+        log.exception("return_api_response(): Unexpected error while parsing "
+                      "json from %s", r.url)
+        raise
+
+    # Format lazily, if available
+    r = r.set_formatter(formatter if data else None, *args, **kwargs)
+
+    return r
+
+
+def make_key(name, args, kwargs):
+    """
+    Builds the cache key for a method call.
+    :param name: name of the method
+    :param args: positional args of the call, sans self
+    :param kwargs: keyword args of the call
+    :return: tuple, or None if the args aren't hashable
+    """
+    key = (name, tuple(args), tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def return_api_response(formatter=None, ttl=None):
     """
     Decorator, which Applies the referenced formatter (if available) to the
     function output and adds it to the APIResponse Object's `formatted`
     attribute.
+    If a ttl is given and the client's cache is enabled (see
+    bitex.api.REST.APIClient.enable_cache()), successful responses are cached
+    for ttl seconds, and repeated calls with the same arguments are answered
+    from the cache.
     :param formatter: bitex.formatters.Formatter() obj
+    :param ttl: seconds to cache the response for; None to never cache it
     :return: bitex.api.response.APIResponse()
     """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
+            cache = getattr(args[0], 'cache', None) if args else None
+            key = None
+            if ttl and cache is not None:
+                key = make_key(func.__name__, args[1:], kwargs)
+            if key is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    # Shallow copy, so callers may reassign its attributes
+                    return copy.copy(cached)
+
             try:
                 r = func(*args, **kwargs)
             except Exception:
@@ -35,34 +103,16 @@ def return_api_response(formatter=None):
                               func.__name__, args, kwargs)
                 raise
 
-            # Check Status
-            try:
-                r.raise_for_status()
-            except requests.HTTPError:
-                log.exception("return_api_response: HTTPError for url %s",
-                              r.request.url)
-
-            #  Verify json data
-            try:
-                data = r.json()
-            except json.JSONDecodeError:
-                log.error('return_api_response: Error while parsing json. '
-                          'Request url was: %s, result is: '
-                          '%s', r.request.url, r.text)
-                data = None
-            except Exception:
-                log.exception("return_api_response(): Unexpected error while parsing "
-                              "json from %s", r.request.url)
-                raise
-
-            # Format, if available
-            if formatter is not None and data:
-                try:
-                    r.formatted = formatter(data, *args, **kwargs)
-                except Exception:
-                    log.exception("Error while applying formatter!")
-
+            r = format_api_response(r, formatter, *args, **kwargs)
+            if key is not None and r.ok:
+                r.formatted  # format once, rather than on every cache hit
+                cache.set(key, copy.copy(r), cache.ttl(func.__name__, ttl),
+                          size=r.content_length)
             return r
 
+        # Expose the formatter and ttl, so the call can be replayed elsewhere
+        # (i.e. by bitex.api.REST.AsyncAPIClient)
+        wrapper.formatter = formatter
+        wrapper.ttl = ttl
         return wrapper
     return decorator
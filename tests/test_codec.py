@@ -0,0 +1,69 @@
+# Import Built-ins
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import unittest
+import urllib.parse
+
+# Import Homebrew
+from bitex import codec
+from bitex.api.REST import CryptopiaREST, GeminiREST
+
+log = logging.getLogger(__name__)
+
+PAYLOAD = {'channel': 'book', 'pair': 'BTCUSD', 'prec': 'P0',
+           'book': [[1000.5, 2, -0.25], [999.0, 1, 1.5]], 'ok': True,
+           'id': None, 'note': 'café'}
+
+
+class CodecTests(unittest.TestCase):
+    def tearDown(self):
+        codec.set_backend()
+
+    def test_backends_agree(self):
+        for name in codec.BACKENDS:
+            with self.subTest(backend=name):
+                codec.set_backend(name)
+                encoded = codec.dumps(PAYLOAD)
+                self.assertIsInstance(encoded, str)
+                self.assertNotIn(', ', encoded)
+                self.assertEqual(json.loads(encoded), PAYLOAD)
+                self.assertEqual(codec.loads(encoded), PAYLOAD)
+                self.assertEqual(codec.loads(encoded.encode('utf-8')), PAYLOAD)
+
+    def test_backends_raise_json_decode_error(self):
+        for name in codec.BACKENDS:
+            with self.subTest(backend=name):
+                codec.set_backend(name)
+                with self.assertRaises(json.JSONDecodeError):
+                    codec.loads(b'{"result": [1, 2')
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            codec.set_backend('simplejson-fork')
+
+    def test_signed_payload_is_sent_payload(self):
+        client = GeminiREST(key='key', secret='secret')
+        _, kwargs = client.sign(client.uri, 'order/new', 'v1/order/new',
+                                'POST', params={'amount': '0.5'})
+        sent = base64.b64decode(kwargs['headers']['X-GEMINI-PAYLOAD'])
+        sent = json.loads(sent.decode('utf-8'))
+        self.assertEqual(sent['amount'], '0.5')
+
+        client = CryptopiaREST(key='key', secret=base64.b64encode(b'secret'))
+        uri, kwargs = client.sign(client.uri, 'GetBalance', 'GetBalance',
+                                  'POST', params={'Currency': 'BTC'})
+        _, signature, nonce = kwargs['headers']['Authorization'].split(':')
+        md5 = hashlib.md5(kwargs['data'].encode('utf-8')).digest()
+        message = ('key' + 'POST' + urllib.parse.quote_plus(uri).lower() +
+                   nonce + base64.b64encode(md5).decode('utf-8'))
+        expected = hmac.new(b'secret', message.encode('utf-8'),
+                            hashlib.sha256).digest()
+        self.assertEqual(base64.b64decode(signature), expected)
+        self.assertEqual(json.loads(kwargs['data']), {'Currency': 'BTC'})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,80 @@
+# Import Built-ins
+import json
+import logging
+import os
+import subprocess
+import sys
+import unittest
+
+log = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('autobahn', 'pusherclient', 'websocket', 'jwt', 'aiohttp')
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed,
+                  'loaded': [m for m in %r if m in sys.modules]}))
+"""
+
+
+def measure(statement, runs=3):
+    """
+    Imports in a fresh interpreter, and returns the fastest import time and
+    the heavy dependencies loaded along the way.
+    """
+    env = dict(os.environ)
+    paths = [ROOT, env.get('PYTHONPATH')]
+    env['PYTHONPATH'] = os.pathsep.join(p for p in paths if p)
+    results = []
+    for _ in range(runs):
+        out = subprocess.check_output([sys.executable, '-c',
+                                       SCRIPT % (statement, HEAVY)],
+                                      env=env, stderr=subprocess.DEVNULL)
+        results.append(json.loads(out.decode('utf-8').splitlines()[-1]))
+    return min(r['elapsed'] for r in results), results[-1]['loaded']
+
+
+class ImportTimeTests(unittest.TestCase):
+    def test_rest_client_import_skips_websocket_libraries(self):
+        elapsed, loaded = measure("from bitex.api.REST import KrakenREST")
+        log.info("from bitex.api.REST import KrakenREST: %.1fms", elapsed * 1000)
+        self.assertEqual(loaded, [])
+
+    def test_interface_import_skips_websocket_libraries(self):
+        elapsed, loaded = measure("import bitex; from bitex import Kraken, "
+                                  "Quoine, Poloniex, Bitstamp")
+        log.info("from bitex import Kraken, ..: %.1fms", elapsed * 1000)
+        self.assertNotIn('autobahn', loaded)
+        self.assertNotIn('pusherclient', loaded)
+        self.assertNotIn('websocket', loaded)
+
+    def test_lazy_import_is_faster_than_importing_everything(self):
+        lazy, _ = measure("import bitex; bitex.Kraken")
+        # PoloniexWSS is left out, as autobahn's asyncio support doesn't
+        # import on all Python versions
+        eager, _ = measure("import bitex; import bitex.api.REST.quoine; "
+                           "[getattr(bitex.api.WSS, n) for n in "
+                           "bitex.api.WSS.__all__ if n != 'PoloniexWSS']; "
+                           "[getattr(bitex, n) for n in bitex.__all__]")
+        log.info("Import time: lazy %.1fms, everything %.1fms", lazy * 1000,
+                 eager * 1000)
+        self.assertLess(lazy, eager)
+
+    def test_public_names_are_unchanged(self):
+        import bitex
+        from bitex.api import REST, WSS
+        for name in ('Kraken', 'Bitfinex', 'GDAX', 'Poloniex', 'multi'):
+            self.assertIn(name, dir(bitex))
+            self.assertIsNotNone(getattr(bitex, name))
+        self.assertEqual(REST.KrakenREST.__name__, 'KrakenREST')
+        self.assertEqual(WSS.GDAXWSS.__name__, 'GDAXWSS')
+        with self.assertRaises(AttributeError):
+            bitex.Mtgox
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,64 @@
+# Import Built-Ins
+import logging
+import time
+from unittest import TestCase
+# Import Third-Party
+
+# Import Homebrew
+from bitex import multi
+
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class FakeResponse:
+    def __init__(self, formatted):
+        self.formatted = formatted
+
+
+class FakeExchange:
+    def __init__(self, delay=0, error=None):
+        self.delay = delay
+        self.error = error
+
+    def ticker(self, pair):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return FakeResponse((type(self).__name__, pair))
+
+
+class Fast(FakeExchange):
+    pass
+
+
+class Slow(FakeExchange):
+    pass
+
+
+class Broken(FakeExchange):
+    pass
+
+
+class MultiTest(TestCase):
+    def test_query_returns_formatted_results_keyed_by_exchange(self):
+        r = multi.query([Fast(), Slow(0.05)], 'ticker', 'BTCUSD')
+        self.assertEqual(r, {'Fast': ('Fast', 'BTCUSD'),
+                             'Slow': ('Slow', 'BTCUSD')})
+
+    def test_query_returns_partial_results(self):
+        r = multi.query([Fast(), Slow(1), Broken(error=ValueError())],
+                        'ticker', 'BTCUSD', timeout=0.2)
+        self.assertEqual(list(r), ['Fast'])
+        self.assertEqual(r.timeouts, ['Slow'])
+        self.assertIsInstance(r.errors['Broken'], ValueError)
+
+    def test_as_completed_yields_in_completion_order(self):
+        names = [name for name, _ in multi.as_completed(
+            [Slow(0.2), Fast(0.01)], 'ticker', 'BTCUSD')]
+        self.assertEqual(names, ['Fast', 'Slow'])
+
+    def test_duplicate_exchanges_are_numbered(self):
+        r = multi.query([Fast(), Fast()], 'ticker', 'BTCUSD', max_workers=1)
+        self.assertEqual(sorted(r), ['Fast', 'Fast#2'])
@@ -0,0 +1,385 @@
+# Import Built-ins
+import asyncio
+import copy
+import json
+import logging
+import pickle
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Import Third-Party
+import requests
+
+# Import Homebrew
+from bitex import Kraken
+from bitex.api.REST import KrakenREST, PoloniexREST, AsyncAPIClient
+from bitex.api.REST.async_api import aiohttp_available
+from bitex.api.REST.cache import TTLCache
+from bitex.api.REST.response import APIResponse
+from bitex.api.REST.exceptions import CircuitOpenError
+from bitex.api.REST.ratelimit import Rate, RateLimit, TokenBucket
+from bitex.api.REST.resilience import RetryPolicy, breaker_stats
+from bitex.api.REST.session import PooledSession
+from bitex.utils import format_api_response
+
+log = logging.getLogger(__name__)
+
+TICKER = {'error': [], 'result': {'XXBTZEUR': {
+    'a': ['1001.0', '1', '1.0'], 'b': ['1000.0', '1', '1.0'],
+    'c': ['1000.5', '0.1'], 'v': ['10', '20'], 'h': ['1010', '1020'],
+    'l': ['990', '980'], 'o': '995.0'}}}
+
+
+class LocalServer(HTTPServer):
+    """
+    Local HTTP stand-in for an exchange; replies to every request with
+    self.payload and records the requests it received.
+    """
+    def __init__(self, payload):
+        super(LocalServer, self).__init__(('127.0.0.1', 0), _Handler)
+        self.payload = payload
+        self.requests = []
+        self.uri = 'http://127.0.0.1:%s' % self.server_address[1]
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.server.requests.append((self.command, self.path, self.headers,
+                                     self.rfile.read(length)))
+        body = json.dumps(self.server.payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_DELETE = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+class PooledSessionTests(unittest.TestCase):
+    def test_clients_own_separate_pooled_sessions(self):
+        a, b = KrakenREST(), PoloniexREST(pool_maxsize=3)
+        self.assertIsInstance(a.session, PooledSession)
+        self.assertIsNot(a.session, b.session)
+        self.assertEqual(b.session.get_adapter('https://poloniex.com')._pool_maxsize, 3)
+
+    def test_idle_connections_are_evicted(self):
+        session = PooledSession(idle_timeout=10)
+        start = session._last_used
+        self.assertFalse(session.evict_idle(now=start + 5))
+        self.assertTrue(session.evict_idle(now=start + 16))
+        self.assertEqual(session.evictions, 1)
+
+    def test_idle_eviction_can_be_disabled(self):
+        session = PooledSession(idle_timeout=None)
+        self.assertFalse(session.evict_idle(now=session._last_used + 10 ** 6))
+
+
+class RateLimitTests(unittest.TestCase):
+    def test_token_bucket_schedules_calls_beyond_burst(self):
+        bucket = TokenBucket(rate=2, capacity=2)
+        now = bucket.last
+        self.assertEqual(bucket.reserve(now=now), 0)
+        self.assertEqual(bucket.reserve(now=now), 0)
+        self.assertAlmostEqual(bucket.reserve(now=now), 0.5)
+        self.assertAlmostEqual(bucket.reserve(now=now), 1.0)
+        self.assertAlmostEqual(bucket.reserve(now=now + 1.0), 0.5)
+
+    def test_limiter_is_shared_by_clients_of_an_exchange(self):
+        self.assertIs(Kraken().limiter, KrakenREST().limiter)
+        self.assertIsNot(Kraken().limiter, PoloniexREST().limiter)
+
+    def test_endpoint_buckets_and_costs(self):
+        client = KrakenREST()
+        client.rate_limit = RateLimit(default=Rate(1, 1),
+                                      private=Rate(1, 3, burst=2),
+                                      endpoints={'public/OHLC': Rate(1, 10)},
+                                      costs={'private/Ledgers': 2})
+        limiter = client.limiter
+        self.assertEqual(limiter.reserve('public/OHLC'), 0)
+        self.assertEqual(limiter.reserve('public/Ticker'), 0)
+        self.assertEqual(limiter.reserve('private/Ledgers', True), 0)
+        self.assertAlmostEqual(limiter.reserve('private/Balance', True), 3,
+                               places=2)
+
+
+class ResilienceTests(unittest.TestCase):
+    def setUp(self):
+        self.client = KrakenREST(url='https://resilience-%s.test' % id(self))
+        self.client.rate_limit = None
+        self.client.retry_policy = RetryPolicy(retries=2, backoff=0)
+        self.client.failure_threshold = 3
+        self.client.api_request = mock.Mock()
+
+    def respond(self, *statuses):
+        responses = []
+        for status in statuses:
+            r = requests.Response()
+            r.status_code = status
+            r.request = requests.Request('GET', self.client.uri).prepare()
+            responses.append(r)
+        self.client.api_request.side_effect = responses
+
+    def test_public_get_is_retried(self):
+        self.respond(503, 502, 200)
+        r = self.client.query('GET', 'public/Time')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self.client.api_request.call_count, 3)
+
+    def test_signed_post_is_never_retried(self):
+        self.client.key, self.client.secret = 'key', 'c2VjcmV0'
+        self.respond(503, 200)
+        r = self.client.query('POST', 'private/Balance', authenticate=True)
+        self.assertEqual(r.status_code, 503)
+        self.assertEqual(self.client.api_request.call_count, 1)
+
+    def test_connection_errors_are_retried_then_raised(self):
+        self.client.api_request.side_effect = requests.ConnectionError()
+        with self.assertRaises(requests.ConnectionError):
+            self.client.query('GET', 'public/Time')
+        self.assertEqual(self.client.api_request.call_count, 3)
+
+    def test_breaker_opens_and_fails_fast(self):
+        self.client.retry_policy = None
+        self.respond(500, 500, 500)
+        for _ in range(3):
+            self.client.query('GET', 'public/Time')
+        with self.assertRaises(CircuitOpenError):
+            self.client.query('GET', 'public/Time')
+        self.assertEqual(self.client.api_request.call_count, 3)
+        stats = breaker_stats()[self.client.uri]
+        self.assertEqual((stats['state'], stats['trips'], stats['rejected']),
+                         ('open', 1, 1))
+
+    def test_breaker_closes_after_successful_probe(self):
+        self.client.retry_policy = None
+        self.client.reset_timeout = 0
+        self.respond(500, 500, 500, 200, 200)
+        for _ in range(5):
+            self.client.query('GET', 'public/Time')
+        self.assertEqual(self.client.breaker.stats()['state'], 'closed')
+
+    def test_probe_is_released_if_signing_fails(self):
+        self.client.retry_policy = None
+        self.client.reset_timeout = 0
+        self.client.key, self.client.secret = 'key', 'c2VjcmV0'
+        self.respond(500, 500, 500, 200)
+        for _ in range(3):
+            self.client.query('GET', 'public/Time')
+        with mock.patch.object(self.client, 'sign',
+                               side_effect=ValueError('bad secret')):
+            with self.assertRaises(ValueError):
+                self.client.query('POST', 'private/Balance', authenticate=True)
+        self.assertEqual(self.client.breaker.stats()['state'], 'open')
+        # The next query probes instead of failing fast
+        self.assertEqual(self.client.query('GET', 'public/Time').status_code,
+                         200)
+        self.assertEqual(self.client.breaker.stats()['state'], 'closed')
+
+
+class APIResponseTests(unittest.TestCase):
+    def response(self, payload=TICKER):
+        r = requests.Response()
+        r.status_code = 200
+        r.url = 'https://api.kraken.com/0/public/Ticker'
+        r.request = requests.Request('GET', r.url).prepare()
+        r._content = json.dumps(payload).encode('utf-8')
+        return APIResponse(r)
+
+    def test_payload_is_parsed_once_and_formatted_lazily(self):
+        formatter = mock.Mock(return_value='formatted')
+        with mock.patch('bitex.codec.loads', side_effect=json.loads) as parse:
+            r = format_api_response(self.response(), formatter, 'XXBTZEUR')
+            self.assertFalse(formatter.called)
+            self.assertEqual(r.formatted, 'formatted')
+            self.assertEqual(r.formatted, 'formatted')
+            self.assertEqual(r.json(), TICKER)
+        self.assertEqual(parse.call_count, 1)
+        formatter.assert_called_once_with(TICKER, 'XXBTZEUR')
+
+    def test_lean_response_keeps_status_headers_and_payload(self):
+        r = format_api_response(self.response(), lambda data: len(data))
+        r.headers['Content-Type'] = 'application/json'
+        r.lean()
+        self.assertIsNone(r.content)
+        self.assertIsNone(r.request)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.headers['Content-Type'], 'application/json')
+        self.assertEqual(r.json(), TICKER)
+        self.assertEqual(r.formatted, 2)
+
+    def test_copies_and_pickles_keep_formatted(self):
+        r = format_api_response(self.response(), lambda data: len(data))
+        self.assertEqual(copy.copy(r).formatted, 2)
+        r = format_api_response(self.response(), lambda data: len(data))
+        self.assertEqual(pickle.loads(pickle.dumps(r)).formatted, 2)
+
+
+class SingleFlightTests(unittest.TestCase):
+    def setUp(self):
+        self.kraken = Kraken()
+        self.kraken.uri = 'https://single-flight-%s.test' % id(self)
+        self.kraken.rate_limit = None
+        self.release = threading.Event()
+
+        def respond(*args, **kwargs):
+            self.release.wait(5)
+            r = requests.Response()
+            r.status_code = 200
+            r.url = self.kraken.uri
+            r.request = requests.Request('GET', r.url).prepare()
+            r._content = json.dumps(TICKER).encode('utf-8')
+            return APIResponse(r)
+        self.kraken.api_request = mock.Mock(side_effect=respond)
+
+    def run_concurrently(self, func, n=5):
+        results = [None] * n
+
+        def run(i):
+            results[i] = func()
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for _ in range(500):
+            if self.kraken.flights.stats()['deduplicated'] >= n - 1:
+                break
+            threading.Event().wait(0.01)
+        self.release.set()
+        for t in threads:
+            t.join(5)
+        return results
+
+    def test_identical_public_queries_share_one_request(self):
+        results = self.run_concurrently(lambda: self.kraken.ticker('XXBTZEUR'))
+        self.assertEqual(self.kraken.api_request.call_count, 1)
+        self.assertEqual(self.kraken.flights.stats()['deduplicated'], 4)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(results[0].formatted[:2], ('1000.0', '1001.0'))
+
+    def test_different_formatters_get_their_own_result(self):
+        self.release.set()
+        shared = self.kraken.api_request()
+        ticker = format_api_response(shared, lambda data: 'ticker')
+        pairs = format_api_response(shared, lambda data: 'pairs')
+        self.assertIsNot(ticker, pairs)
+        self.assertEqual((ticker.formatted, pairs.formatted), ('ticker', 'pairs'))
+
+    def test_private_queries_are_not_coalesced(self):
+        self.kraken.key, self.kraken.secret = 'key', 'c2VjcmV0'
+        self.release.set()
+        self.kraken.balance()
+        self.kraken.ticker('XXBTZEUR')
+        self.assertEqual(self.kraken.flights.stats()['calls'], 1)
+
+
+class CacheTests(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalServer(TICKER)
+        self.kraken = Kraken()
+        self.kraken.uri = self.server.uri
+        self.kraken.rate_limit = None
+        # query() routes via a hardcoded local proxy - talk to the server
+        send = self.kraken.api_request
+        self.kraken.api_request = lambda *args, proxies=None, **kwargs: \
+            send(*args, **kwargs)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_cache_is_opt_in(self):
+        self.kraken.pairs()
+        self.kraken.pairs()
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_cached_response_keeps_json_and_formatted(self):
+        cache = self.kraken.enable_cache()
+        first, second = self.kraken.pairs(), self.kraken.pairs()
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(second.json(), TICKER)
+        self.assertEqual(second.formatted, first.formatted)
+        self.assertEqual(second.formatted, ['XXBTZEUR'])
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+        # Methods without a ttl are never cached
+        self.kraken.ticker('XXBTZEUR')
+        self.kraken.ticker('XXBTZEUR')
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_lean_responses_count_towards_max_bytes(self):
+        self.kraken.lean_responses = True
+        size = len(json.dumps(TICKER))
+        cache = self.kraken.enable_cache(max_bytes=size)
+        r = self.kraken.pairs()
+        self.assertIsNone(r.content)
+        self.assertEqual(r.content_length, size)
+        self.assertEqual(cache.stats()['bytes'], size)
+
+        # Too large to be cached at all
+        self.kraken.enable_cache(max_bytes=size - 1)
+        self.kraken.pairs()
+        self.kraken.pairs()
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_invalidation(self):
+        self.kraken.enable_cache()
+        self.kraken.pairs()
+        self.assertEqual(self.kraken.invalidate_cache('pairs'), 1)
+        self.kraken.pairs()
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_entries_expire_and_are_evicted(self):
+        cache = TTLCache(max_entries=2, max_bytes=10)
+        cache.set('a', 1, ttl=5, size=4, now=0)
+        self.assertEqual(cache.get('a', now=4), 1)
+        self.assertIsNone(cache.get('a', now=5))
+        cache.set('a', 1, ttl=5, size=4, now=0)
+        cache.set('b', 2, ttl=5, size=4, now=0)
+        cache.get('a', now=1)
+        cache.set('c', 3, ttl=5, size=4, now=1)  # exceeds max_bytes
+        self.assertIsNone(cache.get('b', now=1))
+        self.assertFalse(cache.set('d', 4, ttl=5, size=11))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['expirations'], 1)
+        self.assertEqual(cache.stats()['bytes'], 8)
+
+
+@unittest.skipUnless(aiohttp_available, "aiohttp is not installed")
+class AsyncAPIClientTests(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalServer(TICKER)
+        self.kraken = Kraken(key='key', secret='c2VjcmV0')
+        self.kraken.uri = self.server.uri
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def run_async(self, method, *args, **kwargs):
+        async def run():
+            async with AsyncAPIClient(self.kraken) as client:
+                return await getattr(client, method)(*args, **kwargs)
+        return asyncio.run(run())
+
+    def test_standardized_method_is_formatted(self):
+        r = self.run_async('ticker', 'XXBTZEUR')
+        self.assertEqual(r.json(), TICKER)
+        self.assertEqual(r.formatted[:2], ('1000.0', '1001.0'))
+        verb, path, *_ = self.server.requests[-1]
+        self.assertEqual((verb, path), ('GET', '/0/public/Ticker?pair=XXBTZEUR'))
+
+    def test_private_method_is_signed_by_client(self):
+        self.run_async('balance')
+        verb, path, headers, body = self.server.requests[-1]
+        self.assertEqual((verb, path), ('POST', '/0/private/Balance'))
+        self.assertEqual(headers['API-Key'], 'key')
+        self.assertIn('API-Sign', headers)
+        self.assertTrue(body.startswith(b'nonce='))
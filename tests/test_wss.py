@@ -0,0 +1,1096 @@
+# Import Built-ins
+import asyncio
+import logging
+import queue
+import threading
+import time
+import unittest
+import zlib
+from unittest import mock
+
+# Import Homebrew
+from bitex.api.WSS import BitfinexWSS, BitstampWSS, GDAXWSS, GeminiWSS, \
+    HitBTCWSS, PoloniexWSS
+from bitex.api.WSS.aio import AsyncWSSRuntime
+from bitex.codec import dumps as json_dumps, loads as json_loads
+from bitex.api.WSS.orderbook import L2Book, L3Book
+from bitex.api.WSS.queues import BoundedQueue
+from bitex.api.WSS.shm import ShmRing, ShmRingReader, TICKER, TRADE, LEVEL, \
+    ASK, SELL, _RECORD, _SEQ, _SLOT, _WRITE_POS, _WRITE_POS_OFFSET
+
+log = logging.getLogger(__name__)
+
+
+class BoundedQueueTests(unittest.TestCase):
+    def fill(self, q, items):
+        for item in items:
+            q.put(item)
+        return [q.get_nowait() for _ in range(q.qsize())]
+
+    def test_drop_policies(self):
+        items = [('trades', 'BTCUSD', i) for i in range(5)]
+        q = BoundedQueue(3, 'drop_oldest')
+        self.assertEqual(self.fill(q, items), items[2:])
+        self.assertEqual(q.stats(), {'size': 0, 'maxsize': 3,
+                                     'policy': 'drop_oldest', 'dropped': 2})
+        q = BoundedQueue(3, 'drop_newest')
+        self.assertEqual(self.fill(q, items), items[:3])
+        self.assertEqual(q.dropped, 2)
+
+    def test_conflate_replaces_queued_message_of_same_channel_and_pair(self):
+        q = BoundedQueue(3, 'conflate')
+        items = [('book', 'BTCUSD', 1), ('trades', 'BTCUSD', 2),
+                 ('book', 'ETHUSD', 3), ('book', 'BTCUSD', 4),
+                 ('ticker', 'BTCUSD', 5), ('book', 'ETHUSD', 6)]
+        self.assertEqual(self.fill(q, items), [
+            ('trades', 'BTCUSD', 2), ('book', 'ETHUSD', 6),
+            ('ticker', 'BTCUSD', 5)])
+        self.assertEqual(q.dropped, 3)
+        # Nothing is conflated while there's room
+        self.assertEqual(self.fill(q, items[:1] + items[3:4]),
+                         [items[0], items[3]])
+
+    def test_block_policy(self):
+        q = BoundedQueue(1)
+        q.put(1)
+        start = time.time()
+        threading.Timer(0.1, q.get).start()
+        q.put(2, timeout=2)
+        self.assertGreaterEqual(time.time() - start, 0.05)
+        self.assertEqual(q.get_nowait(), 2)
+        q.task_done()
+        q.task_done()
+        q.join()
+        with self.assertRaises(ValueError):
+            BoundedQueue(1, 'drop_everything')
+
+    def test_get_batch(self):
+        q = BoundedQueue()
+        for i in range(5):
+            q.put(i)
+        self.assertEqual(q.get_batch(3), [0, 1, 2])
+        self.assertEqual(q.get_batch(3), [3, 4])
+        start = time.time()
+        self.assertEqual(q.get_batch(3, timeout=0.05), [])
+        self.assertGreaterEqual(time.time() - start, 0.04)
+
+        threading.Timer(0.05, q.put, args=(5,)).start()
+        self.assertEqual(q.get_batch(3, timeout=2), [5])
+
+    def test_batches_are_drained_in_arrival_order(self):
+        wss = BitfinexWSS(pairs=['BTCUSD'])
+        for i in range(250):
+            wss.publish('trades', 'BTCUSD', i)
+        self.assertEqual([len(b) for b in wss.batches(100, timeout=0.01)],
+                         [100, 100, 50])
+
+        for i in range(5):
+            wss.publish('trades', 'BTCUSD', i)
+
+        async def drain():
+            return [batch async for batch in wss.batches_async(3, 0.01)]
+        loop = asyncio.new_event_loop()
+        try:
+            batches = loop.run_until_complete(drain())
+        finally:
+            loop.close()
+        self.assertEqual([[msg[2] for msg in b] for b in batches],
+                         [[0, 1, 2], [3, 4]])
+
+    def test_configure_queue(self):
+        wss = BitfinexWSS(pairs=['BTCUSD'])
+        self.assertEqual(wss.queue_stats()['maxsize'], 0)
+        wss.configure_queue(2, 'drop_oldest')
+        for i in range(4):
+            wss.handle_response(0, dict(
+                event='subscribed', channel='trades', chanId=i,
+                symbol='tBTCUSD', pair='BTCUSD'))
+            wss.handle_data(0, [i, 'te', [i, 0, '0.1', '1000.0']])
+        self.assertEqual(wss.queue_stats(), {'size': 2, 'maxsize': 2,
+                                             'policy': 'drop_oldest',
+                                             'dropped': 2})
+
+
+class SubscriberTests(unittest.TestCase):
+    def setUp(self):
+        self.wss = BitfinexWSS(pairs=['BTCUSD', 'ETHUSD'])
+        for chan_id, (channel, pair) in enumerate([
+                ('trades', 'BTCUSD'), ('trades', 'ETHUSD'),
+                ('ticker', 'BTCUSD')]):
+            self.wss.handle_response(0, dict(
+                event='subscribed', channel=channel, chanId=chan_id,
+                symbol='t' + pair, pair=pair))
+
+    def feed(self):
+        self.wss.handle_data(0, [0, 'te', [1, 0, '0.1', '1000.0']])
+        self.wss.handle_data(1, [1, 'te', [2, 0, '0.2', '100.0']])
+        self.wss.handle_data(2, [2, ['999', '1']])
+
+    def test_messages_are_routed_by_channel_and_pair(self):
+        received = []
+        btc_trades = self.wss.add_subscriber('trades', 'BTCUSD',
+                                             maxsize=10, policy='drop_oldest')
+        self.wss.add_subscriber('trades', 'BTCUSD', received.append)
+        all_trades = self.wss.add_subscriber('trades')
+        self.feed()
+
+        self.assertEqual(btc_trades.qsize(), 1)
+        self.assertEqual(btc_trades.get_nowait()[:2], ('trades', 'BTCUSD'))
+        self.assertEqual([msg[:2] for msg in received], [('trades', 'BTCUSD')])
+        self.assertEqual([all_trades.get_nowait()[1] for _ in range(2)],
+                         ['BTCUSD', 'ETHUSD'])
+        # Nobody subscribed to tickers
+        self.assertEqual(self.wss.data_q.get_nowait()[:2],
+                         ('ticker', 'BTCUSD'))
+        self.assertTrue(self.wss.data_q.empty())
+
+    def test_failing_subscriber_and_removal(self):
+        def fail(msg):
+            raise ValueError(msg)
+        q = self.wss.add_subscriber(None, 'BTCUSD')
+        self.wss.add_subscriber('ticker', 'BTCUSD', fail)
+        self.feed()
+        self.assertEqual(q.qsize(), 2)
+
+        self.wss.remove_subscriber(None, 'BTCUSD', q)
+        self.wss.remove_subscriber('ticker', 'BTCUSD', fail)
+        self.feed()
+        self.assertEqual(q.qsize(), 2)
+        self.assertEqual(self.wss.data_q.qsize(), 1 + 3)
+
+
+class L2BookTests(unittest.TestCase):
+    def test_levels_are_sorted_best_first(self):
+        book = L2Book('BTCUSD')
+        for price in ('999.5', '1000.0', '998', '1000.5'):
+            book.set('bids', price, '1')
+        for price in ('1002', '1001.5', '1003'):
+            book.set('asks', price, '2')
+        self.assertEqual(book.best_bid(), ('1000.5', '1'))
+        self.assertEqual(book.best_ask(), ('1001.5', '2'))
+        self.assertEqual(book.depth(2), {
+            'bids': [('1000.5', '1'), ('1000.0', '1')],
+            'asks': [('1001.5', '2'), ('1002', '2')]})
+
+        book.remove('bids', '1000.5')
+        self.assertEqual(book.best_bid(), ('1000.0', '1'))
+        self.assertEqual(len(book.snapshot()['bids']), 3)
+
+    def test_empty_book(self):
+        book = L2Book()
+        self.assertIsNone(book.best_bid())
+        self.assertIsNone(book.best_ask())
+        self.assertEqual(book.depth(), {'bids': [], 'asks': []})
+
+
+class L3BookTests(unittest.TestCase):
+    def test_levels_are_aggregated_incrementally(self):
+        book = L3Book('BTCUSD')
+        book.add(1, 'bids', '1000.0', '0.5')
+        book.add(2, 'bids', '1000.0', '1.25')
+        book.add(3, 'bids', '999.0', '2')
+        book.add(4, 'asks', '1001.0', '1')
+        self.assertEqual(book.best_bid(), ('1000.0', '1.75'))
+        self.assertEqual(book.bids[1000.0][2], 2)
+
+        # Resizing keeps the order's place in the queue
+        book.add(1, 'bids', '1000.0', '0.25')
+        self.assertEqual(book.orders_at('bids', '1000.0'),
+                         [(1, '0.25'), (2, '1.25')])
+        self.assertEqual(book.best_bid(), ('1000.0', '1.50'))
+
+        # Moving an order to another level
+        book.add(2, 'asks', '1002.0', '1.25')
+        self.assertEqual(book.depth(2), {
+            'bids': [('1000.0', '0.25'), ('999.0', '2')],
+            'asks': [('1001.0', '1'), ('1002.0', '1.25')]})
+
+        self.assertEqual(book.remove_order(1), ('bids', '1000.0', '0.25'))
+        self.assertIsNone(book.remove_order(1))
+        self.assertEqual(book.best_bid(), ('999.0', '2'))
+        self.assertNotIn(1000.0, book.bids)
+
+    def test_numeric_sizes(self):
+        book = L3Book()
+        book.add('a', 'asks', 10.5, 1.0)
+        book.add('b', 'asks', 10.5, 2.0)
+        book.remove_order('a')
+        self.assertEqual(book.best_ask(), (10.5, 2.0))
+
+
+class BitfinexBookTests(unittest.TestCase):
+    def setUp(self):
+        self.wss = BitfinexWSS(pairs=['BTCUSD'])
+        self.subscribe('book', chanId=1, prec='P0')
+
+    def subscribe(self, channel, **kwargs):
+        self.wss.handle_response(time.time(), dict(
+            event='subscribed', channel=channel, symbol='tBTCUSD',
+            pair='BTCUSD', **kwargs))
+
+    def test_snapshot_and_updates(self):
+        ts = time.time()
+        self.wss.handle_data(ts, [1, [['1000.0', 2, '1.5'], ['999.0', 1, '0.5'],
+                                      ['1001.0', 1, '-0.25'],
+                                      ['1002.0', 3, '-4']]])
+        book = self.wss.books['BTCUSD']
+        self.assertEqual(book.best_bid(), ('1000.0', '1.5'))
+        self.assertEqual(book.best_ask(), ('1001.0', '0.25'))
+
+        # New level, changed level, deleted levels (count == 0)
+        self.wss.handle_data(ts, [1, ['1000.5', 1, '0.1']])
+        self.wss.handle_data(ts, [1, ['1002.0', 2, '-3']])
+        self.wss.handle_data(ts, [1, ['1001.0', 0, '-1']])
+        self.wss.handle_data(ts, [1, ['999.0', 0, '1']])
+        self.assertEqual(book.depth(5), {
+            'bids': [('1000.5', '0.1'), ('1000.0', '1.5')],
+            'asks': [('1002.0', '3')]})
+
+        # Raw messages are still passed on
+        self.assertEqual(self.wss.data_q.qsize(), 5)
+
+    def test_new_snapshot_replaces_book(self):
+        self.wss.handle_data(0, [1, [['1000.0', 2, '1.5'], ['1001.0', 1, '-1']]])
+        self.wss.handle_data(1, [1, [['900.0', 1, '1']]])
+        self.assertEqual(self.wss.books['BTCUSD'].snapshot(), {
+            'pair': 'BTCUSD', 'ts': 1, 'bids': [('900.0', '1', 1)], 'asks': []})
+
+    def test_raw_book(self):
+        self.subscribe('book', chanId=2, prec='R0')
+        self.wss.handle_data(0, [2, [[11, '1000.0', '0.5'], [12, '1000.0', '1'],
+                                     [13, '1001.0', '-2']]])
+        book = self.wss.raw_books['BTCUSD']
+        self.assertEqual(book.best_bid(), ('1000.0', '1.5'))
+        self.assertEqual(book.best_ask(), ('1001.0', '2'))
+
+        self.wss.handle_data(1, [2, [12, '0', '1']])  # price 0: removed
+        self.wss.handle_data(2, [2, [14, '1000.5', '-0.1']])
+        self.assertEqual(book.depth(), {'bids': [('1000.0', '0.5')],
+                                        'asks': [('1000.5', '0.1'),
+                                                 ('1001.0', '2')]})
+        self.assertNotIn('BTCUSD', self.wss.books)
+
+
+def checksum(bids, asks):
+    """
+    Reference implementation of Bitfinex' book checksum, as documented.
+    """
+    tokens = []
+    for i in range(25):
+        if i < len(bids):
+            tokens.extend(bids[i])
+        if i < len(asks):
+            tokens.extend(asks[i])
+    crc = zlib.crc32(':'.join(tokens).encode('ascii'))
+    return crc - 2 ** 32 if crc >= 2 ** 31 else crc
+
+
+class BitfinexChecksumTests(unittest.TestCase):
+    def setUp(self):
+        self.wss = BitfinexWSS(pairs=['BTCUSD'])
+        self.wss.conn = mock.Mock()
+        self.wss.send = mock.Mock()
+        self.wss.handle_response(0, dict(
+            event='subscribed', channel='book', chanId=1, symbol='tBTCUSD',
+            pair='BTCUSD', prec='P0', freq='F0'))
+        self.bids = [['%d.5' % (1000 - i), '%d.25' % (i + 1)] for i in range(30)]
+        self.asks = [['%d.5' % (1001 + i), '-0.%d' % (i + 1)] for i in range(30)]
+        self.wss.handle_data(0, [1, [[p, 1, a] for p, a in self.bids + self.asks]])
+
+    def test_checksums_are_verified_incrementally(self):
+        self.wss.handle_data(1, [1, 'cs', checksum(self.bids, self.asks)])
+        # Update within the top 25 levels
+        self.wss.handle_data(2, [1, ['1000.5', 2, '7.5']])
+        self.bids[0][1] = '7.5'
+        self.wss.handle_data(3, [1, 'cs', checksum(self.bids, self.asks)])
+        # Removal of the best ask
+        self.wss.handle_data(4, [1, ['1001.5', 0, '-1']])
+        self.wss.handle_data(5, [1, 'cs', checksum(self.bids, self.asks[1:])])
+        self.assertEqual(self.wss.checksum_stats(),
+                         {('book', 'BTCUSD'): {'verified': 3, 'mismatches': 0}})
+        self.wss.send.assert_not_called()
+
+    def test_mismatch_resubscribes_to_the_channel_only(self):
+        self.wss.handle_response(0, dict(
+            event='subscribed', channel='book', chanId=2, symbol='tBTCUSD',
+            pair='BTCUSD', prec='R0'))
+        self.wss.handle_data(1, [1, ['999.5', 1, '5']])  # Not in self.bids
+        self.wss.handle_data(1, [1, 'cs', checksum(self.bids, self.asks)])
+        self.wss.handle_data(1, [1, 'cs', checksum(self.bids, self.asks)])
+        self.wss.send.assert_called_once_with({'event': 'unsubscribe',
+                                               'chanId': 1})
+
+        self.wss.handle_response(2, dict(event='unsubscribed', status='OK',
+                                         chanId=1))
+        self.wss.send.assert_called_with({
+            'event': 'subscribe', 'channel': 'book', 'symbol': 'tBTCUSD',
+            'pair': 'BTCUSD', 'prec': 'P0', 'freq': 'F0'})
+        self.assertEqual(list(self.wss.channel_labels), [2])
+
+    def test_raw_book_checksum(self):
+        self.wss.handle_response(0, dict(
+            event='subscribed', channel='book', chanId=2, symbol='tBTCUSD',
+            pair='BTCUSD', prec='R0'))
+        self.wss.handle_data(0, [2, [[11, '1000.0', '0.5'], [12, '1000.0', '1'],
+                                     [10, '999.0', '2'], [13, '1001.0', '-2']]])
+        expected = checksum([['11', '0.5'], ['12', '1'], ['10', '2']],
+                            [['13', '-2']])
+        self.wss.handle_data(1, [2, 'cs', expected])
+        self.assertEqual(self.wss.checksum_stats()[('raw_book', 'BTCUSD')],
+                         {'verified': 1, 'mismatches': 0})
+
+
+class BitfinexSequenceTests(unittest.TestCase):
+    def setUp(self):
+        self.wss = BitfinexWSS(pairs=['BTCUSD'])
+        self.wss.conn = mock.Mock()
+        self.wss.send = mock.Mock()
+        self.wss.handle_response(0, dict(event='conf', status='OK',
+                                         flags=65536 + 8))
+        for chan_id, prec in ((1, 'P0'), (2, 'R0')):
+            self.wss.handle_response(0, dict(
+                event='subscribed', channel='book', chanId=chan_id,
+                symbol='tBTCUSD', pair='BTCUSD', prec=prec))
+        self.wss.handle_response(0, dict(event='subscribed', channel='trades',
+                                         chanId=3, symbol='tBTCUSD',
+                                         pair='BTCUSD'))
+
+    def test_sequence_numbers_are_stripped_and_checked(self):
+        self.wss.handle_data(0, [1, [['1000.0', 1, '1']], 1])
+        self.wss.handle_data(0, [1, ['1001.0', 1, '-2'], 2])
+        self.wss.handle_data(0, [3, 'hb', 3])
+        self.wss.handle_data(0, [1, ['1001.0', 1, '-5'], 3])  # Duplicate
+        self.wss.channels[0] = self.wss._handle_auth
+        self.wss.handle_data(0, [0, 'wu', ['exchange', 'USD', '1'], 4, 1])
+        self.assertEqual(self.wss.books['BTCUSD'].best_ask(),
+                         ('1001.0', '2'))
+        self.assertEqual(self.wss.sequence_stats(), {
+            'gaps': 0, 'duplicates': 1, 'auth_gaps': 0, 'auth_duplicates': 0,
+            'last': 4, 'auth_last': 1})
+        self.wss.send.assert_not_called()
+
+    def test_gap_resubscribes_to_book_channels(self):
+        self.wss.handle_data(0, [3, 'hb', 10])
+        self.wss.handle_data(0, [3, 'hb', 12])
+        self.assertEqual(self.wss.sequence_stats()['gaps'], 1)
+        self.assertEqual(self.wss.send.call_args_list, [
+            mock.call({'event': 'unsubscribe', 'chanId': 1}),
+            mock.call({'event': 'unsubscribe', 'chanId': 2})])
+
+    def test_sequence_is_ignored_without_flag(self):
+        self.wss.handle_response(0, dict(event='conf', status='OK', flags=8))
+        self.wss.handle_data(0, [1, [['1000.0', 1, '1']]])
+        self.assertEqual(self.wss.books['BTCUSD'].best_bid(), ('1000.0', '1'))
+        self.assertIsNone(self.wss.sequence_stats()['last'])
+
+
+class FakeConnection:
+    """
+    Stands in for a websocket connection; recv() blocks until a message is
+    fed.
+    """
+    def __init__(self):
+        self.incoming = queue.Queue()
+        self.sent = []
+
+    def feed(self, msg):
+        self.incoming.put(json_dumps(msg))
+
+    def recv(self):
+        msg = self.incoming.get()
+        if msg is None:
+            raise AttributeError
+        return msg
+
+    def send(self, payload):
+        self.sent.append(payload)
+
+    def close(self):
+        self.incoming.put(None)
+
+
+class BitfinexLoopTests(unittest.TestCase):
+    def setUp(self):
+        self.wss = BitfinexWSS(pairs=['BTCUSD'])
+        self.wss.conn = self.conn = FakeConnection()
+        self.wss.running = True
+        self.receiver = threading.Thread(target=self.wss.receive, daemon=True)
+        self.processor = threading.Thread(target=self.wss.process, daemon=True)
+        self.receiver.start()
+        self.processor.start()
+
+    def tearDown(self):
+        self.wss.running = False
+        self.wss.receiver_q.put(None)
+        self.conn.close()
+        self.receiver.join(2)
+        self.processor.join(2)
+        self.assertFalse(self.processor.is_alive())
+
+    def test_messages_are_handed_over_immediately(self):
+        handled = threading.Event()
+        self.wss._data_handlers['trades'] = lambda *args: handled.set()
+        self.conn.feed({'event': 'subscribed', 'channel': 'trades',
+                        'chanId': 1, 'symbol': 'tBTCUSD', 'pair': 'BTCUSD'})
+        start = time.time()
+        self.conn.feed([1, 'te', [1, 0, '0.1', '1000.0']])
+        self.assertTrue(handled.wait(2))
+        self.assertLess(time.time() - start, 0.1)
+
+    def test_outgoing_payloads_are_held_back_while_paused(self):
+        self.conn.feed({'event': 'info', 'code': 20060, 'msg': 'pause'})
+        for _ in range(200):
+            if not self.wss._unpaused.is_set():
+                break
+            time.sleep(0.01)
+        self.wss.ticker('BTCUSD')
+        self.assertEqual(self.conn.sent, [])
+
+        self.conn.feed({'event': 'info', 'code': 20061, 'msg': 'resume'})
+        for _ in range(200):
+            if self.conn.sent:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.conn.sent, [json_dumps({
+            'event': 'subscribe', 'channel': 'ticker', 'symbol': 'BTCUSD'})])
+
+
+class BitfinexHeartbeatTests(unittest.TestCase):
+    def setUp(self):
+        self.wss = BitfinexWSS(pairs=['BTCUSD'])
+        self.wss.conn = mock.Mock()
+        self.wss.send = mock.Mock()
+        self.late = []
+        self.wss.on_late_channel = lambda *args: self.late.append(args)
+        with mock.patch('bitex.api.WSS.bitfinex.time.time', return_value=0):
+            for chan_id in range(1, 66):
+                self.wss.handle_response(0, dict(
+                    event='subscribed', channel='trades', chanId=chan_id,
+                    symbol='tBTCUSD', pair='BTCUSD'))
+
+    def test_late_channels_are_reported_once(self):
+        for chan_id in range(1, 65):
+            self.wss.handle_data(8, [chan_id, 'hb'])
+        self.wss._check_heartbeats(8)
+        self.assertEqual(self.late, [])
+
+        self.wss._check_heartbeats(11)
+        self.assertEqual(self.late, [(65, ('trades', {
+            'symbol': 'tBTCUSD', 'pair': 'BTCUSD'}), 11)])
+        self.wss._check_heartbeats(15)
+        self.assertEqual(len(self.late), 1)
+        self.assertEqual(self.wss.heartbeat_stats()['late'], 1)
+
+        # Back in time; checked again from now on
+        self.wss.handle_data(16, [65, 'hb'])
+        self.assertEqual(self.wss.heartbeat_stats()['late_channels'], [])
+        self.wss._check_heartbeats(17)
+        self.assertEqual(len(self.late), 1)
+        self.wss._check_heartbeats(26)
+        self.assertEqual(len(self.late), 66)
+
+    def test_messages_dont_touch_the_schedule(self):
+        entries = len(self.wss._deadline_heap)
+        for ts in range(100):
+            self.wss.handle_data(ts / 100, [1, 'hb'])
+        self.assertEqual(len(self.wss._deadline_heap), entries)
+
+    def test_pings_are_sent_at_the_configured_interval(self):
+        self.wss.ping_interval = 5
+        for ts in range(0, 21):
+            self.wss._check_heartbeats(ts)
+            if self.wss.ping_timer is not None:
+                self.wss.ping_timer = None  # pong
+        pings = [c for c in self.wss.send.call_args_list
+                 if c == mock.call({'event': 'ping'})]
+        self.assertEqual(len(pings), 4)
+
+    def test_unanswered_ping_requests_restart(self):
+        self.wss.ping_interval = 5
+        with mock.patch('bitex.api.WSS.bitfinex.time.time', return_value=5):
+            self.wss._check_heartbeats(0)
+            self.wss._check_heartbeats(5)
+        self.assertEqual(self.wss.ping_timer, 5)
+
+        def get(timeout):
+            self.wss.running = False
+            raise queue.Empty
+        self.wss.receiver_q = mock.Mock(get=get)
+        self.wss.running = True
+        with mock.patch('bitex.api.WSS.bitfinex.time.time', return_value=11):
+            self.wss.process()
+        self.assertEqual(self.wss._controller_q.get_nowait(), 'restart')
+        # The timed out ping no longer blocks further pings
+        self.assertEqual(self.wss.ping_timer, 11)
+        self.assertTrue(self.wss._controller_q.empty())
+
+
+class BitfinexPauseTests(unittest.TestCase):
+    def setUp(self):
+        self.wss = BitfinexWSS(pairs=['BTCUSD'])
+        self.old = FakeConnection()
+        self.wss._on_open(None, self.old)
+        self.old.sent.clear()
+        self.wss.handle_response(0, {'event': 'info', 'code': 20060,
+                                     'msg': 'pause'})
+
+    def test_no_pings_while_paused(self):
+        self.wss.ping_interval = 5
+        for ts in range(0, 21):
+            self.wss._check_heartbeats(ts)
+        self.assertIsNone(self.wss.ping_timer)
+        self.assertIsNone(self.wss._on_tick(100))
+        self.assertEqual(self.old.sent, [])
+
+    def test_subscriptions_are_sent_on_reconnect(self):
+        self.wss.ticker('BTCUSD')
+        self.assertEqual(len(self.wss._paused_payloads), 1)
+
+        new = FakeConnection()
+        self.wss._on_open(None, new)
+        self.assertTrue(self.wss._unpaused.is_set())
+        self.assertEqual(self.wss._paused_payloads, [])
+        self.assertEqual(len(new.sent), 6)  # conf, and 5 channels
+        self.assertEqual(self.old.sent, [])
+
+    def test_unpause_without_connection(self):
+        self.wss.ticker('BTCUSD')
+        self.wss.conn = None
+        self.wss.unpause()
+        self.assertTrue(self.wss._unpaused.is_set())
+        self.assertEqual(self.wss._paused_payloads, [])
+
+
+class GDAXBookTests(unittest.TestCase):
+    def setUp(self):
+        with mock.patch('bitex.api.WSS.gdax.requests.get') as get:
+            get.return_value.json.return_value = [{'id': 'BTC-USD'},
+                                                  {'id': 'ETH-USD'}]
+            self.wss = GDAXWSS()
+        self.snapshots = {'BTC-USD': [{'sequence': 10, 'bids': [
+            ['1000.0', '1.0', 'a'], ['999.0', '2.0', 'b']],
+            'asks': [['1001.0', '0.5', 'c']]}]}
+        self.release = threading.Event()
+        self.release.set()
+
+        def fetch(product):
+            self.release.wait(5)
+            return self.snapshots[product].pop(0)
+        self.wss._fetch_snapshot = fetch
+
+    def msg(self, sequence, kind, product='BTC-USD', **kwargs):
+        self.wss._handle_book_message(dict(type=kind, product_id=product,
+                                           sequence=sequence, **kwargs))
+
+    def wait_synced(self, product='BTC-USD'):
+        for _ in range(500):
+            if self.wss.book_stats()[product]['synced']:
+                return
+            time.sleep(0.01)
+        self.fail("Book of %s did not sync!" % product)
+
+    def test_book_is_built_from_snapshot_and_buffered_messages(self):
+        self.release.clear()
+        self.msg(10, 'open', order_id='x', side='buy', price='1000.0',
+                 remaining_size='5')  # already contained in the snapshot
+        self.msg(11, 'open', order_id='d', side='sell', price='1000.5',
+                 remaining_size='0.2')
+        self.release.set()
+        self.wait_synced()
+
+        self.msg(12, 'match', maker_order_id='a', taker_order_id='t',
+                 side='buy', price='1000.0', size='0.4')
+        self.msg(13, 'change', order_id='b', price='999.0', new_size='1.5')
+        self.msg(14, 'done', order_id='d', reason='canceled')
+        self.msg(14, 'done', order_id='d', reason='canceled')
+        book = self.wss.books['BTC-USD']
+        self.assertEqual(book.depth(), {'bids': [('1000.0', '0.6'),
+                                                 ('999.0', '1.5')],
+                                        'asks': [('1001.0', '0.5')]})
+        self.assertNotIn('x', book.orders)
+        self.assertEqual(self.wss.book_stats()['BTC-USD'], {
+            'gaps': 0, 'duplicates': 1, 'resyncs': 1, 'synced': True})
+
+    def test_bad_snapshot_is_retried(self):
+        # i.e. the reply when rate limited
+        self.snapshots['BTC-USD'].insert(0, {'message': 'Slow down'})
+        self.msg(11, 'open', order_id='d', side='sell', price='1000.5',
+                 remaining_size='0.2')
+        self.wait_synced()
+        self.assertEqual(self.wss.books['BTC-USD'].best_ask(),
+                         ('1000.5', '0.2'))
+        self.assertEqual(self.snapshots['BTC-USD'], [])
+
+    def test_gap_resyncs_only_the_affected_product(self):
+        self.snapshots['ETH-USD'] = [{'sequence': 5, 'bids': [],
+                                      'asks': [['50.0', '1', 'e']]}]
+        self.msg(11, 'received')
+        self.msg(6, 'received', product='ETH-USD')
+        self.wait_synced()
+        self.wait_synced('ETH-USD')
+
+        # Resync of BTC-USD blocks on its snapshot, ETH-USD carries on
+        self.snapshots['BTC-USD'].append({'sequence': 20, 'bids': [],
+                                          'asks': [['1002.0', '3', 'f']]})
+        self.release.clear()
+        self.msg(15, 'received')
+        self.msg(21, 'open', order_id='g', side='buy', price='1001.0',
+                 remaining_size='1')
+        self.msg(7, 'done', product='ETH-USD', order_id='e')
+        self.assertFalse(self.wss.book_stats()['BTC-USD']['synced'])
+        self.assertEqual(self.wss.books['ETH-USD'].best_ask(), None)
+
+        self.release.set()
+        self.wait_synced()
+        book = self.wss.books['BTC-USD']
+        self.assertEqual(book.best_bid(), ('1001.0', '1'))
+        self.assertEqual(book.best_ask(), ('1002.0', '3'))
+        self.assertEqual(self.wss.book_stats()['BTC-USD']['gaps'], 1)
+        self.assertEqual(self.wss.book_stats()['ETH-USD']['gaps'], 0)
+
+
+class HitBTCBookTests(unittest.TestCase):
+    def setUp(self):
+        self.wss = HitBTCWSS()
+        self.wss._handle_book('MarketDataSnapshotFullRefresh', {
+            'snapshotSeqNo': 100, 'symbol': 'BTCUSD', 'exchangeStatus': 'on',
+            'ask': [{'price': '1001.00', 'size': 5},
+                    {'price': '1002.00', 'size': 1}],
+            'bid': [{'price': '1000.00', 'size': 3}]}, 0)
+
+    def refresh(self, seq, ask=(), bid=()):
+        return self.wss._handle_book('MarketDataIncrementalRefresh', {
+            'seqNo': seq, 'timestamp': 0, 'symbol': 'BTCUSD',
+            'exchangeStatus': 'on', 'ask': list(ask), 'bid': list(bid),
+            'trade': []}, seq)
+
+    def test_incremental_refreshes_are_applied(self):
+        self.assertTrue(self.refresh(100, ask=[{'price': '900.00', 'size': 1}]))
+        self.assertTrue(self.refresh(101, ask=[{'price': '1001.00', 'size': 0}],
+                                     bid=[{'price': '1000.50', 'size': 2}]))
+        self.assertTrue(self.refresh(101, bid=[{'price': '1000.50', 'size': 0}]))
+        book = self.wss.books['BTCUSD']
+        self.assertEqual(book.best_ask(), ('1002.00', 1))
+        self.assertEqual(book.depth(), {
+            'bids': [('1000.50', 2), ('1000.00', 3)],
+            'asks': [('1002.00', 1)]})
+        self.assertEqual(self.wss.book_stats()['BTCUSD'], {
+            'snapshots': 1, 'gaps': 0, 'duplicates': 2, 'synced': True})
+
+    def test_gap_marks_book_stale_until_next_snapshot(self):
+        self.assertFalse(self.refresh(102, bid=[{'price': '1000.50', 'size': 2}]))
+        self.assertEqual(self.wss.book_stats()['BTCUSD'],
+                         {'snapshots': 1, 'gaps': 1, 'duplicates': 0,
+                          'synced': False})
+        self.assertEqual(self.wss.books['BTCUSD'].best_bid(), ('1000.00', 3))
+
+        # Ignored while stale
+        self.assertTrue(self.refresh(103, bid=[{'price': '1000.50', 'size': 2}]))
+        self.assertEqual(self.wss.books['BTCUSD'].best_bid(), ('1000.00', 3))
+
+        self.setUp()
+        self.assertTrue(self.wss.book_stats()['BTCUSD']['synced'])
+
+    def test_data_connection_is_closed_on_gap(self):
+        conn = mock.Mock()
+        conn.recv.return_value = json_dumps({'MarketDataIncrementalRefresh': {
+            'seqNo': 102, 'timestamp': 0, 'symbol': 'BTCUSD',
+            'exchangeStatus': 'on', 'ask': [], 'bid': [], 'trade': []}})
+        self.wss.running = True
+        with mock.patch('bitex.api.WSS.hitbtc.create_connection',
+                        return_value=conn):
+            self.wss._data_thread()
+        conn.close.assert_called_once_with()
+        self.assertEqual(self.wss._controller_q.get_nowait(), 'restart_data')
+
+
+class FakePusher:
+    """
+    Stands in for pusherclient.Pusher; records the callbacks bound to each
+    channel's events.
+    """
+    def __init__(self):
+        self.bindings = {}
+
+    def subscribe(self, channel_name):
+        pusher = self
+
+        class Channel:
+            def bind(self, event, callback):
+                pusher.bindings[channel_name, event] = callback
+        return Channel()
+
+
+class BitstampBookTests(unittest.TestCase):
+    def setUp(self):
+        self.wss = BitstampWSS()
+        self.snapshots = {}
+        self.release = threading.Event()
+
+        def fetch(pair, group=1):
+            self.release.wait(5)
+            return self.snapshots[group]
+        self.wss._fetch_snapshot = fetch
+
+    def wait_synced(self, key):
+        for _ in range(500):
+            if self.wss.book_stats().get(key, {}).get('synced'):
+                return
+            time.sleep(0.01)
+        self.fail("Book %s did not sync!" % (key,))
+
+    def test_diffs_are_applied_in_microtimestamp_order(self):
+        self.snapshots[1] = {'microtimestamp': '1000', 'bids': [
+            ['100.00', '1.0'], ['99.00', '2.0']], 'asks': [['101.00', '3.0']]}
+        diff = lambda mts, bids=(), asks=(): json_dumps({
+            'microtimestamp': str(mts), 'bids': list(bids), 'asks': list(asks)})
+
+        # Pusher delivers JSON strings; buffered until the snapshot arrives
+        self.wss.btcusd_dob_callback(diff(1002, asks=[['101.00', '0']]))
+        self.wss.btcusd_dob_callback(diff(999, bids=[['100.00', '0']]))
+        self.wss.btcusd_dob_callback(diff(1001, asks=[['101.00', '1.5'],
+                                                      ['102.00', '1.0']]))
+        self.assertEqual(self.wss.bbo('BTCUSD'), (None, None))
+        self.release.set()
+        self.wait_synced(('diff_order_book', 'BTCUSD'))
+        self.assertEqual(self.wss.bbo('BTCUSD'),
+                         (('100.00', '1.0'), ('102.00', '1.0')))
+
+        self.wss.btcusd_dob_callback(diff(1003, bids=[['100.50', '0.5']]))
+        self.wss.btcusd_dob_callback(diff(1002, bids=[['100.70', '0.5']]))
+        self.assertEqual(self.wss.bbo('BTCUSD')[0], ('100.50', '0.5'))
+        self.assertEqual(self.wss.book_stats()[('diff_order_book', 'BTCUSD')],
+                         {'snapshots': 1, 'stale': 2, 'synced': True})
+        self.assertEqual(self.wss.data_q.qsize(), 5)
+
+    def test_books_are_rebuilt_after_reconnect(self):
+        self.snapshots[1] = {'microtimestamp': '1000', 'bids': [
+            ['100.00', '1.0']], 'asks': [['101.00', '3.0']]}
+        diff = lambda mts, bids=(): json_dumps({
+            'microtimestamp': str(mts), 'bids': list(bids), 'asks': []})
+        key = ('diff_order_book', 'BTCUSD')
+        self.wss.pusher = FakePusher()
+        self.release.set()
+        self.wss.btcusd_dob_callback(diff(1001))
+        self.wait_synced(key)
+
+        # A snapshot requested before reconnecting is discarded
+        self.release.clear()
+        self.wss._register_bindings(None)
+        self.wss.btcusd_dob_callback(diff(1002, [['100.00', '0']]))
+        self.wss._register_bindings(None)
+        self.assertEqual(self.wss.bbo('BTCUSD'), (None, None))
+        self.assertFalse(self.wss.book_stats()[key]['synced'])
+        self.release.set()
+        time.sleep(0.1)
+        self.assertNotIn('BTCUSD', self.wss.books)
+
+        # Older than the book before reconnecting; rebuilt regardless
+        self.wss.btcusd_dob_callback(diff(900, [['99.00', '1.0']]))
+        self.wait_synced(key)
+        self.assertEqual(self.wss.bbo('BTCUSD')[0], ('100.00', '1.0'))
+        self.assertEqual(self.wss.book_stats()[key]['snapshots'], 2)
+
+    def test_bad_snapshot_is_retried(self):
+        self.release.set()
+        snapshots = [{'status': 'error', 'reason': 'Rate limited'},
+                     {'microtimestamp': '1000', 'bids': [['100.00', '1.0']],
+                      'asks': []}]
+        self.wss._fetch_snapshot = lambda pair, group=1: snapshots.pop(0)
+        self.wss.btcusd_dob_callback(json_dumps({
+            'microtimestamp': '1001', 'bids': [['100.50', '0.5']], 'asks': []}))
+        self.wait_synced(('diff_order_book', 'BTCUSD'))
+        self.assertEqual(self.wss.bbo('BTCUSD')[0], ('100.50', '0.5'))
+        self.assertEqual(snapshots, [])
+
+    def test_live_orders(self):
+        received = []
+
+        class Client(BitstampWSS):
+            # Overrides with the callbacks' plain signature keep working
+            def btcusd_lo_callback(self, data):
+                received.append(data)
+                super(Client, self).btcusd_lo_callback(data)
+        fetch = self.wss._fetch_snapshot
+        self.wss = Client(include_only=['live_orders'])
+        self.wss._fetch_snapshot = fetch
+        self.wss.pusher = FakePusher()
+        self.wss._register_live_orders_channels()
+        emit = lambda event, data: self.wss.pusher.bindings[
+            'live_orders', event](data)
+
+        self.snapshots[2] = {'microtimestamp': '1000', 'bids': [
+            ['100.00', '1.0', '1'], ['100.00', '2.0', '2']],
+            'asks': [['101.00', '3.0', '3']]}
+        order = lambda id, mts, price, amount, kind: json_dumps({
+            'id': id, 'microtimestamp': str(mts), 'price': float(price),
+            'price_str': price, 'amount': float(amount), 'amount_str': amount,
+            'order_type': kind})
+
+        emit('order_created', order(4, 1001, '100.50', '0.5', 0))
+        emit('order_deleted', order(1, 900, '100.00', '1.0', 0))
+        self.release.set()
+        self.wait_synced(('live_orders', 'BTCUSD'))
+        emit('order_changed', order(3, 990, '101.00', '1.0', 1))
+
+        book = self.wss.live_books['BTCUSD']
+        self.assertEqual(self.wss.bbo('BTCUSD', live=True),
+                         (('100.50', '0.5'), ('101.00', '1.0')))
+        self.assertEqual(book.orders_at('bids', '100.00'), [(2, '2.0')])
+        self.assertNotIn('BTCUSD', self.wss.books)
+        self.assertEqual(len(received), 3)
+        self.assertEqual(self.wss.data_q.qsize(), 3)
+
+
+class StandIn:
+    """
+    Local websocket server standing in for the exchanges; serves messages
+    depending on the requested path, and records the payloads it receives.
+    """
+    def __init__(self, handlers):
+        from websockets.sync.server import serve
+        self.handlers = handlers
+        self.received = queue.Queue()
+        self.connections = 0
+        self.server = serve(self.handle, '127.0.0.1', 0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = 'ws://127.0.0.1:%s' % self.server.socket.getsockname()[1]
+
+    def handle(self, ws):
+        self.connections += 1
+        for msg in self.handlers[ws.request.path](self.connections):
+            ws.send(json_dumps(msg))
+        for payload in ws:
+            self.received.put(payload)
+
+    def close(self):
+        self.server.shutdown()
+
+
+class AsyncWSSRuntimeTests(unittest.TestCase):
+    def setUp(self):
+        self.server = StandIn({
+            '/marketdata/BTCUSD': lambda n: [{'type': 'update', 'n': 1}],
+            '/marketdata/ETHUSD': lambda n: [{'type': 'update', 'n': 2}],
+            '/': lambda n: [
+                {'event': 'info', 'version': 2},
+                {'event': 'subscribed', 'channel': 'trades', 'chanId': 1,
+                 'symbol': 'tBTCUSD', 'pair': 'BTCUSD'},
+                [1, 'te', [1, 0, '0.1', '1000.0']]],
+            '/hitbtc': lambda n: [
+                {'MarketDataSnapshotFullRefresh': {
+                    'snapshotSeqNo': 1, 'symbol': 'BTCUSD', 'ask': [],
+                    'bid': [{'price': '1000.00', 'size': 1}]}},
+                # Gap on the first connection only
+                {'MarketDataIncrementalRefresh': {
+                    'seqNo': 3 if n == 1 else 2, 'symbol': 'BTCUSD',
+                    'ask': [], 'bid': [{'price': '1000.50', 'size': 1}]}}]})
+        self.addCleanup(self.server.close)
+
+    def test_clients_share_one_event_loop(self):
+        gemini = GeminiWSS(['btcusd', 'ethusd'])
+        gemini.addr = self.server.url + '/'
+        bitfinex = BitfinexWSS(pairs=['BTCUSD'])
+        bitfinex.addr = self.server.url + '/'
+        runtime = AsyncWSSRuntime(gemini, bitfinex)
+
+        async def consume():
+            received = {}
+            async for name, channel, pair, *data in runtime:
+                received[name, channel, pair] = data
+                if len(received) == 3:
+                    runtime.stop()
+            return received
+
+        async def main():
+            return (await asyncio.gather(runtime.run(), consume()))[1]
+
+        received = asyncio.run(asyncio.wait_for(main(), 10))
+        self.assertEqual(sorted(received), [
+            ('Bitfinex', 'trades', 'BTCUSD'), ('Gemini', 'marketdata', 'BTCUSD'),
+            ('Gemini', 'marketdata', 'ETHUSD')])
+        self.assertEqual(received['Gemini', 'marketdata', 'ETHUSD'][0],
+                         json_dumps({'type': 'update', 'n': 2}))
+        self.assertEqual(received['Bitfinex', 'trades', 'BTCUSD'][0][0],
+                         ['te', [1, 0, '0.1', '1000.0']])
+        # Bitfinex' subscriptions were sent via the runtime
+        payloads = []
+        while not self.server.received.empty():
+            payloads.append(self.server.received.get())
+        self.assertIn(json_dumps({'event': 'subscribe', 'channel': 'trades',
+                                  'symbol': 'BTCUSD'}), payloads)
+        self.assertFalse(gemini.running or bitfinex.running)
+
+    def test_thread_facade_reconnects_on_sequence_gap(self):
+        hitbtc = HitBTCWSS()
+        hitbtc.addr = self.server.url + '/hitbtc'
+        runtime = AsyncWSSRuntime(hitbtc, reconnect_delay=0)
+        runtime.start()
+        try:
+            for _ in range(500):
+                if hitbtc.books.get('BTCUSD') and \
+                        hitbtc.books['BTCUSD'].best_bid() == ('1000.50', 1):
+                    break
+                time.sleep(0.01)
+        finally:
+            runtime.stop()
+        self.assertEqual(hitbtc.book_stats()['BTCUSD'],
+                         {'snapshots': 2, 'gaps': 1, 'duplicates': 0,
+                          'synced': True})
+        self.assertEqual(runtime.stats()['reconnects'], 1)
+        self.assertEqual(hitbtc.data_q.qsize(), 4)
+        self.assertFalse(hitbtc.running)
+
+
+class PoloniexTests(unittest.TestCase):
+    def setUp(self):
+        # Minimal WAMP broker, confirming subscriptions and sending an event
+        # for each of them
+        from websockets.sync.server import serve
+        self.sessions = 0
+        self.server = serve(self.broker, '127.0.0.1', 0,
+                            subprotocols=['wamp.2.json'])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.shutdown)
+        self.wss = PoloniexWSS(['BTC_ETH', 'BTC_XMR', 'ticker'], sessions=2)
+        self.wss.addr = 'ws://127.0.0.1:%s' % \
+            self.server.socket.getsockname()[1]
+
+    def broker(self, ws):
+        self.sessions += 1
+        for msg in ws:
+            msg = json_loads(msg)
+            if msg[0] == 1:  # HELLO
+                ws.send(json_dumps([2, self.sessions, {'roles': {'broker': {}}}]))
+            elif msg[0] == 32:  # SUBSCRIBE
+                request_id, topic = msg[1], msg[3]
+                sub_id = request_id + 100 * self.sessions
+                ws.send(json_dumps([33, request_id, sub_id]))
+                args = ['BTC_LTC', '0.01'] if topic == 'ticker' else \
+                    [{'type': 'newTrade'}]
+                ws.send(json_dumps([36, sub_id, 1, {}, args, {'seq': 1}]))
+
+    def test_sessions_multiplex_topics_in_one_thread(self):
+        self.wss.start()
+        try:
+            received = [self.wss.data_q.get(timeout=5) for _ in range(3)]
+            self.assertEqual([t.name for t in threading.enumerate()
+                              if t.name.startswith('Poloniex')],
+                             ['Poloniex Controller Thread',
+                              'Poloniex Session Thread'])
+        finally:
+            self.wss.stop()
+        self.assertEqual(self.sessions, 2)
+        self.assertEqual(sorted(msg[:4] for msg in received), [
+            ('BTC_ETH', 'BTC_ETH', ({'type': 'newTrade'},), {'seq': 1}),
+            ('BTC_XMR', 'BTC_XMR', ({'type': 'newTrade'},), {'seq': 1}),
+            ('ticker', 'BTC_LTC', ('BTC_LTC', '0.01'), {'seq': 1})])
+
+    def test_stop_after_loop_thread_exited(self):
+        self.wss.start()
+        self.wss.data_q.get(timeout=5)
+        self.wss._loop.call_soon_threadsafe(self.wss._set_stopped)
+        self.wss._loop_thread.join(5)
+        self.assertTrue(self.wss._loop.is_closed())
+        self.wss.stop()
+        self.assertIsNone(self.wss._loop_thread)
+
+
+def read_ring(name, results):
+    with ShmRingReader(name, from_start=True) as reader:
+        records = reader.wait(timeout=5)
+        results.put([(reader.pair(r[2]),) + r[3:5] for r in records])
+
+
+class ShmRingTests(unittest.TestCase):
+    def setUp(self):
+        self.ring = ShmRing(capacity=8, max_pairs=2)
+        self.addCleanup(self.ring.unlink)
+        self.addCleanup(self.ring.close)
+        self.reader = ShmRingReader(self.ring.name)
+        self.addCleanup(self.reader.close)
+
+    def test_records_are_read_in_order(self):
+        self.ring.ticker('BTCUSD', 1000.5, ts=1)
+        self.ring.trade('ETHUSD', '300.1', '2', ts=2, side=SELL)
+        self.ring.level('BTCUSD', ASK, 1001, 0.5, ts=3)
+        self.assertEqual(self.reader.pending(), 3)
+        self.assertEqual(self.reader.read(2), [
+            (TICKER, 0, 0, 1000.5, 0.0, 1.0), (TRADE, SELL, 1, 300.1, 2.0, 2.0)])
+        self.assertEqual(self.reader.read(), [(LEVEL, ASK, 0, 1001.0, 0.5, 3.0)])
+        self.assertEqual(self.reader.read(), [])
+        self.assertEqual([self.reader.pair(0), self.reader.pair(1)],
+                         ['BTCUSD', 'ETHUSD'])
+        with self.assertRaises(ValueError):
+            self.ring.ticker('LTCUSD', 1)
+
+    def test_long_pair_names_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.ring.ticker('A' * 17, 1)
+        self.ring.ticker('\u00e9' * 8, 1)
+        self.assertEqual(self.reader.pair(0), '\u00e9' * 8)
+
+    def test_record_being_written_is_not_read(self):
+        self.ring.ticker('BTCUSD', 1, ts=1)
+        # Producer set the odd sequence number of the second record, but
+        # hasn't finished writing it
+        offset = self.ring._slots + _SLOT.size
+        _SEQ.pack_into(self.ring._buf, offset, 3)
+        self.ring._pos = 2
+        _WRITE_POS.pack_into(self.ring._buf, _WRITE_POS_OFFSET, 2)
+        self.assertEqual(len(self.reader.read()), 1)
+        self.assertEqual(self.reader.read(), [])
+        _RECORD.pack_into(self.ring._buf, offset + _SEQ.size, TICKER, 0, 0,
+                          2.0, 0.0, 2.0)
+        _SEQ.pack_into(self.ring._buf, offset, 4)
+        self.assertEqual(self.reader.read(), [(TICKER, 0, 0, 2.0, 0.0, 2.0)])
+        self.assertEqual(self.reader.lost, 0)
+
+    def test_lapped_reader_skips_overwritten_records(self):
+        other = ShmRingReader(self.ring.name)
+        self.addCleanup(other.close)
+        for i in range(20):
+            self.ring.trade('BTCUSD', i, 1, ts=i)
+        self.assertEqual([r[3] for r in self.reader.read()],
+                         list(range(12, 20)))
+        self.assertEqual(self.reader.lost, 12)
+        # Readers don't consume each other's records
+        self.assertEqual(len(other.read()), 8)
+
+    def test_clients_publish_via_subscriber(self):
+        wss = BitfinexWSS(pairs=['BTCUSD'])
+        wss.add_subscriber('trades', None, self.ring.subscriber(
+            lambda msg: [(TRADE, msg[1], msg[2][0][1][3], abs(float(
+                msg[2][0][1][2])), msg[2][1])]))
+        wss.publish('trades', 'BTCUSD', (['te', [1, 0, '-0.1', '1000.0']], 5))
+        self.assertEqual(self.reader.read(), [(TRADE, 0, 0, 1000.0, 0.1, 5.0)])
+
+    def test_concurrent_attaches_restore_resource_tracker(self):
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        readers = []
+
+        def attach():
+            for _ in range(20):
+                readers.append(ShmRingReader(self.ring.name))
+        threads = [threading.Thread(target=attach) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for reader in readers:
+            reader.close()
+        self.assertIs(resource_tracker.register, register)
+
+    def test_reader_in_other_process(self):
+        import multiprocessing as mp
+        self.ring.trade('BTCUSD', 1000, 0.1)
+        results = mp.Queue()
+        proc = mp.Process(target=read_ring, args=(self.ring.name, results))
+        proc.start()
+        self.assertEqual(results.get(timeout=10), [('BTCUSD', 1000.0, 0.1)])
+        proc.join(5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)